@@ -1,43 +0,0 @@
-import json
-import boto3
-import logging
-import os
-
-# Configure logging
-logger = logging.getLogger()
-logger.setLevel(logging.INFO)
-
-def lambda_handler(event, context):
-    """
-    Lambda handler for parsing books into chapters
-    """
-    try:
-        logger.info("Starting book parser lambda")
-        
-        book_id = event.get('bookId')
-        book_file_s3_key = event.get('bookFileS3Key')
-        
-        logger.info(f"Parsing book ID: {book_id}, S3 Key: {book_file_s3_key}")
-        
-        # TODO: Implement book parsing logic
-        # - Download book from S3 raw bucket
-        # - Parse book into chapters
-        # - Save individual chapters to S3 processed bucket
-        # - Update database with chapter metadata
-        # - Return list of chapters
-        
-        return {
-            'statusCode': 200,
-            'bookId': book_id,
-            'chapters': [
-                {
-                    'chapterId': f"{book_id}_chapter_1",
-                    'chapterNumber': 1,
-                    'chapterS3Key': f"chapters/{book_id}/chapter_1.txt"
-                }
-            ]
-        }
-        
-    except Exception as e:
-        logger.error(f"Error in book parser: {str(e)}")
-        raise e
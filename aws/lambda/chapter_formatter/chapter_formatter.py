@@ -1,39 +0,0 @@
-import json
-import boto3
-import logging
-import os
-
-# Configure logging
-logger = logging.getLogger()
-logger.setLevel(logging.INFO)
-
-def lambda_handler(event, context):
-    """
-    Lambda handler for formatting chapters using AI
-    """
-    try:
-        logger.info("Starting chapter formatter lambda")
-        
-        book_id = event.get('bookId')
-        chapter_id = event.get('chapterId')
-        chapter_file_s3_key = event.get('chapterFileS3Key')
-        
-        logger.info(f"Formatting chapter ID: {chapter_id}, S3 Key: {chapter_file_s3_key}")
-        
-        # TODO: Implement chapter formatting logic
-        # - Download chapter from S3 processed bucket
-        # - Use AI (Gemini) to format/clean the text
-        # - Save formatted chapter to S3 finished bucket
-        # - Update database with formatting status
-        # - Return formatted chapter S3 key
-        
-        return {
-            'statusCode': 200,
-            'bookId': book_id,
-            'chapterId': chapter_id,
-            'formattedChapterFileS3Key': f"formatted/{book_id}/{chapter_id}.txt"
-        }
-        
-    except Exception as e:
-        logger.error(f"Error in chapter formatter: {str(e)}")
-        raise e
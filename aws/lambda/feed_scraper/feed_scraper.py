@@ -1,30 +0,0 @@
-import json
-import boto3
-import logging
-import os
-
-# Configure logging
-logger = logging.getLogger()
-logger.setLevel(logging.INFO)
-
-def lambda_handler(event, context):
-    """
-    Lambda handler for scraping RSS feed from Project Gutenberg
-    """
-    try:
-        logger.info("Starting feed scraper lambda")
-        
-        # TODO: Implement feed scraping logic
-        # - Get feed URL from Parameter Store
-        # - Parse RSS feed
-        # - Extract book information
-        # - Return list of books
-        
-        return {
-            'statusCode': 200,
-            'books': []
-        }
-        
-    except Exception as e:
-        logger.error(f"Error in feed scraper: {str(e)}")
-        raise e
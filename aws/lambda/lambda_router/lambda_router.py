@@ -0,0 +1,126 @@
+import logging
+
+# Configure logging
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+def _scrape_feed(event, context):
+    """
+    Scrape RSS feed from Project Gutenberg
+    """
+    logger.info("Starting feed scraper")
+    
+    # TODO: Implement feed scraping logic
+    # - Get feed URL from Parameter Store
+    # - Parse RSS feed
+    # - Extract book information
+    # - Return list of books
+    
+    return {
+        'statusCode': 200,
+        'books': []
+    }
+
+def _scrape_book(event, context):
+    """
+    Scrape an individual book from Project Gutenberg
+    """
+    logger.info("Starting book scraper")
+    
+    book_id = event.get('bookId')
+    book_url = event.get('bookUrl')
+    
+    logger.info(f"Scraping book ID: {book_id}, URL: {book_url}")
+    
+    # TODO: Implement book scraping logic
+    # - Download book from Project Gutenberg
+    # - Save to S3 raw bucket
+    # - Update database with book metadata
+    # - Return S3 keys for downloaded files
+    
+    return {
+        'statusCode': 200,
+        'bookId': book_id,
+        'bookFolderS3Key': f"books/{book_id}/",
+        'bookFileS3Key': f"books/{book_id}/book.txt"
+    }
+
+def _parse_book(event, context):
+    """
+    Parse a book into chapters
+    """
+    logger.info("Starting book parser")
+    
+    book_id = event.get('bookId')
+    book_file_s3_key = event.get('bookFileS3Key')
+    
+    logger.info(f"Parsing book ID: {book_id}, S3 Key: {book_file_s3_key}")
+    
+    # TODO: Implement book parsing logic
+    # - Download book from S3 raw bucket
+    # - Parse book into chapters
+    # - Save individual chapters to S3 processed bucket
+    # - Update database with chapter metadata
+    # - Return list of chapters
+    
+    return {
+        'statusCode': 200,
+        'bookId': book_id,
+        'chapters': [
+            {
+                'chapterId': f"{book_id}_chapter_1",
+                'chapterNumber': 1,
+                'chapterS3Key': f"chapters/{book_id}/chapter_1.txt"
+            }
+        ]
+    }
+
+def _format_chapter(event, context):
+    """
+    Format a chapter using AI
+    """
+    logger.info("Starting chapter formatter")
+    
+    book_id = event.get('bookId')
+    chapter_id = event.get('chapterId')
+    chapter_file_s3_key = event.get('chapterFileS3Key')
+    
+    logger.info(f"Formatting chapter ID: {chapter_id}, S3 Key: {chapter_file_s3_key}")
+    
+    # TODO: Implement chapter formatting logic
+    # - Download chapter from S3 processed bucket
+    # - Use AI (Gemini) to format/clean the text
+    # - Save formatted chapter to S3 finished bucket
+    # - Update database with formatting status
+    # - Return formatted chapter S3 key
+    
+    return {
+        'statusCode': 200,
+        'bookId': book_id,
+        'chapterId': chapter_id,
+        'formattedChapterFileS3Key': f"formatted/{book_id}/{chapter_id}.txt"
+    }
+
+# Operation name -> handler; one deployed function serves every pipeline step
+dispatch = {
+    'scrape_feed': _scrape_feed,
+    'scrape_book': _scrape_book,
+    'parse_book': _parse_book,
+    'format_chapter': _format_chapter,
+}
+
+def lambda_handler(event, context):
+    """
+    Lambda handler routing pipeline steps by event['operation']
+    """
+    operation = event.get('operation')
+    try:
+        handler = dispatch.get(operation)
+        if handler is None:
+            raise ValueError(f"Unknown operation: {operation}")
+        
+        return handler(event, context)
+        
+    except Exception as e:
+        logger.error(f"Error in {operation}: {str(e)}")
+        raise e
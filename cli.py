@@ -3,33 +3,62 @@
 Main CLI entry point for Gutenberg audiobook creation suite.
 """
 
+import importlib
+import click
 import typer
-from typing import Optional
+from typer.core import TyperGroup
+from typing import Dict, List, Optional, Tuple
+
+# Sub-apps are imported only when their command runs: name -> (module, help)
+LAZY_SUBCOMMANDS: Dict[str, Tuple[str, str]] = {
+    "create-chapters": ("scripts.chapterChunker", "Convert HTML books to plain text chapters"),
+    "format-chapters": ("scripts.audioBookFormatter", "Format text files for audiobook use with Ollama LLM"),
+    "merge-audio-chapters": ("scripts.audioMerger", "Merge multiple WAV audio files into a single file"),
+}
+
+
+class LazyTyperGroup(TyperGroup):
+    """Typer group that defers importing each script until its subcommand is invoked."""
+
+    def list_commands(self, ctx: click.Context) -> List[str]:
+        return list(LAZY_SUBCOMMANDS)
+
+    def get_command(self, ctx: click.Context, cmdName: str) -> Optional[click.Command]:
+        # Placeholder carrying only the help text, so listing commands in --help imports nothing
+        if cmdName not in LAZY_SUBCOMMANDS:
+            return None
+        _, helpText = LAZY_SUBCOMMANDS[cmdName]
+        return click.Command(cmdName, help=helpText, short_help=helpText)
+
+    def resolve_command(self, ctx: click.Context, args: List[str]) -> Tuple[Optional[str], Optional[click.Command], List[str]]:
+        cmdName, _, remainingArgs = super().resolve_command(ctx, args)
+        return cmdName, self._loadCommand(ctx, cmdName), remainingArgs
+
+    def _loadCommand(self, ctx: click.Context, cmdName: str) -> click.Command:
+        moduleName, helpText = LAZY_SUBCOMMANDS[cmdName]
+        try:
+            module = importlib.import_module(moduleName)
+        except ImportError as e:
+            ctx.fail(f"Could not import {moduleName}: {e}")
+
+        command = typer.main.get_group(module.app)
+        command.name = cmdName
+        command.help = helpText
+        return command
+
 
 app = typer.Typer(
     name="gutenberg",
     help="Turn open source gutenberg text automatically into audiobooks",
-    no_args_is_help=True
+    no_args_is_help=True,
+    cls=LazyTyperGroup
 )
 
-# Import the individual Typer apps from scripts
-try:
-    from scripts.chapterChunker import app as chapter_chunker_app
-    app.add_typer(chapter_chunker_app, name="create-chapters", help="Convert HTML books to plain text chapters")
-except ImportError as e:
-    typer.echo(f"Warning: Could not import chapterChunker: {e}", err=True)
-
-try:
-    from scripts.audioBookFormatter import app as formatter_app  
-    app.add_typer(formatter_app, name="format-chapters", help="Format text files for audiobook use with Ollama LLM")
-except ImportError as e:
-    typer.echo(f"Warning: Could not import audioBookFormatter: {e}", err=True)
-
-try:
-    from scripts.audioMerger import app as merger_app
-    app.add_typer(merger_app, name="merge-audio-chapters", help="Merge multiple WAV audio files into a single file")  
-except ImportError as e:
-    typer.echo(f"Warning: Could not import audioMerger: {e}", err=True)
+
+@app.callback()
+def main() -> None:
+    pass
+
 
 if __name__ == "__main__":
     app()
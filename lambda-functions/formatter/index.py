@@ -2,39 +2,131 @@
 Lambda function for formatting chapters using Gemini API
 Migrated from existing audioBookFormatter.py functionality
 """
-import json
+import asyncio
+import hashlib
+import orjson
 import os
-import boto3
+import re
+import time
+import urllib.parse
+import urllib.request
 import logging
-from typing import Dict, Any, List, Optional
+import msgspec
+import zstandard
+from botocore.exceptions import ClientError
+from typing import Dict, Any, List, Optional, Tuple
 from google import genai
 
+# SnapStart runtime hooks, only available inside the Lambda Python runtime
+try:
+    from snapshot_restore_py import register_after_restore
+except ImportError:
+    register_after_restore = None
+
 # Configure logging
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-# AWS clients
-s3_client = boto3.client('s3')
-secretsmanager_client = boto3.client('secretsmanager')
+from text_normalizer import normalize
+
+# AWS clients (shared configuration from the aws_clients layer)
+from aws_clients import s3_client, secretsmanager_client
+
+class ChapterEvent(msgspec.Struct):
+    """One chapter to format, given directly in the event or as an entry of 'chapters'"""
+    chapterId: str
+    parsedS3Key: str
+    formatOptions: Optional[Dict[str, Any]] = None
+
+class FormatEvent(msgspec.Struct):
+    """Formatter event; either a single chapter's fields or a 'chapters' batch is required"""
+    bookId: str
+    chapterId: Optional[str] = None
+    parsedS3Key: Optional[str] = None
+    formatOptions: Dict[str, Any] = {}
+    idempotencyKey: Optional[str] = None
+    chapters: Optional[List[ChapterEvent]] = None
 
 # Global Gemini client (initialized once per Lambda container)
 gemini_client = None
 
+# Parsed Gemini secret, reused across warm invocations until it expires
+SECRET_CACHE_TTL_SECONDS = 900
+secret_cache: Dict[str, Any] = {'value': None, 'expires': 0.0}
+
+# Explicit context cache for SYSTEM_PROMPT, keyed by model name -> (cache name, expiry timestamp);
+# a None name records a failed create so it is not retried until the entry expires
+GEMINI_USE_CACHE = os.environ.get('GEMINI_USE_CACHE', 'false').lower() == 'true'
+GEMINI_CACHE_TTL_SECONDS = 3600
+GEMINI_CACHE_REFRESH_MARGIN_SECONDS = 300
+GEMINI_CACHE_FAILURE_TTL_SECONDS = 600
+gemini_prompt_caches: Dict[str, Tuple[Optional[str], float]] = {}
+gemini_prompt_cache_lock = asyncio.Lock()
+
+# Event loop kept for the container lifetime so async clients survive warm invocations
+event_loop = asyncio.new_event_loop()
+
+# Concurrent chapters per invocation when a batch is passed in
+MAX_CHAPTER_WORKERS = int(os.environ.get('MAX_CHAPTER_WORKERS', '8'))
+
+# Long chapters are formatted as paragraph windows so output stays under max_output_tokens
+WINDOW_TARGET_TOKENS = 6000
+MAX_WINDOW_WORKERS = 4
+
+def fetch_secret_string(secret_arn: str) -> str:
+    """Fetch a secret string via the Lambda secrets extension if enabled, else Secrets Manager"""
+    extension_port = os.environ.get('PARAMETERS_SECRETS_EXTENSION_HTTP_PORT')
+    if extension_port:
+        # The extension serves secrets over localhost, skipping a boto3 round trip to Secrets Manager
+        url = f"http://localhost:{extension_port}/secretsmanager/get?secretId={urllib.parse.quote(secret_arn)}"
+        request = urllib.request.Request(url, headers={'X-Aws-Parameters-Secrets-Token': os.environ['AWS_SESSION_TOKEN']})
+        with urllib.request.urlopen(request, timeout=5) as response:
+            return orjson.loads(response.read())['SecretString']
+    
+    response = secretsmanager_client.get_secret_value(SecretId=secret_arn)
+    return response['SecretString']
+
+def get_gemini_api_key() -> str:
+    """Get the Gemini API key, cached across warm invocations until the TTL expires"""
+    global secret_cache
+    if secret_cache['value'] is None or time.monotonic() > secret_cache['expires']:
+        secret_arn = os.environ['GEMINI_SECRET_ARN']
+        secret = orjson.loads(fetch_secret_string(secret_arn))
+        secret_cache = {'value': secret['apiKey'], 'expires': time.monotonic() + SECRET_CACHE_TTL_SECONDS}
+    
+    return secret_cache['value']
+
 def get_gemini_client():
     """Get or create Gemini API client"""
     global gemini_client
     if gemini_client is None:
         # Get API key from Secrets Manager
-        secret_arn = os.environ['GEMINI_SECRET_ARN']
-        response = secretsmanager_client.get_secret_value(SecretId=secret_arn)
-        secret = json.loads(response['SecretString'])
-        api_key = secret['apiKey']
+        api_key = get_gemini_api_key()
         
         gemini_client = genai.Client(api_key=api_key)
         logger.info("Gemini client initialized")
     
     return gemini_client
 
+def bootstrap() -> None:
+    """Run one-time init at import so it is captured in the SnapStart snapshot"""
+    if 'GEMINI_SECRET_ARN' not in os.environ:
+        return
+    
+    try:
+        get_gemini_client()
+    except Exception as e:
+        # Init is retried lazily on the first invocation
+        logger.warning(f"Gemini client bootstrap failed: {str(e)}")
+
+def refresh_after_restore() -> None:
+    """Drop the snapshotted secret and client so restored containers pick up rotated credentials"""
+    global gemini_client, secret_cache
+    secret_cache = {'value': None, 'expires': 0.0}
+    gemini_client = None
+    gemini_prompt_caches.clear()
+    bootstrap()
+
 # Enhanced system prompt from your audioBookFormatter.py
 SYSTEM_PROMPT = """You are an expert audiobook formatter specializing in converting written text from any genre or time period into optimal format for text-to-speech narration. Your task is to transform written text into the perfect format for audio while preserving every word of the original content.
 
@@ -55,8 +147,7 @@ UNIVERSAL FORMATTING RULES FOR ALL BOOK TYPES:
 
 3. **Technical Content & Numbers**: 
    - Write out ALL numbers, measurements, and mathematical terms (e.g., "0" → "zero", "1st" → "first")
-   - Spell out abbreviations (e.g., "Prof." → "Professor", "Dr." → "Doctor", "vs." → "versus")
-   - Convert symbols to words (& → "and", % → "percent", ° → "degrees", $ → "dollars")
+   - Spell out any remaining abbreviations (common titles, "vs." and symbols such as & and % are already expanded)
    - Handle dates appropriately ("1969" → "nineteen sixty-nine", "Sept. 15" → "September fifteenth")
 
 4. **Language & Style Preservation**:
@@ -100,33 +191,345 @@ CRITICAL REQUIREMENTS:
 
 Transform this text for optimal audiobook narration:"""
 
-def format_text_with_gemini(text: str, format_options: Dict[str, Any]) -> str:
-    """Format text using Gemini API"""
-    client = get_gemini_client()
-    model = format_options.get('model', 'gemini-2.0-flash-exp')
+# Prompt prefix built once and sent as its own part, so the chapter text is never concatenated onto it
+PROMPT_PREFIX = f"{SYSTEM_PROMPT}\n\n"
+PROMPT_PREFIX_PART = genai.types.Part.from_text(text=PROMPT_PREFIX)
+
+# Prompt fingerprint so edits to SYSTEM_PROMPT invalidate the format cache automatically
+PROMPT_VERSION = hashlib.sha256(SYSTEM_PROMPT.encode('utf-8')).hexdigest()[:16]
+
+# S3 prefix for formatted outputs keyed by content hash
+FORMAT_CACHE_PREFIX = 'formatcache/'
+
+# Parsed objects smaller than this are placeholders and are not downloaded or formatted
+MIN_CONTENT_BYTES = 32
+
+# Formatted chapters are stored zstd-compressed; readers decompress with zstandard.ZstdDecompressor
+FORMATTED_CONTENT_ENCODING = 'zstd'
+compressor = zstandard.ZstdCompressor(level=3)
+
+# User metadata on formatted objects recording the ETag of the parsed input they came from
+SOURCE_ETAG_METADATA_KEY = 'source-etag'
+
+# Whitespace runs (line wrapping, indentation, trailing spaces) that do not change the narrated text
+WHITESPACE_RUN_PATTERN = re.compile(r'\s+')
+
+def normalize_for_cache(raw_content: str) -> str:
+    """Normalize chapter text so re-wrapped copies of the same text (e.g. recurring boilerplate) share a cache entry"""
+    return WHITESPACE_RUN_PATTERN.sub(' ', raw_content).strip()
+
+def get_format_cache_key(raw_content: str, model: str) -> str:
+    """Build the S3 key of the cached formatted output for this input, model and prompt"""
+    digest = hashlib.sha256()
+    digest.update(normalize_for_cache(raw_content).encode('utf-8'))
+    digest.update(PROMPT_VERSION.encode('utf-8'))
+    digest.update(model.encode('utf-8'))
+    return f"{FORMAT_CACHE_PREFIX}{digest.hexdigest()}"
+
+async def get_system_prompt_cache(client, model: str) -> Optional[str]:
+    """Get or create an explicit context cache holding SYSTEM_PROMPT for the given model"""
+    if not GEMINI_USE_CACHE:
+        return None
     
-    prompt = f"{SYSTEM_PROMPT}\n\n{text}"
+    # Concurrent windows wait here so only one of them creates the cache
+    async with gemini_prompt_cache_lock:
+        cached = gemini_prompt_caches.get(model)
+        if cached and cached[0] is None and time.time() < cached[1]:
+            return None
+        if cached and time.time() < cached[1] - GEMINI_CACHE_REFRESH_MARGIN_SECONDS:
+            return cached[0]
+        
+        try:
+            cache = await client.aio.caches.create(
+                model=model,
+                config=genai.types.CreateCachedContentConfig(
+                    system_instruction=SYSTEM_PROMPT,
+                    ttl=f"{GEMINI_CACHE_TTL_SECONDS}s"
+                )
+            )
+        except Exception as e:
+            # Caching has a minimum token size and is not available for every model
+            logger.warning(f"Could not create Gemini context cache for {model}, using inline prompt: {str(e)}")
+            gemini_prompt_caches[model] = (None, time.time() + GEMINI_CACHE_FAILURE_TTL_SECONDS)
+            return None
+        
+        gemini_prompt_caches[model] = (cache.name, time.time() + GEMINI_CACHE_TTL_SECONDS)
+        logger.info(f"Gemini context cache created for {model}: {cache.name}")
+        return cache.name
+
+def split_paragraphs(text: str, target_tokens: int = WINDOW_TARGET_TOKENS) -> List[str]:
+    """Split text into windows of whole paragraphs of roughly target_tokens each"""
+    windows = []
+    current: List[str] = []
+    current_tokens = 0.0
     
-    response = client.models.generate_content(
-        model=model,
-        contents=prompt,
-        config=genai.types.GenerateContentConfig(
+    for paragraph in text.split('\n\n'):
+        # Rough estimate: 1 token ≈ 1.3 words for English text
+        paragraph_tokens = len(paragraph.split()) * 1.3
+        # Close the window at the previous blank line so no paragraph is split mid-sentence
+        if current and current_tokens + paragraph_tokens > target_tokens:
+            windows.append('\n\n'.join(current))
+            current = []
+            current_tokens = 0.0
+        current.append(paragraph)
+        current_tokens += paragraph_tokens
+    
+    if current:
+        windows.append('\n\n'.join(current))
+    
+    return windows
+
+class FormattingIncompleteError(RuntimeError):
+    """Gemini returned no usable output for part of a chapter"""
+
+async def format_window_with_gemini(client, model: str, text: str) -> str:
+    """Format one window of text using Gemini API, raising FormattingIncompleteError on an empty or truncated response"""
+    cache_name = await get_system_prompt_cache(client, model)
+    if cache_name:
+        # System prompt is served from the context cache, only the chapter text is sent
+        contents = text
+        config = genai.types.GenerateContentConfig(
+            cached_content=cache_name,
+            temperature=0.1,
+            max_output_tokens=32000
+        )
+    else:
+        contents = [PROMPT_PREFIX_PART, genai.types.Part.from_text(text=text)]
+        config = genai.types.GenerateContentConfig(
             temperature=0.1,
             max_output_tokens=32000
         )
+    
+    response = await client.aio.models.generate_content(
+        model=model,
+        contents=contents,
+        config=config
     )
     
-    if response.text:
-        return response.text.strip()
-    else:
-        logger.warning("Empty response from Gemini API")
-        return text  # Return original if API fails
+    # A window cut off at max_output_tokens would silently drop the rest of its text
+    finish_reason = response.candidates[0].finish_reason if response.candidates else None
+    if finish_reason == genai.types.FinishReason.MAX_TOKENS:
+        raise FormattingIncompleteError("Gemini response truncated at max_output_tokens")
+    if not response.text:
+        raise FormattingIncompleteError("Empty response from Gemini API")
+    
+    return response.text.strip()
+
+async def format_text_with_gemini(text: str, format_options: Dict[str, Any]) -> str:
+    """Format text using Gemini API, splitting long chapters into windows formatted concurrently"""
+    client = get_gemini_client()
+    model = format_options.get('model', 'gemini-2.0-flash-exp')
+    
+    windows = split_paragraphs(text)
+    if len(windows) == 1:
+        return await format_window_with_gemini(client, model, text)
+    
+    logger.info(f"Formatting long chapter as {len(windows)} windows")
+    semaphore = asyncio.Semaphore(MAX_WINDOW_WORKERS)
+    
+    async def format_bounded(window: str) -> str:
+        async with semaphore:
+            return await format_window_with_gemini(client, model, window)
+    
+    formatted_windows = await asyncio.gather(*(format_bounded(window) for window in windows))
+    return '\n\n'.join(formatted_windows)
+
+async def head_object_or_none(bucket_name: str, key: str) -> Optional[Dict[str, Any]]:
+    """HEAD an S3 object, returning None if it does not exist"""
+    try:
+        return await asyncio.to_thread(s3_client.head_object, Bucket=bucket_name, Key=key)
+    except ClientError as e:
+        if e.response['Error']['Code'] in ('NoSuchKey', '404'):
+            return None
+        raise
+
+async def put_object_conditionally(bucket_name: str, key: str, existing_head: Optional[Dict[str, Any]], **put_args) -> bool:
+    """
+    PUT an S3 object only if the key is still in the state last seen by HEAD
+    
+    Creates the key only if absent, or replaces it only if its ETag is unchanged, so a
+    concurrent invocation cannot be overwritten between the check and the write.
+    Returns False if another writer got there first.
+    """
+    condition = {'IfMatch': existing_head['ETag']} if existing_head else {'IfNoneMatch': '*'}
+    try:
+        await asyncio.to_thread(s3_client.put_object, Bucket=bucket_name, Key=key, **condition, **put_args)
+        return True
+    except ClientError as e:
+        if e.response['Error']['Code'] in ('PreconditionFailed', 'ConditionalRequestConflict'):
+            return False
+        raise
+
+async def format_chapter(bucket_name: str, book_id: str, chapter: ChapterEvent, format_options: Dict[str, Any]) -> Dict[str, Any]:
+    """Format a single parsed chapter and store the result in S3"""
+    chapter_id = chapter.chapterId
+    parsed_s3_key = chapter.parsedS3Key
+    if chapter.formatOptions is not None:
+        format_options = chapter.formatOptions
+    
+    logger.info(f"Formatting chapter {chapter_id} for book {book_id}")
+    
+    # Generate S3 key for formatted content
+    formatted_s3_key = parsed_s3_key.replace('parsed/', 'formatted/')
+    
+    # Check if already formatted from the current parsed content (idempotency)
+    parsed_head, formatted_head = await asyncio.gather(
+        head_object_or_none(bucket_name, parsed_s3_key),
+        head_object_or_none(bucket_name, formatted_s3_key)
+    )
+    source_etag = parsed_head['ETag'] if parsed_head else None
+    if formatted_head:
+        formatted_source_etag = formatted_head.get('Metadata', {}).get(SOURCE_ETAG_METADATA_KEY)
+        # Objects written before source tracking carry no ETag and are kept as-is
+        if formatted_source_etag is None or formatted_source_etag == source_etag:
+            logger.info(f"Chapter {chapter_id} already formatted, skipping")
+            return {
+                'chapterId': chapter_id,
+                'formattedS3Key': formatted_s3_key
+            }
+        logger.info(f"Parsed content for chapter {chapter_id} changed since last format, reformatting")
+    
+    if parsed_head is None:
+        raise ValueError(f"Parsed chapter not found: s3://{bucket_name}/{parsed_s3_key}")
+    
+    # Placeholder files are too small to hold a chapter, skip the download and the Gemini call
+    if parsed_head['ContentLength'] < MIN_CONTENT_BYTES:
+        logger.warning(f"Empty content for chapter {chapter_id} ({parsed_head['ContentLength']} bytes)")
+        await put_object_conditionally(
+            bucket_name,
+            formatted_s3_key,
+            formatted_head,
+            Body=compressor.compress(b''),
+            ContentType='text/plain; charset=utf-8',
+            ContentEncoding=FORMATTED_CONTENT_ENCODING,
+            Metadata={SOURCE_ETAG_METADATA_KEY: source_etag}
+        )
+        return {
+            'chapterId': chapter_id,
+            'formattedS3Key': formatted_s3_key
+        }
+    
+    # Download parsed content from S3 (pinned to the ETag recorded on the output)
+    response = await asyncio.to_thread(s3_client.get_object, Bucket=bucket_name, Key=parsed_s3_key, IfMatch=source_etag)
+    raw_body = await asyncio.to_thread(response['Body'].read)
+    raw_content = normalize(raw_body.decode('utf-8'))
+    
+    if not raw_content.strip():
+        logger.warning(f"Empty content for chapter {chapter_id}")
+        return {
+            'chapterId': chapter_id,
+            'formattedS3Key': formatted_s3_key
+        }
+    
+    # Reuse a previous result for identical content (e.g. after a parsed key rename)
+    model = format_options.get('model', 'gemini-2.0-flash-exp')
+    cache_key = get_format_cache_key(raw_content, model)
+    try:
+        cached = await asyncio.to_thread(s3_client.get_object, Bucket=bucket_name, Key=cache_key)
+    except ClientError as e:
+        if e.response['Error']['Code'] not in ('NoSuchKey', '404'):
+            raise
+        cached = None
+    if cached is not None:
+        cached_body = await asyncio.to_thread(cached['Body'].read)
+        # Written like any other output, so a concurrent invocation's result is not overwritten
+        written = await put_object_conditionally(
+            bucket_name,
+            formatted_s3_key,
+            formatted_head,
+            Body=cached_body,
+            ContentType='text/plain; charset=utf-8',
+            ContentEncoding=FORMATTED_CONTENT_ENCODING,
+            Metadata={SOURCE_ETAG_METADATA_KEY: source_etag}
+        )
+        if written:
+            logger.info(f"Chapter {chapter_id} served from format cache {cache_key}")
+        else:
+            logger.info(f"Chapter {chapter_id} was formatted by a concurrent invocation, keeping its output")
+        return {
+            'chapterId': chapter_id,
+            'formattedS3Key': formatted_s3_key
+        }
+    
+    # Format content using Gemini; a failed window fails the whole chapter so nothing half-formatted
+    # is stored (the output and the format cache would both keep it for good) and the task is retried
+    try:
+        formatted_content = await format_text_with_gemini(raw_content, format_options)
+    except FormattingIncompleteError as e:
+        raise FormattingIncompleteError(f"Formatting chapter {chapter_id} incomplete: {str(e)}") from e
+    formatted_body = compressor.compress(formatted_content.encode('utf-8'))
+    
+    # Upload formatted content to S3
+    written = await put_object_conditionally(
+        bucket_name,
+        formatted_s3_key,
+        formatted_head,
+        Body=formatted_body,
+        ContentType='text/plain; charset=utf-8',
+        ContentEncoding=FORMATTED_CONTENT_ENCODING,
+        Metadata={SOURCE_ETAG_METADATA_KEY: source_etag}
+    )
+    if not written:
+        logger.info(f"Chapter {chapter_id} was formatted by a concurrent invocation, keeping its output")
+    
+    # Every window was formatted, so the result is safe to reuse
+    await put_object_conditionally(
+        bucket_name,
+        cache_key,
+        None,
+        Body=formatted_body,
+        ContentType='text/plain; charset=utf-8',
+        ContentEncoding=FORMATTED_CONTENT_ENCODING
+    )
+    
+    logger.info(f"Successfully formatted chapter {chapter_id} to {formatted_s3_key}")
+    
+    # TODO: Update chapter_processing table with format_status='complete'
+    
+    return {
+        'chapterId': chapter_id,
+        'formattedS3Key': formatted_s3_key
+    }
+
+async def _handle(event: FormatEvent) -> Dict[str, Any]:
+    """Format the chapter(s) in the event concurrently on a single event loop"""
+    book_id = event.bookId
+    format_options = event.formatOptions
+    
+    # Get S3 bucket from environment
+    bucket_name = os.environ['BUCKET_NAME']
+    
+    # Initialize the Gemini client and prompt cache once for the whole batch
+    client = get_gemini_client()
+    await get_system_prompt_cache(client, format_options.get('model', 'gemini-2.0-flash-exp'))
+    
+    if event.chapters is None:
+        if event.chapterId is None or event.parsedS3Key is None:
+            raise ValueError("Event needs either chapterId and parsedS3Key or a chapters list")
+        chapter = ChapterEvent(chapterId=event.chapterId, parsedS3Key=event.parsedS3Key)
+        return await format_chapter(bucket_name, book_id, chapter, format_options)
+    
+    chapters = event.chapters
+    logger.info(f"Formatting {len(chapters)} chapters for book {book_id}")
+    
+    # S3 and Gemini calls are I/O-bound, so their waits overlap on the event loop
+    semaphore = asyncio.Semaphore(MAX_CHAPTER_WORKERS)
+    
+    async def format_bounded(chapter: ChapterEvent) -> Dict[str, Any]:
+        async with semaphore:
+            return await format_chapter(bucket_name, book_id, chapter, format_options)
+    
+    results = await asyncio.gather(*(format_bounded(chapter) for chapter in chapters))
+    
+    return {
+        'results': list(results)
+    }
 
 def lambda_handler(event: Dict[str, Any], context) -> Dict[str, Any]:
     """
     Lambda handler for chapter formatting
     
-    Expected input:
+    Expected input (single chapter):
     {
         "bookId": "uuid",
         "chapterId": "uuid", 
@@ -135,70 +538,34 @@ def lambda_handler(event: Dict[str, Any], context) -> Dict[str, Any]:
         "idempotencyKey": "book:chapter:format"
     }
     
-    Output:
+    Expected input (batch of chapters sharing one container):
+    {
+        "bookId": "uuid",
+        "chapters": [{"chapterId": "uuid", "parsedS3Key": "parsed/book_uuid/chapter_001.txt"}],
+        "formatOptions": {"model": "gemini-2.0-flash-exp"}
+    }
+    
+    Output (single chapter):
     {
         "chapterId": "uuid",
         "formattedS3Key": "formatted/book_uuid/chapter_001.txt"
     }
+    
+    Output (batch):
+    {
+        "results": [{"chapterId": "uuid", "formattedS3Key": "formatted/book_uuid/chapter_001.txt"}]
+    }
     """
     try:
-        book_id = event['bookId']
-        chapter_id = event['chapterId']
-        parsed_s3_key = event['parsedS3Key']
-        format_options = event.get('formatOptions', {})
-        idempotency_key = event.get('idempotencyKey')
-        
-        logger.info(f"Formatting chapter {chapter_id} for book {book_id}")
-        
-        # Get S3 bucket from environment
-        bucket_name = os.environ['BUCKET_NAME']
-        
-        # Generate S3 key for formatted content
-        formatted_s3_key = parsed_s3_key.replace('parsed/', 'formatted/')
-        
-        # Check if already formatted (idempotency)
-        try:
-            s3_client.head_object(Bucket=bucket_name, Key=formatted_s3_key)
-            logger.info(f"Chapter {chapter_id} already formatted, skipping")
-            return {
-                'chapterId': chapter_id,
-                'formattedS3Key': formatted_s3_key
-            }
-        except s3_client.exceptions.NoSuchKey:
-            pass  # File doesn't exist, continue with formatting
-        
-        # Download parsed content from S3
-        response = s3_client.get_object(Bucket=bucket_name, Key=parsed_s3_key)
-        raw_content = response['Body'].read().decode('utf-8')
-        
-        if not raw_content.strip():
-            logger.warning(f"Empty content for chapter {chapter_id}")
-            return {
-                'chapterId': chapter_id,
-                'formattedS3Key': formatted_s3_key
-            }
-        
-        # Format content using Gemini
-        formatted_content = format_text_with_gemini(raw_content, format_options)
-        
-        # Upload formatted content to S3
-        s3_client.put_object(
-            Bucket=bucket_name,
-            Key=formatted_s3_key,
-            Body=formatted_content.encode('utf-8'),
-            ContentType='text/plain; charset=utf-8'
-        )
-        
-        logger.info(f"Successfully formatted chapter {chapter_id} to {formatted_s3_key}")
-        
-        # TODO: Update chapter_processing table with format_status='complete'
-        
-        return {
-            'chapterId': chapter_id,
-            'formattedS3Key': formatted_s3_key
-        }
+        # Validate the event once up front instead of failing on a missing key mid-run
+        format_event = msgspec.convert(event, FormatEvent)
+        return event_loop.run_until_complete(_handle(format_event))
         
     except Exception as e:
-        logger.error(f"Error formatting chapter {chapter_id}: {str(e)}")
+        logger.error(f"Error formatting chapter {event.get('chapterId', 'batch')} for book {event.get('bookId')}: {str(e)}")
         # TODO: Update database with error status
         raise
+
+bootstrap()
+if register_after_restore:
+    register_after_restore(refresh_after_restore)
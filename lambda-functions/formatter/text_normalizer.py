@@ -0,0 +1,26 @@
+"""
+Deterministic text normalization applied before Gemini formatting
+Expands abbreviations and symbols that have a single spoken form, so the model does not spend output tokens on them
+"""
+import re
+from typing import List, Tuple
+
+# Ordered (pattern, replacement) pairs; "&c." must run before the bare "&" rule
+NORMALIZATIONS: List[Tuple[re.Pattern, str]] = [
+    (re.compile(r'&c\.'), 'etcetera'),
+    (re.compile(r'[ \t]*&[ \t]*'), ' and '),
+    (re.compile(r'\bDr\.(?=\s)'), 'Doctor'),
+    (re.compile(r'\bProf\.(?=\s)'), 'Professor'),
+    (re.compile(r'\bMr\.(?=\s)'), 'Mister'),
+    (re.compile(r'\bMrs\.(?=\s)'), 'Missus'),
+    (re.compile(r'\bvs\.(?=\s)'), 'versus'),
+    (re.compile(r'(\d)[ \t]*%'), r'\1 percent'),
+    (re.compile(r'(\d)[ \t]*°'), r'\1 degrees'),
+    (re.compile(r'\$(\d[\d,]*(?:\.\d+)?)'), r'\1 dollars'),
+]
+
+def normalize(text: str) -> str:
+    """Expand abbreviations and symbols with an unambiguous spoken form"""
+    for pattern, replacement in NORMALIZATIONS:
+        text = pattern.sub(replacement, text)
+    return text
@@ -2,10 +2,14 @@
 Lambda function for scraping books from Project Gutenberg
 Migrated from existing bookScraper.py functionality
 """
+import codecs
 import json
 import os
-import boto3
+from email.message import Message
+from boto3.s3.transfer import TransferConfig
+from botocore.exceptions import ClientError
 import logging
+import msgspec
 from typing import Dict, Any
 import requests
 from urllib.parse import urlparse
@@ -14,9 +18,61 @@ from urllib.parse import urlparse
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-# AWS clients
-s3_client = boto3.client('s3')
-secretsmanager_client = boto3.client('secretsmanager')
+# AWS clients (shared configuration from the aws_clients layer)
+from aws_clients import s3_client
+
+# Multipart settings for streaming downloads straight into S3
+# "crt" uses the AWS CRT transfer client (parallel part uploads over multiple connections)
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+upload_transfer_config = TransferConfig(
+    multipart_threshold=UPLOAD_CHUNK_SIZE,
+    multipart_chunksize=UPLOAD_CHUNK_SIZE,
+    use_threads=True,
+    preferred_transfer_client=os.environ.get('S3_TRANSFER_CLIENT', 'crt')
+)
+
+class Utf8TranscodingReader:
+    """File-like reader re-encoding a byte stream from another charset to UTF-8 as it is read"""
+    
+    def __init__(self, source, charset: str):
+        self.source = source
+        # Undecodable bytes become U+FFFD instead of failing the whole scrape on a mislabelled charset
+        self.decoder = codecs.getincrementaldecoder(charset)(errors='replace')
+        self.pending = bytearray()
+        self.finished = False
+    
+    def read(self, size: int = -1) -> bytes:
+        while not self.finished and (size < 0 or len(self.pending) < size):
+            data = self.source.read(UPLOAD_CHUNK_SIZE)
+            self.finished = not data
+            self.pending += self.decoder.decode(data, final=self.finished).encode('utf-8')
+        
+        if size < 0 or size > len(self.pending):
+            size = len(self.pending)
+        chunk = bytes(self.pending[:size])
+        del self.pending[:size]
+        return chunk
+
+def get_declared_charset(content_type: str) -> str:
+    """Codec name of the charset in a Content-Type header, defaulting to utf-8 when none is given"""
+    header = Message()
+    header['Content-Type'] = content_type
+    charset = header.get_content_charset() or 'utf-8'
+    try:
+        return codecs.lookup(charset).name
+    except LookupError:
+        logger.warning(f"Unknown charset {charset}, storing the download unchanged")
+        return 'utf-8'
+
+class ScrapeOptions(msgspec.Struct):
+    """Options controlling a scrape"""
+    force: bool = False
+
+class ScrapeEvent(msgspec.Struct):
+    """Scraper event"""
+    bookId: str
+    sourceUrl: str
+    scrapeOptions: ScrapeOptions = msgspec.field(default_factory=ScrapeOptions)
 
 def get_database_connection():
     """Get database connection using RDS Proxy"""
@@ -41,10 +97,12 @@ def lambda_handler(event: Dict[str, Any], context) -> Dict[str, Any]:
         "rawS3Key": "raw/2025-08-21/book_uuid/book.txt"
     }
     """
+    book_id = event.get('bookId')
     try:
-        book_id = event['bookId']
-        source_url = event['sourceUrl']
-        scrape_options = event.get('scrapeOptions', {})
+        # Validate the event once up front instead of failing on a missing key mid-run
+        scrape_event = msgspec.convert(event, ScrapeEvent)
+        source_url = scrape_event.sourceUrl
+        scrape_options = scrape_event.scrapeOptions
         
         logger.info(f"Starting scrape for book {book_id} from {source_url}")
         
@@ -57,7 +115,7 @@ def lambda_handler(event: Dict[str, Any], context) -> Dict[str, Any]:
         raw_s3_key = f"raw/{date_str}/{book_id}/book.txt"
         
         # Check if already exists (unless force=True)
-        if not scrape_options.get('force', False):
+        if not scrape_options.force:
             try:
                 s3_client.head_object(Bucket=bucket_name, Key=raw_s3_key)
                 logger.info(f"Book {book_id} already scraped, skipping")
@@ -65,20 +123,30 @@ def lambda_handler(event: Dict[str, Any], context) -> Dict[str, Any]:
                     'bookId': book_id,
                     'rawS3Key': raw_s3_key
                 }
-            except s3_client.exceptions.NoSuchKey:
-                pass  # File doesn't exist, continue with scraping
-        
-        # Download content from source URL
-        response = requests.get(source_url, timeout=60)
-        response.raise_for_status()
+            except ClientError as e:
+                if e.response['Error']['Code'] not in ('NoSuchKey', '404'):
+                    raise
+                # File doesn't exist, continue with scraping
         
-        # Upload to S3
-        s3_client.put_object(
-            Bucket=bucket_name,
-            Key=raw_s3_key,
-            Body=response.text.encode('utf-8'),
-            ContentType='text/plain; charset=utf-8'
-        )
+        # Stream content from source URL into S3 without buffering the whole book
+        with requests.get(source_url, stream=True, timeout=60) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True  # Undo gzip/deflate transfer encoding
+            
+            # Raw objects are always stored as UTF-8, which the formatter decodes them as
+            body = response.raw
+            charset = get_declared_charset(response.headers.get('Content-Type', ''))
+            if charset != 'utf-8':
+                logger.info(f"Transcoding book {book_id} from {charset} to utf-8")
+                body = Utf8TranscodingReader(response.raw, charset)
+            
+            s3_client.upload_fileobj(
+                body,
+                bucket_name,
+                raw_s3_key,
+                ExtraArgs={'ContentType': 'text/plain; charset=utf-8'},
+                Config=upload_transfer_config
+            )
         
         logger.info(f"Successfully scraped book {book_id} to {raw_s3_key}")
         
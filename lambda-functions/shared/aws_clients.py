@@ -0,0 +1,33 @@
+"""
+Shared AWS clients for the pipeline Lambda functions
+Deployed as a Lambda layer so every function reuses the same client configuration
+"""
+import os
+import boto3
+import logging
+from botocore.config import Config
+
+logger = logging.getLogger()
+
+# Keep-alive connections, a larger pool for concurrent chapter work and adaptive retries under throttling
+client_config = Config(
+    retries={'mode': 'adaptive', 'max_attempts': 5},
+    max_pool_connections=50,
+    tcp_keepalive=True
+)
+
+s3_client = boto3.client('s3', config=client_config)
+secretsmanager_client = boto3.client('secretsmanager', config=client_config)
+
+def prewarm_connections() -> None:
+    """Open a connection to the pipeline bucket during init so the first request finds a warm pool"""
+    bucket_name = os.environ.get('BUCKET_NAME')
+    if not bucket_name or os.environ.get('PREWARM_AWS_CONNECTIONS', 'false').lower() != 'true':
+        return
+    
+    try:
+        s3_client.head_bucket(Bucket=bucket_name)
+    except Exception as e:
+        logger.warning(f"Connection prewarm failed for bucket {bucket_name}: {str(e)}")
+
+prewarm_connections()
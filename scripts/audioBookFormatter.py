@@ -1,12 +1,26 @@
+import asyncio
+import hashlib
+import json
 import logging
 import os
 import re
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Optional
+from typing import Deque, Dict, Iterator, List, Optional, Tuple
 from google import genai
+from google.genai import errors as genai_errors
+from tenacity import before_sleep_log, retry, retry_if_exception, stop_after_attempt, wait_exponential_jitter
 import typer
 from dotenv import load_dotenv
 
+try:
+    import aiohttp
+except ImportError:  # chunk requests fall back to the SDK's async client
+    aiohttp = None
+
 # Load environment variables
 load_dotenv()
 
@@ -17,9 +31,206 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Process-wide Gemini clients by API key, so every formatter shares one connection pool
+_genai_clients: Dict[str, genai.Client] = {}
+
+
+def get_genai_client(api_key: str) -> genai.Client:
+    """Return the shared Gemini client for an API key, creating it on first use.
+    
+    The client carries the low-volume calls (token counting, context caches, batches);
+    chunk requests go through GeminiHTTPClient's pooled aiohttp session.
+    
+    Args:
+        api_key: Gemini API key
+        
+    Returns:
+        Shared genai.Client instance
+    """
+    client = _genai_clients.get(api_key)
+    if client is not None:
+        return client
+    
+    try:
+        client = genai.Client(api_key=api_key)
+    except Exception as e:
+        logger.error(f"Failed to initialize Google GenAI client: {e}")
+        logger.error("Make sure GEMINI_API_KEY environment variable is set")
+        raise ValueError("Failed to initialize Google GenAI client. Ensure GEMINI_API_KEY environment variable is set.")
+    
+    _genai_clients[api_key] = client
+    logger.info("Initialized shared Gemini API client")
+    return client
+
+
+class FormattingError(Exception):
+    """Raised when Gemini cannot produce formatted text for a chunk."""
+
+
+# HTTP status codes worth retrying: rate limiting and transient server errors
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+_backoff = wait_exponential_jitter(initial=1, max=30)
+
+
+class GeminiHTTPError(Exception):
+    """Non-200 response from the Gemini REST API."""
+
+    def __init__(self, code: int, message: str, retry_after: Optional[str] = None):
+        super().__init__(f"{code}: {message}")
+        self.code = code
+        self.retry_after = retry_after
+
+
+def _is_retryable(error: BaseException) -> bool:
+    """Retry rate limits, transient server errors and timeouts; fail fast on everything else."""
+    if isinstance(error, (genai_errors.APIError, GeminiHTTPError)):
+        return error.code in RETRYABLE_STATUS_CODES
+    if aiohttp is not None and isinstance(error, aiohttp.ClientConnectionError):
+        return True
+    return isinstance(error, (TimeoutError, asyncio.TimeoutError))
+
+
+def _retry_wait(retry_state) -> float:
+    """Wait as long as the server's Retry-After asks, else back off exponentially with jitter."""
+    error = retry_state.outcome.exception()
+    retry_after = getattr(error, 'retry_after', None)
+    response = getattr(error, 'response', None)
+    if retry_after is None and response is not None:
+        retry_after = getattr(response, 'headers', {}).get('Retry-After')
+    if retry_after:
+        try:
+            return min(float(retry_after), 60.0)
+        except ValueError:
+            pass  # HTTP-date form; fall back to our own backoff
+    return _backoff(retry_state)
+
+
+def extract_response_text(response: Dict) -> str:
+    """Pull the generated text out of a generateContent JSON response, or '' if there is none."""
+    try:
+        parts = response["candidates"][0]["content"]["parts"]
+    except (KeyError, IndexError, TypeError):
+        return ""
+    return "".join(part.get("text", "") for part in parts).strip()
+
+
+class GeminiHTTPClient:
+    """Minimal async client that POSTs generateContent requests straight to the Gemini REST API.
+    
+    Used for the per-chunk hot path: one reused aiohttp session, plain JSON in and out,
+    without the SDK's request/response model layer. Everything else (context caches,
+    token counting, batches) still goes through genai.Client.
+    """
+    
+    BASE_URL = "https://generativelanguage.googleapis.com/v1beta"
+
+    def __init__(self, api_key: str, model: str, system_instruction: str, temperature: float,
+                 max_output_tokens: int, timeout: int = 120):
+        self.api_key = api_key
+        self.model = model
+        self.timeout = timeout
+        self._session: Optional["aiohttp.ClientSession"] = None
+        # Request fragments that are identical for every call, built once
+        self._url = f"{self.BASE_URL}/models/{model}:generateContent"
+        self._system_instruction = {"parts": [{"text": system_instruction}]}
+        self._generation_config = {"temperature": temperature, "maxOutputTokens": max_output_tokens}
+
+    def _get_session(self) -> "aiohttp.ClientSession":
+        """Create the session on first use, inside the event loop that will run the requests."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=100, limit_per_host=100, ttl_dns_cache=300),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers={"x-goog-api-key": self.api_key}
+            )
+        return self._session
+
+    async def generate(self, text: str, cached_content: Optional[str] = None) -> str:
+        """Generate content for one text prompt.
+        
+        Args:
+            text: User content
+            cached_content: Name of a context cache holding the system prompt; when
+                None the system instruction is sent inline
+            
+        Returns:
+            Generated text, or '' if the response had none
+        """
+        payload: Dict = {
+            "contents": [{"role": "user", "parts": [{"text": text}]}],
+            "generationConfig": self._generation_config
+        }
+        if cached_content:
+            payload["cachedContent"] = cached_content
+        else:
+            payload["systemInstruction"] = self._system_instruction
+        
+        async with self._get_session().post(self._url, json=payload) as response:
+            if response.status != 200:
+                raise GeminiHTTPError(response.status, await response.text(), response.headers.get('Retry-After'))
+            data = await response.json()
+        return extract_response_text(data)
+
+    async def close(self) -> None:
+        """Close the underlying aiohttp session."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+
 class AudioBookFormatter:
     """Format book chapters for audiobook narration using Gemini API."""
     
+    MODEL_NAME = "gemini-2.0-flash-exp"
+    TEMPERATURE = 0.1
+    MAX_OUTPUT_TOKENS = 32000
+    
+    # Chunk size in input tokens. Kept below MAX_OUTPUT_TOKENS because formatting spells
+    # out numbers and abbreviations, so a chunk's output is usually longer than its input.
+    MAX_CHUNK_TOKENS = 24000
+    # Characters per token used until the ratio has been measured with count_tokens
+    DEFAULT_CHARS_PER_TOKEN = 4.0
+    CALIBRATION_SAMPLE_CHARS = 16000
+    # Per-book record in formattedChapters of the chars/token ratio and each chapter's chunk size,
+    # so a rerun splits retried chapters exactly as before and hits the response cache
+    CHUNK_SIZES_FILE = ".chunk_sizes.json"
+    
+    # Adaptive chunk sizing: before each chapter is split, shrink chunks (never below MIN_CHUNK_TOKENS)
+    # so a request is predicted to take about TARGET_CHUNK_SECONDS, from a linear fit of
+    # recent latencies. Smaller chunks spread a chapter over more concurrent requests.
+    # A book keeps at most max_concurrency chapters in flight, so later chapters are split
+    # after earlier requests have produced latency samples.
+    MIN_CHUNK_TOKENS = 2000
+    TARGET_CHUNK_SECONDS = 60.0
+    LATENCY_WINDOW = 50
+    MIN_LATENCY_SAMPLES = 5
+    
+    # Chapter/section headings used as preferred split points, and sentence boundaries
+    _HEADING_KEYWORDS = ("CHAPTER", "Chapter", "BOOK", "Book")
+    _HEADING_TAIL_RE = re.compile(r'\s+[IVX\d]+')
+    _SENT_RE = re.compile(r'(?<=[.!?])\s+')
+    _HEADING_LINE_RE = re.compile(r'\s*(?:CHAPTER|Chapter|BOOK|Book)\s+[IVX\d]+')
+    
+    # Anything the system prompt would rewrite: numbers, abbreviations, symbols, headings,
+    # footnote references and dialogue (speaker attribution). Single quotes count only when
+    # they open a quotation, so contractions and possessives stay plain prose.
+    _NEEDS_FORMATTING_RE = re.compile(
+        r'\d|\b(?:Mr|Mrs|Dr|Prof|St|vs|etc|Sept?|Jan|Feb|Aug|Oct|Nov|Dec)\.|[&%$°§*_\[\]"“”‘]|(?<!\w)[\'’]'
+        r'|\bCHAPTER\b|^' + _HEADING_LINE_RE.pattern,
+        re.MULTILINE
+    )
+    # Chunks up to this size without any of the above are passed through unchanged
+    PASSTHROUGH_MAX_CHARS = 5000
+    # Sentences longer than this may be broken up by the formatter, so they still go to Gemini
+    PASSTHROUGH_MAX_SENTENCE_CHARS = 300
+    
+    # Explicit context cache holding SYSTEM_PROMPT, refreshed shortly before it expires
+    PROMPT_CACHE_TTL_SECONDS = 3600
+    PROMPT_CACHE_REFRESH_MARGIN_SECONDS = 300
+    
+    # Terminal states of a Gemini batch job
+    BATCH_DONE_STATES = {"JOB_STATE_SUCCEEDED", "JOB_STATE_FAILED", "JOB_STATE_CANCELLED", "JOB_STATE_EXPIRED"}
+    
     # Universal system prompt for audiobook formatting
     SYSTEM_PROMPT = """You are an expert audiobook formatter specializing in converting written text from any genre or time period into optimal format for text-to-speech narration. Your task is to transform written text into the perfect format for audio while preserving every word of the original content.
 
@@ -84,30 +295,185 @@ CRITICAL REQUIREMENTS:
 
 Transform this text for optimal audiobook narration:"""
 
-    def __init__(self, api_key: Optional[str] = None):
-        """Initialize the formatter with Gemini API."""
+    def __init__(self, api_key: Optional[str] = None, max_concurrency: int = 8, cache_dir: Optional[Path] = None,
+                 use_context_cache: Optional[bool] = None):
+        """Initialize the formatter with Gemini API.
+        
+        Args:
+            api_key: Gemini API key (falls back to GEMINI_API_KEY)
+            max_concurrency: Maximum number of Gemini requests in flight at once
+            cache_dir: Directory for cached Gemini responses (falls back to
+                FORMATTER_CACHE_DIR, then ~/.gutenberg/formatter_cache)
+            use_context_cache: Reference SYSTEM_PROMPT through a Gemini context cache
+                instead of resending it (falls back to GEMINI_USE_CACHE=true)
+        """
         self.api_key = api_key or os.getenv('GEMINI_API_KEY')
+        self.max_concurrency = max_concurrency
         if not self.api_key:
             raise ValueError("Gemini API key is required. Set GEMINI_API_KEY environment variable or pass it directly.")
         
-        # Initialize Google GenAI client - matching chapterChunker pattern
+        self.cache_dir = Path(cache_dir or os.getenv('FORMATTER_CACHE_DIR') or Path.home() / ".gutenberg" / "formatter_cache")
+        self.stats = {"hits": 0, "misses": 0, "deduplicated": 0, "skipped": 0}
+        # In-flight chunk requests by content hash, so identical chunks are sent once
+        self._inflight_chunks: Dict[str, asyncio.Future] = {}
+        if use_context_cache is None:
+            use_context_cache = os.getenv('GEMINI_USE_CACHE', 'false').lower() == 'true'
+        self.use_context_cache = use_context_cache
+        self._prompt_cache: Optional[Tuple[str, float]] = None
+        self._prompt_cache_lock = asyncio.Lock()
+        self.chars_per_token: Optional[float] = None
+        self._calibration_lock = asyncio.Lock()
+        self.chunk_tokens = self.MAX_CHUNK_TOKENS
+        # Chunk size in characters each chapter was first split with, by chapter file name
+        self._chunk_sizes: Dict[str, int] = {}
+        self._chunk_sizes_path: Optional[Path] = None
+        # (chunk chars, seconds) of recent successful requests
+        self._latency_samples: Deque[Tuple[int, float]] = deque(maxlen=self.LATENCY_WINDOW)
+        # Process pool for chapter splitting while a whole book runs; None uses the default thread pool
+        self._split_executor: Optional[Executor] = None
+        # Direct REST client for chunk requests; without aiohttp the SDK's async client is used
+        self._http_client = None
+        if aiohttp is not None:
+            self._http_client = GeminiHTTPClient(
+                self.api_key, self.MODEL_NAME, self.SYSTEM_PROMPT, self.TEMPERATURE, self.MAX_OUTPUT_TOKENS
+            )
+        
+        # SDK request configs are validated once here rather than on every chunk
+        self._system_content = genai.types.Content(parts=[genai.types.Part(text=self.SYSTEM_PROMPT)])
+        self._gen_config = genai.types.GenerateContentConfig(
+            system_instruction=self._system_content,
+            temperature=self.TEMPERATURE,
+            max_output_tokens=self.MAX_OUTPUT_TOKENS
+        )
+        self._cached_gen_config: Optional[Tuple[str, genai.types.GenerateContentConfig]] = None
+        
+        # Bounds concurrent Gemini requests across all chapters and chunks
+        self._request_semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    @property
+    def genaiModel(self) -> genai.Client:
+        """Shared Gemini client, created on first use."""
+        return get_genai_client(self.api_key)
+
+    def _max_chars(self, max_tokens: Optional[int] = None) -> int:
+        """Character budget for a chunk of max_tokens, using the measured chars/token ratio if known."""
+        chars_per_token = self.chars_per_token or self.DEFAULT_CHARS_PER_TOKEN
+        return int((max_tokens or self.chunk_tokens) * chars_per_token)
+
+    def _update_chunk_tokens(self) -> None:
+        """Re-fit elapsed ≈ a + b * chars on recent requests and resize chunks to hit the target latency."""
+        if len(self._latency_samples) < self.MIN_LATENCY_SAMPLES:
+            return
+        
+        n = len(self._latency_samples)
+        mean_chars = sum(chars for chars, _ in self._latency_samples) / n
+        mean_elapsed = sum(elapsed for _, elapsed in self._latency_samples) / n
+        variance = sum((chars - mean_chars) ** 2 for chars, _ in self._latency_samples)
+        if variance == 0:
+            return  # All chunks the same size; no slope to fit yet
+        slope = sum((chars - mean_chars) * (elapsed - mean_elapsed) for chars, elapsed in self._latency_samples) / variance
+        intercept = mean_elapsed - slope * mean_chars
+        
+        if slope <= 0:
+            target_tokens = self.MAX_CHUNK_TOKENS
+        else:
+            target_chars = (self.TARGET_CHUNK_SECONDS - intercept) / slope
+            chars_per_token = self.chars_per_token or self.DEFAULT_CHARS_PER_TOKEN
+            target_tokens = round(target_chars / chars_per_token)
+        
+        chunk_tokens = min(max(target_tokens, self.MIN_CHUNK_TOKENS), self.MAX_CHUNK_TOKENS)
+        if chunk_tokens != self.chunk_tokens:
+            logger.info(f"Adjusting chunk size from {self.chunk_tokens} to {chunk_tokens} tokens "
+                        f"(latency ≈ {intercept:.1f}s + {slope * 1000:.3f}s per 1K chars)")
+            self.chunk_tokens = chunk_tokens
+
+    @classmethod
+    def _read_calibration_sample(cls, chapter_path: Path) -> str:
+        """Read the start of a chapter for measuring chars/token."""
+        with open(chapter_path, 'r', encoding='utf-8') as f:
+            return f.read(cls.CALIBRATION_SAMPLE_CHARS)
+
+    def _set_chars_per_token(self, sample: str, total_tokens: Optional[int]) -> None:
+        """Store the measured ratio, clamped to a sane range so one odd sample cannot skew every split."""
+        if not total_tokens:
+            self.chars_per_token = self.DEFAULT_CHARS_PER_TOKEN
+            return
+        self.chars_per_token = min(max(len(sample) / total_tokens, 1.0), 8.0)
+        logger.info(f"Measured {self.chars_per_token:.2f} characters per token")
+
+    async def _calibrate_chars_per_token(self, chapter_path: Path) -> None:
+        """Measure the text's chars/token ratio once per run with Gemini's count_tokens."""
+        async with self._calibration_lock:
+            if self.chars_per_token is not None:
+                return
+            try:
+                sample = self._read_calibration_sample(chapter_path)
+                if not sample.strip():
+                    return  # Try again with the next chapter
+                response = await self.genaiModel.aio.models.count_tokens(model=self.MODEL_NAME, contents=sample)
+                self._set_chars_per_token(sample, response.total_tokens)
+            except Exception as e:
+                logger.warning(f"Could not count tokens, assuming {self.DEFAULT_CHARS_PER_TOKEN} chars/token: {e}")
+                self.chars_per_token = self.DEFAULT_CHARS_PER_TOKEN
+
+    def _calibrate_chars_per_token_sync(self, chapter_path: Path) -> None:
+        """Blocking variant of _calibrate_chars_per_token for batch mode."""
+        if self.chars_per_token is not None:
+            return
         try:
-            self.genaiModel = genai.Client(api_key=self.api_key)
-            logger.info("AudioBookFormatter initialized with Gemini API")
+            sample = self._read_calibration_sample(chapter_path)
+            if not sample.strip():
+                return
+            response = self.genaiModel.models.count_tokens(model=self.MODEL_NAME, contents=sample)
+            self._set_chars_per_token(sample, response.total_tokens)
         except Exception as e:
-            logger.error(f"Failed to initialize Google GenAI client: {e}")
-            logger.error("Make sure GEMINI_API_KEY environment variable is set")
-            raise ValueError("Failed to initialize Google GenAI client. Ensure GEMINI_API_KEY environment variable is set.")
+            logger.warning(f"Could not count tokens, assuming {self.DEFAULT_CHARS_PER_TOKEN} chars/token: {e}")
+            self.chars_per_token = self.DEFAULT_CHARS_PER_TOKEN
 
-    def split_text_intelligently(self, text: str, max_tokens: int = 30000) -> List[str]:
+    def _load_chunk_sizes(self, formatted_dir: Path) -> None:
+        """Reuse the chunking recorded by an earlier run of this book, if any."""
+        self._chunk_sizes_path = formatted_dir / self.CHUNK_SIZES_FILE
+        self._chunk_sizes = {}
+        try:
+            with open(self._chunk_sizes_path, 'r', encoding='utf-8') as f:
+                recorded = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable {self._chunk_sizes_path}: {e}")
+            return
+        
+        self._chunk_sizes = recorded.get("chapters", {})
+        if recorded.get("chars_per_token"):
+            self.chars_per_token = recorded["chars_per_token"]
+
+    def _chapter_max_chars(self, chapter_path: Path) -> int:
+        """Chunk size for a chapter: the recorded one if it was split before, else the current one."""
+        max_chars = self._chunk_sizes.get(chapter_path.name)
+        if max_chars is not None:
+            return max_chars
+        
+        max_chars = self._max_chars()
+        self._chunk_sizes[chapter_path.name] = max_chars
+        if self._chunk_sizes_path is not None:
+            try:
+                with open(self._chunk_sizes_path, 'w', encoding='utf-8') as f:
+                    json.dump({"chars_per_token": self.chars_per_token, "chapters": self._chunk_sizes}, f, indent=2)
+            except OSError as e:
+                logger.warning(f"Could not record chunk sizes in {self._chunk_sizes_path}: {e}")
+        return max_chars
+
+    def split_text_intelligently(self, text: str, max_tokens: Optional[int] = None) -> List[str]:
         """Split text into chunks at natural break points.
         
-        With Gemini's 1M input token limit, we can handle much larger chunks.
-        Using 200K tokens (~800K characters) allows for better context preservation.
+        Chunks hold up to max_tokens input tokens (default: the current adaptive chunk
+        size), converted to characters with the measured chars/token ratio.
         """
-        # Rough estimate: 1 token ≈ 4 characters for English text
-        max_chars = max_tokens * 4
-        
+        return self._split_text(text, self._max_chars(max_tokens))
+
+    @classmethod
+    def _split_text(cls, text: str, max_chars: int) -> List[str]:
+        """Split text into chunks of at most max_chars at natural break points."""
         if len(text) <= max_chars:
             return [text]
         
@@ -115,7 +481,7 @@ Transform this text for optimal audiobook narration:"""
         current_chunk = ""
         
         # For classic literature, try to split by chapters or major sections first
-        chapter_breaks = re.split(r'\n\s*(?:CHAPTER|Chapter|BOOK|Book)\s+[IVX\d]+', text)
+        chapter_breaks = cls._split_at_headings(text)
         
         if len(chapter_breaks) > 1:
             logger.info(f"Found {len(chapter_breaks)} natural chapter/section breaks")
@@ -123,110 +489,438 @@ Transform this text for optimal audiobook narration:"""
             for i, section in enumerate(chapter_breaks):
                 if len(section.strip()) > max_chars:
                     # If individual section is still too long, split by paragraphs
-                    section_chunks = self._split_by_paragraphs(section, max_chars)
+                    section_chunks = cls._split_by_paragraphs(section, max_chars)
                     chunks.extend(section_chunks)
                 elif section.strip():
                     chunks.append(section.strip())
         else:
             # No natural chapter breaks, split by paragraphs
-            chunks = self._split_by_paragraphs(text, max_chars)
+            chunks = cls._split_by_paragraphs(text, max_chars)
         
         logger.info(f"Split text into {len(chunks)} chunks")
         return chunks
     
-    def _split_by_paragraphs(self, text: str, max_chars: int) -> List[str]:
-        """Split text by paragraphs when no natural chapter breaks exist."""
+    @classmethod
+    def _split_at_headings(cls, text: str) -> List[str]:
+        """Split text at chapter/section headings, dropping the headings themselves.
+        
+        Equivalent to re.split(r'\n\s*(?:CHAPTER|Chapter|BOOK|Book)\s+[IVX\d]+', text),
+        but finds candidates with str.find and only runs a small regex at each one
+        instead of matching across the whole text.
+        """
+        sections = []
+        section_start = 0
+        next_positions = {keyword: text.find(keyword) for keyword in cls._HEADING_KEYWORDS}
+        
+        while True:
+            found = [(pos, keyword) for keyword, pos in next_positions.items() if pos >= 0]
+            if not found:
+                break
+            pos, keyword = min(found)
+            next_positions[keyword] = text.find(keyword, pos + 1)
+            
+            # Candidates inside the previous heading are not headings
+            if pos < section_start:
+                continue
+            
+            tail = cls._HEADING_TAIL_RE.match(text, pos + len(keyword))
+            if not tail:
+                continue
+            
+            # The heading must be preceded by whitespace back to a newline; the split starts at the earliest one
+            heading_start = -1
+            i = pos - 1
+            while i >= section_start and text[i].isspace():
+                if text[i] == '\n':
+                    heading_start = i
+                i -= 1
+            if heading_start < 0:
+                continue
+            
+            sections.append(text[section_start:heading_start])
+            section_start = tail.end()
+        
+        sections.append(text[section_start:])
+        return sections
+
+    @classmethod
+    def _split_by_paragraphs(cls, text: str, max_chars: int) -> List[str]:
+        """Split text by paragraphs when no natural chapter breaks exist.
+        
+        Pieces are collected in a list with a running length and joined once per
+        chunk, so splitting stays linear in the text size.
+        """
         chunks = []
-        current_chunk = ""
+        current_parts: List[str] = []
+        current_len = 0
+        
+        def add_part(part: str, separator: str) -> None:
+            nonlocal current_len
+            if current_parts:
+                current_parts.append(separator)
+                current_len += len(separator)
+            current_parts.append(part)
+            current_len += len(part)
+        
+        def flush() -> None:
+            nonlocal current_len
+            chunks.append(''.join(current_parts).strip())
+            current_parts.clear()
+            current_len = 0
         
         # Split by paragraphs first (double newlines)
         paragraphs = text.split('\n\n')
         
         for paragraph in paragraphs:
             # If adding this paragraph would exceed the limit
-            if len(current_chunk) + len(paragraph) > max_chars:
-                if current_chunk:
-                    chunks.append(current_chunk.strip())
-                    current_chunk = paragraph
+            if current_len + len(paragraph) > max_chars:
+                if current_parts:
+                    flush()
+                    add_part(paragraph, "\n\n")
                 else:
                     # If single paragraph is too long, split by sentences
-                    sentences = re.split(r'(?<=[.!?])\s+', paragraph)
+                    sentences = cls._SENT_RE.split(paragraph)
                     for sentence in sentences:
-                        if len(current_chunk) + len(sentence) > max_chars:
-                            if current_chunk:
-                                chunks.append(current_chunk.strip())
-                                current_chunk = sentence
+                        if current_len + len(sentence) > max_chars:
+                            if current_parts:
+                                flush()
+                                add_part(sentence, " ")
                             else:
                                 # If single sentence is still too long, force split
                                 chunks.append(sentence[:max_chars])
-                                current_chunk = sentence[max_chars:]
+                                if sentence[max_chars:]:
+                                    add_part(sentence[max_chars:], " ")
                         else:
-                            current_chunk += " " + sentence if current_chunk else sentence
+                            add_part(sentence, " ")
             else:
-                current_chunk += "\n\n" + paragraph if current_chunk else paragraph
+                add_part(paragraph, "\n\n")
         
-        if current_chunk:
-            chunks.append(current_chunk.strip())
+        if current_parts:
+            flush()
         
         return chunks
 
-    def format_text_chunk(self, text: str) -> str:
-        """Format a single chunk of text using Gemini API."""
+    @classmethod
+    def _iter_chunks_streaming(cls, chapter_path: Path, max_chars: int) -> Iterator[str]:
+        """Yield a chapter file's chunks while reading it.
+        
+        Files that fit in one chunk are read whole. Larger files are read line by
+        line and cut at chapter/section headings and, once a window outgrows the
+        limit, at paragraph breaks, so only about one chunk is held in memory.
+        Text after the last full chunk of a window stays in the window.
+        """
+        # UTF-8 never has fewer bytes than characters, so this is a safe fast path
+        if chapter_path.stat().st_size <= max_chars:
+            with open(chapter_path, 'r', encoding='utf-8') as f:
+                content = f.read()
+            if content.strip():
+                yield from cls._split_text(content, max_chars)
+            return
+        
+        window: List[str] = []
+        window_len = 0
+        with open(chapter_path, 'r', encoding='utf-8', buffering=1 << 20) as f:
+            for line in f:
+                if window_len and cls._HEADING_LINE_RE.match(line):
+                    yield from cls._split_window(''.join(window), max_chars)
+                    window.clear()
+                    window_len = 0
+                elif window_len > max_chars and not line.strip():
+                    # Only full chunks leave the window; the leftover after the last one is
+                    # carried forward, so a cut does not produce a small extra chunk
+                    chunks = cls._split_window(''.join(window), max_chars)
+                    yield from chunks[:-1]
+                    window.clear()
+                    window_len = 0
+                    if chunks:
+                        window.append(chunks[-1] + "\n")
+                        window_len = len(window[0])
+                window.append(line)
+                window_len += len(line)
+        
+        if window:
+            yield from cls._split_window(''.join(window), max_chars)
+
+    @classmethod
+    def _split_window(cls, text: str, max_chars: int) -> List[str]:
+        """Turn one streamed window of lines into chunks no longer than max_chars."""
+        stripped = text.strip()
+        if not stripped:
+            return []
+        if len(stripped) <= max_chars:
+            return [stripped]
+        return cls._split_by_paragraphs(text, max_chars)
+
+    def _cache_path(self, text: str) -> Path:
+        """Content-addressed cache location for a chunk's formatted response."""
+        key = hashlib.sha256(json.dumps({
+            "m": self.MODEL_NAME,
+            "t": self.TEMPERATURE,
+            "p": self.SYSTEM_PROMPT,
+            "c": text
+        }).encode('utf-8')).hexdigest()
+        return self.cache_dir / key[:2] / key
+
+    def _read_cache(self, text: str) -> Optional[str]:
+        """Return the cached formatted text for a chunk, or None on a miss."""
         try:
-            prompt = f"{self.SYSTEM_PROMPT}\n\n{text}"
+            cached = self._cache_path(text).read_text(encoding='utf-8')
+        except (FileNotFoundError, OSError):
+            self.stats["misses"] += 1
+            return None
+        self.stats["hits"] += 1
+        return cached
+
+    def _write_cache(self, text: str, formatted: str) -> None:
+        """Store a formatted response atomically so interrupted runs never leave partial entries."""
+        cache_path = self._cache_path(text)
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_text(formatted, encoding='utf-8')
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            logger.warning(f"Could not write formatter cache entry {cache_path}: {e}")
+
+    def log_cache_stats(self) -> None:
+        """Log how many chunks were served from the response cache."""
+        logger.info(f"Formatter cache: {self.stats['hits']} hits, {self.stats['misses']} misses, "
+                    f"{self.stats['deduplicated']} duplicate chunks reused, "
+                    f"{self.stats['skipped']} clean chunks passed through")
+
+    async def _get_prompt_cache(self) -> Optional[str]:
+        """Get or create the context cache holding SYSTEM_PROMPT.
+        
+        Returns:
+            Cache name to pass as cached_content, or None to send the prompt inline
+        """
+        if not self.use_context_cache:
+            return None
+        
+        # Concurrent chunks wait here so only one of them creates the cache
+        async with self._prompt_cache_lock:
+            if self._prompt_cache and time.time() < self._prompt_cache[1] - self.PROMPT_CACHE_REFRESH_MARGIN_SECONDS:
+                return self._prompt_cache[0]
             
-            response = self.genaiModel.models.generate_content(
-                model="gemini-2.0-flash-exp",
-                contents=prompt,
-                config=genai.types.GenerateContentConfig(
-                    temperature=0.1,
-                    max_output_tokens=32000 
+            try:
+                cache = await self.genaiModel.aio.caches.create(
+                    model=self.MODEL_NAME,
+                    config=genai.types.CreateCachedContentConfig(
+                        system_instruction=self._system_content,
+                        ttl=f"{self.PROMPT_CACHE_TTL_SECONDS}s"
+                    )
                 )
-            )
+            except Exception as e:
+                # Caching has a minimum token size and is not available for every model
+                logger.warning(f"Could not create Gemini context cache, using inline prompt: {e}")
+                self.use_context_cache = False
+                return None
             
-            if response.text:
-                return response.text.strip()
-            else:
-                logger.warning("Empty response from Gemini API")
-                return text  # Return original if API fails
-                
+            self._prompt_cache = (cache.name, time.time() + self.PROMPT_CACHE_TTL_SECONDS)
+            logger.info(f"Gemini context cache created: {cache.name}")
+            return cache.name
+
+    def _needs_formatting(self, text: str) -> bool:
+        """Cheap pre-filter: False if a short chunk is plain prose the formatter would leave as is."""
+        if len(text) > self.PASSTHROUGH_MAX_CHARS:
+            return True
+        if self._NEEDS_FORMATTING_RE.search(text):
+            return True
+        return any(len(sentence) > self.PASSTHROUGH_MAX_SENTENCE_CHARS for sentence in self._SENT_RE.split(text))
+
+    @retry(
+        retry=retry_if_exception(_is_retryable),
+        stop=stop_after_attempt(5),
+        wait=_retry_wait,
+        before_sleep=before_sleep_log(logger, logging.WARNING),
+        reraise=True
+    )
+    async def _generate(self, text: str, cache_name: Optional[str]) -> str:
+        """Call Gemini for one chunk, retrying transient failures.
+        
+        The system prompt goes in as a system instruction, or through the context cache
+        when one exists, so every request shares an identical prefix.
+        """
+        started = time.monotonic()
+        if self._http_client is not None:
+            formatted = await self._http_client.generate(text, cached_content=cache_name)
+        else:
+            config = self._gen_config
+            if cache_name:
+                # Rebuilt only when the context cache is (re)created
+                if self._cached_gen_config is None or self._cached_gen_config[0] != cache_name:
+                    self._cached_gen_config = (cache_name, genai.types.GenerateContentConfig(
+                        cached_content=cache_name,
+                        temperature=self.TEMPERATURE,
+                        max_output_tokens=self.MAX_OUTPUT_TOKENS
+                    ))
+                config = self._cached_gen_config[1]
+            response = await self.genaiModel.aio.models.generate_content(
+                model=self.MODEL_NAME,
+                contents=text,
+                config=config
+            )
+            formatted = (response.text or "").strip()
+        
+        if not formatted:
+            raise FormattingError("Empty response from Gemini API")
+        self._latency_samples.append((len(text), time.monotonic() - started))
+        return formatted
+
+    async def close(self) -> None:
+        """Close the HTTP session used for chunk requests."""
+        if self._http_client is not None:
+            await self._http_client.close()
+
+    async def format_text_chunk(self, text: str) -> str:
+        """Format a single chunk of text using Gemini API, reusing cached responses.
+        
+        Raises:
+            FormattingError: If Gemini fails after retries, so unformatted text is never
+                passed off as formatted output
+        """
+        if not self._needs_formatting(text):
+            self.stats["skipped"] += 1
+            return text
+        
+        cached = self._read_cache(text)
+        if cached is not None:
+            return cached
+        
+        cache_name = await self._get_prompt_cache()
+        try:
+            formatted = await self._generate(text, cache_name)
+        except FormattingError:
+            raise
         except Exception as e:
-            logger.error(f"Error calling Gemini API: {e}")
-            return text  # Return original text if API fails
+            raise FormattingError(f"Error calling Gemini API: {e}") from e
+        
+        self._write_cache(text, formatted)
+        return formatted
 
-    def format_chapter(self, chapter_path: Path) -> str:
-        """Format a complete chapter file."""
-        logger.info(f"Processing chapter: {chapter_path.name}")
+    async def _format_chunk_bounded(self, text: str) -> str:
+        """Format a chunk while holding a slot of the request semaphore."""
+        async with self._request_semaphore:
+            return await self.format_text_chunk(text)
+
+    async def _format_chunk_shared(self, text: str) -> str:
+        """Format a chunk, joining an identical request already in flight instead of sending it twice.
+        
+        Finished requests are dropped from the in-flight table; later repeats are
+        served by the on-disk response cache.
+        """
+        key = hashlib.sha1(text.encode('utf-8')).hexdigest()
+        task = self._inflight_chunks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._format_chunk_bounded(text))
+            self._inflight_chunks[key] = task
+            task.add_done_callback(lambda _: self._inflight_chunks.pop(key, None))
+        else:
+            self.stats["deduplicated"] += 1
+        
+        # Shielded so one cancelled caller does not cancel the request for the others
+        return await asyncio.shield(task)
+
+    async def _split_chapter(self, chapter_path: Path) -> List[str]:
+        """Read and split a chapter off the event loop, returning [] if it is empty or unreadable."""
+        if chapter_path.name not in self._chunk_sizes:
+            await self._calibrate_chars_per_token(chapter_path)
+            # Size this chapter's chunks from the latencies observed so far
+            self._update_chunk_tokens()
+        max_chars = self._chapter_max_chars(chapter_path)
         
+        # Split into manageable chunks while reading
         try:
-            with open(chapter_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            loop = asyncio.get_running_loop()
+            chunks = await loop.run_in_executor(self._split_executor, split_chapter_file, chapter_path, max_chars)
         except Exception as e:
             logger.error(f"Error reading file {chapter_path}: {e}")
-            return ""
+            return []
         
-        if not content.strip():
+        if not chunks:
             logger.warning(f"Empty chapter file: {chapter_path}")
+        return chunks
+
+    async def format_chapter(self, chapter_path: Path) -> str:
+        """Format a complete chapter file, sending its chunks to Gemini concurrently."""
+        logger.info(f"Processing chapter: {chapter_path.name}")
+        
+        chunks = await self._split_chapter(chapter_path)
+        if not chunks:
             return ""
         
-        # Split into manageable chunks
-        chunks = self.split_text_intelligently(content)
-        formatted_chunks = []
+        logger.info(f"Formatting {len(chunks)} chunks for {chapter_path.name}")
         
-        for i, chunk in enumerate(chunks, 1):
-            logger.info(f"Formatting chunk {i}/{len(chunks)} for {chapter_path.name}")
-            formatted_chunk = self.format_text_chunk(chunk)
-            formatted_chunks.append(formatted_chunk)
+        # gather keeps results in chunk order regardless of completion order
+        try:
+            formatted_chunks = await asyncio.gather(*(self._format_chunk_shared(chunk) for chunk in chunks))
+        except FormattingError as e:
+            logger.error(f"Failed to format {chapter_path.name}: {e}")
+            return ""
         
         # Join chunks with proper spacing
         formatted_content = "\n\n".join(formatted_chunks)
         logger.info(f"Successfully formatted {chapter_path.name}")
         return formatted_content
 
-    def process_book(self, book_path: Path) -> Optional[Path]:
-        """Process all chapters in a book directory."""
-        logger.info(f"Processing book: {book_path.name}")
+    async def _format_indexed_chunk(self, index: int, chunk: str) -> Tuple[int, str]:
+        """Format a chunk and return it with its position, for out-of-order completion."""
+        return index, await self._format_chunk_shared(chunk)
+
+    async def _process_chapter(self, chapter_file: Path, output_file: Path) -> bool:
+        """Format one chapter, streaming chunks to disk in order as they complete.
+        
+        Output goes to a .partial file that is renamed into place only once every
+        chunk succeeded, so a failed or interrupted chapter is retried on the next run.
+        
+        Returns:
+            True if the chapter was formatted and saved
+        """
+        logger.info(f"Processing chapter: {chapter_file.name}")
         
+        chunks = await self._split_chapter(chapter_file)
+        if not chunks:
+            logger.error(f"Failed to format chapter: {chapter_file}")
+            return False
+        
+        logger.info(f"Formatting {len(chunks)} chunks for {chapter_file.name}")
+        
+        partial_file = output_file.with_name(f"{output_file.name}.partial")
+        tasks = [asyncio.ensure_future(self._format_indexed_chunk(i, chunk)) for i, chunk in enumerate(chunks)]
+        # Chunks that finished ahead of the next one to write, by index
+        finished: Dict[int, str] = {}
+        next_write = 0
+        try:
+            with open(partial_file, 'w', encoding='utf-8') as f:
+                for next_done in asyncio.as_completed(tasks):
+                    index, formatted = await next_done
+                    finished[index] = formatted
+                    while next_write in finished:
+                        separator = "\n\n" if next_write else ""
+                        # Disk writes run off the event loop so they never hold up dispatching API calls
+                        await asyncio.to_thread(f.write, separator + finished.pop(next_write))
+                        next_write += 1
+            os.replace(partial_file, output_file)
+        except Exception as e:
+            for task in tasks:
+                task.cancel()
+            partial_file.unlink(missing_ok=True)
+            if isinstance(e, FormattingError):
+                logger.error(f"Failed to format chapter {chapter_file}: {e}")
+            else:
+                logger.error(f"Error saving formatted chapter {output_file}: {e}")
+            return False
+        
+        logger.info(f"Saved formatted chapter: {output_file}")
+        return True
+
+    def _collect_chapters(self, book_path: Path) -> Optional[Tuple[Path, List[Path], List[Tuple[Path, Path]]]]:
+        """Find a book's chapter files and the ones that still need formatting.
+        
+        Returns:
+            Tuple of (formatted_dir, all chapter files, pending (chapter, output) pairs),
+            or None if the book has no chapters to process
+        """
         chapters_dir = book_path / "chapters"
         if not chapters_dir.exists():
             logger.error(f"Chapters directory not found: {chapters_dir}")
@@ -235,9 +929,14 @@ Transform this text for optimal audiobook narration:"""
         # Create formatted chapters directory
         formatted_dir = book_path / "formattedChapters"
         formatted_dir.mkdir(exist_ok=True)
+        self._load_chunk_sizes(formatted_dir)
         
-        # Get all chapter files sorted by name
-        chapter_files = sorted(chapters_dir.glob("*.txt"))
+        # Get all chapter files sorted by name; one directory scan each instead of a stat per file
+        with os.scandir(chapters_dir) as entries:
+            chapter_files = [Path(entry.path) for entry in sorted(
+                (entry for entry in entries if entry.name.endswith('.txt') and entry.is_file()),
+                key=lambda entry: entry.name
+            )]
         
         if not chapter_files:
             logger.warning(f"No chapter files found in {chapters_dir}")
@@ -245,31 +944,239 @@ Transform this text for optimal audiobook narration:"""
         
         logger.info(f"Found {len(chapter_files)} chapters to process")
         
-        processed_count = 0
+        with os.scandir(formatted_dir) as entries:
+            formatted_names = {entry.name for entry in entries if entry.is_file()}
+        
+        pending = []
         for chapter_file in chapter_files:
             output_file = formatted_dir / chapter_file.name
             
             # Skip if already processed
-            if output_file.exists():
+            if chapter_file.name in formatted_names:
                 logger.info(f"Skipping existing file: {output_file.name}")
                 continue
             
-            formatted_content = self.format_chapter(chapter_file)
+            pending.append((chapter_file, output_file))
+        
+        return formatted_dir, chapter_files, pending
+
+    async def process_book(self, book_path: Path) -> Optional[Path]:
+        """Process all chapters in a book directory concurrently."""
+        logger.info(f"Processing book: {book_path.name}")
+        
+        collected = self._collect_chapters(book_path)
+        if collected is None:
+            return None
+        formatted_dir, chapter_files, pending = collected
+        
+        # Chapters run concurrently; the request semaphore bounds in-flight API calls across all of them.
+        # Splitting is CPU-bound, so chapters split in parallel processes and each starts
+        # dispatching API calls as soon as its own split is done.
+        # Chapters start (and are split) only as earlier ones finish, so all but the first
+        # max_concurrency of them are sized from observed latencies; each chapter has at least
+        # one chunk, so this many chapters can still fill every request slot
+        chapter_slots = asyncio.Semaphore(self.max_concurrency)
+        
+        async def process_chapter_bounded(chapter_file: Path, output_file: Path) -> bool:
+            async with chapter_slots:
+                return await self._process_chapter(chapter_file, output_file)
+        
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+            self._split_executor = executor
+            try:
+                results = await asyncio.gather(*(process_chapter_bounded(chapter_file, output_file) for chapter_file, output_file in pending))
+            finally:
+                self._split_executor = None
+                await self.close()
+        processed_count = sum(results)
+        
+        logger.info(f"Successfully processed {processed_count}/{len(chapter_files)} chapters")
+        self.log_cache_stats()
+        return formatted_dir if processed_count > 0 else None
+
+    def _build_batch_request(self, key: str, text: str) -> Dict:
+        """Build one line of a Gemini batch input file."""
+        return {
+            "key": key,
+            "request": {
+                "system_instruction": {"parts": [{"text": self.SYSTEM_PROMPT}]},
+                "contents": [{"role": "user", "parts": [{"text": text}]}],
+                "generation_config": {
+                    "temperature": self.TEMPERATURE,
+                    "max_output_tokens": self.MAX_OUTPUT_TOKENS
+                }
+            }
+        }
+
+    @staticmethod
+    def _extract_batch_text(result: Dict) -> str:
+        """Pull the generated text out of one batch output line, or '' if it failed."""
+        if "error" in result:
+            return ""
+        return extract_response_text(result.get("response"))
+
+    def process_book_batch(self, book_path: Path, poll_interval: int = 30) -> Optional[Path]:
+        """Process all chapters of a book as a single Gemini batch job.
+        
+        Batch jobs are billed at a reduced rate and have no interactive latency
+        requirement, which suits offline audiobook formatting. Every chunk of every
+        pending chapter is submitted at once, then results are reassembled per chapter.
+        
+        Args:
+            book_path: Path to the book directory containing a 'chapters' folder
+            poll_interval: Seconds to wait between job status checks
             
-            if formatted_content:
-                try:
-                    with open(output_file, 'w', encoding='utf-8') as f:
-                        f.write(formatted_content)
-                    processed_count += 1
-                    logger.info(f"Saved formatted chapter: {output_file}")
-                except Exception as e:
-                    logger.error(f"Error saving formatted chapter {output_file}: {e}")
-            else:
+        Returns:
+            Path to the formatted chapters directory, or None if nothing was formatted
+        """
+        logger.info(f"Processing book with batch API: {book_path.name}")
+        
+        collected = self._collect_chapters(book_path)
+        if collected is None:
+            return None
+        formatted_dir, chapter_files, pending = collected
+        
+        # Split every pending chapter up front; keys are "<chapter index>#<chunk index>"
+        chapter_chunks: Dict[int, List[str]] = {}
+        results: Dict[str, str] = {}
+        uncached_chunks: Dict[str, str] = {}
+        # Keys of repeated chunks mapped to the key of the first identical one that is actually sent
+        first_key_by_text: Dict[str, str] = {}
+        duplicate_keys: Dict[str, str] = {}
+        for chapter_index, (chapter_file, _) in enumerate(pending):
+            if chapter_file.name not in self._chunk_sizes:
+                self._calibrate_chars_per_token_sync(chapter_file)
+            try:
+                chunks = list(self._iter_chunks_streaming(chapter_file, self._chapter_max_chars(chapter_file)))
+            except Exception as e:
+                logger.error(f"Error reading file {chapter_file}: {e}")
+                continue
+            
+            if not chunks:
+                logger.warning(f"Empty chapter file: {chapter_file}")
+                continue
+            
+            chapter_chunks[chapter_index] = chunks
+            for chunk_index, chunk in enumerate(chunks):
+                key = f"{chapter_index}#{chunk_index}"
+                if not self._needs_formatting(chunk):
+                    self.stats["skipped"] += 1
+                    results[key] = chunk
+                    continue
+                
+                cached = self._read_cache(chunk)
+                if cached is not None:
+                    results[key] = cached
+                elif chunk in first_key_by_text:
+                    duplicate_keys[key] = first_key_by_text[chunk]
+                    self.stats["deduplicated"] += 1
+                else:
+                    first_key_by_text[chunk] = key
+                    uncached_chunks[key] = chunk
+        
+        if not chapter_chunks:
+            logger.info("No chapters need formatting")
+            return None
+        
+        if uncached_chunks:
+            if not self._run_batch_job(book_path, uncached_chunks, results, poll_interval):
+                return None
+        else:
+            logger.info("All chunks served from the formatter cache; skipping batch job")
+        
+        for key, first_key in duplicate_keys.items():
+            if first_key in results:
+                results[key] = results[first_key]
+        
+        processed_count = 0
+        for chapter_index, chunks in chapter_chunks.items():
+            chapter_file, output_file = pending[chapter_index]
+            formatted_chunks = [results.get(f"{chapter_index}#{chunk_index}") for chunk_index in range(len(chunks))]
+            # A chapter with any failed chunk is left unwritten so the next run retries it
+            if not all(formatted_chunks):
                 logger.error(f"Failed to format chapter: {chapter_file}")
+                continue
+            try:
+                with open(output_file, 'w', encoding='utf-8') as f:
+                    f.write("\n\n".join(formatted_chunks))
+                processed_count += 1
+                logger.info(f"Saved formatted chapter: {output_file}")
+            except Exception as e:
+                logger.error(f"Error saving formatted chapter {output_file}: {e}")
         
         logger.info(f"Successfully processed {processed_count}/{len(chapter_files)} chapters")
+        self.log_cache_stats()
         return formatted_dir if processed_count > 0 else None
 
+    def _run_batch_job(self, book_path: Path, chunks: Dict[str, str], results: Dict[str, str], poll_interval: int) -> bool:
+        """Format chunks as one batch job, storing outputs in results by key.
+        
+        Successful outputs are also written to the response cache.
+        
+        Args:
+            book_path: Book directory, used to name the job
+            chunks: Chunk text by request key
+            results: Formatted text by request key, filled in place
+            poll_interval: Seconds to wait between job status checks
+            
+        Returns:
+            True if the job succeeded, False otherwise
+        """
+        # Upload the requests as a JSONL file and submit the batch job
+        with tempfile.NamedTemporaryFile('w', suffix='.jsonl', encoding='utf-8', delete=False) as f:
+            for key, chunk in chunks.items():
+                f.write(json.dumps(self._build_batch_request(key, chunk)) + "\n")
+            requests_path = f.name
+        
+        try:
+            uploaded = self.genaiModel.files.upload(
+                file=requests_path,
+                config=genai.types.UploadFileConfig(display_name=f"{book_path.name}-requests", mime_type="jsonl")
+            )
+        finally:
+            os.unlink(requests_path)
+        
+        job = self.genaiModel.batches.create(
+            model=self.MODEL_NAME,
+            src=uploaded.name,
+            config={"display_name": f"format-{book_path.name}"}
+        )
+        logger.info(f"Submitted batch job {job.name} with {len(chunks)} requests")
+        
+        while job.state.name not in self.BATCH_DONE_STATES:
+            time.sleep(poll_interval)
+            job = self.genaiModel.batches.get(name=job.name)
+            logger.info(f"Batch job {job.name} state: {job.state.name}")
+        
+        if job.state.name != "JOB_STATE_SUCCEEDED":
+            logger.error(f"Batch job {job.name} ended in state {job.state.name}: {job.error}")
+            return False
+        
+        # Collect results by key; output order is not guaranteed to match input order
+        output = self.genaiModel.files.download(file=job.dest.file_name).decode('utf-8')
+        for line in output.splitlines():
+            if line.strip():
+                result = json.loads(line)
+                formatted = self._extract_batch_text(result)
+                results[result["key"]] = formatted
+                if formatted:
+                    self._write_cache(chunks[result["key"]], formatted)
+        
+        return True
+
+
+async def _format_and_close(formatter: AudioBookFormatter, chapter_path: Path) -> str:
+    """Format one chapter, then release the formatter's HTTP session inside the same event loop."""
+    try:
+        return await formatter.format_chapter(chapter_path)
+    finally:
+        await formatter.close()
+
+
+def split_chapter_file(chapter_path: Path, max_chars: int) -> List[str]:
+    """Split a chapter file into chunks; module-level so it can run in a worker process."""
+    return list(AudioBookFormatter._iter_chunks_streaming(chapter_path, max_chars))
+
 
 app = typer.Typer(help="Format book chapters for audiobook narration using Gemini AI - supports all genres: fiction, non-fiction, history, biography, classic literature, and more")
 
@@ -277,7 +1184,10 @@ app = typer.Typer(help="Format book chapters for audiobook narration using Gemin
 @app.command()
 def format_book(
     book_path: str = typer.Argument(..., help="Path to the book directory containing 'chapters' folder"),
-    api_key: Optional[str] = typer.Option(None, "--api-key", "-k", help="Gemini API key (or set GEMINI_API_KEY env var)")
+    api_key: Optional[str] = typer.Option(None, "--api-key", "-k", help="Gemini API key (or set GEMINI_API_KEY env var)"),
+    concurrency: int = typer.Option(8, "--concurrency", "-c", help="Maximum concurrent Gemini requests"),
+    context_cache: Optional[bool] = typer.Option(None, "--context-cache/--no-context-cache", help="Send the system prompt through a Gemini context cache (default: GEMINI_USE_CACHE)"),
+    batch: bool = typer.Option(False, "--batch", help="Submit all chunks as one Gemini batch job (cheaper, but not interactive)")
 ) -> None:
     """
     Format all chapters in a book directory for audiobook narration.
@@ -303,8 +1213,11 @@ def format_book(
         raise typer.Exit(1)
     
     try:
-        formatter = AudioBookFormatter(api_key=api_key)
-        result_dir = formatter.process_book(book_dir)
+        formatter = AudioBookFormatter(api_key=api_key, max_concurrency=concurrency, use_context_cache=context_cache)
+        if batch:
+            result_dir = formatter.process_book_batch(book_dir)
+        else:
+            result_dir = asyncio.run(formatter.process_book(book_dir))
         
         if result_dir:
             typer.echo(f"✅ Successfully formatted chapters!")
@@ -327,7 +1240,9 @@ def format_book(
 def format_single_chapter(
     chapter_path: str = typer.Argument(..., help="Path to a single chapter text file"),
     output_path: str = typer.Argument(..., help="Path for the formatted output file"),
-    api_key: Optional[str] = typer.Option(None, "--api-key", "-k", help="Gemini API key (or set GEMINI_API_KEY env var)")
+    api_key: Optional[str] = typer.Option(None, "--api-key", "-k", help="Gemini API key (or set GEMINI_API_KEY env var)"),
+    concurrency: int = typer.Option(8, "--concurrency", "-c", help="Maximum concurrent Gemini requests"),
+    context_cache: Optional[bool] = typer.Option(None, "--context-cache/--no-context-cache", help="Send the system prompt through a Gemini context cache (default: GEMINI_USE_CACHE)")
 ) -> None:
     """Format a single chapter file for audiobook narration."""
     chapter_file = Path(chapter_path)
@@ -338,8 +1253,9 @@ def format_single_chapter(
         raise typer.Exit(1)
     
     try:
-        formatter = AudioBookFormatter(api_key=api_key)
-        formatted_content = formatter.format_chapter(chapter_file)
+        formatter = AudioBookFormatter(api_key=api_key, max_concurrency=concurrency, use_context_cache=context_cache)
+        formatted_content = asyncio.run(_format_and_close(formatter, chapter_file))
+        formatter.log_cache_stats()
         
         if formatted_content:
             # Create output directory if needed
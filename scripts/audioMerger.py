@@ -1,9 +1,14 @@
 import logging
+import mmap
 import os
 import re
-from pathlib import Path
-from typing import List, Tuple, Optional
-import wave
+import queue
+import random
+import struct
+import threading
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple, Optional
 import shutil
 import subprocess
 import typer
@@ -15,6 +20,66 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Splits a filename into text and digit runs for natural sorting
+_NUM_RE = re.compile(r'(\d+)')
+
+# Canonical 44-byte PCM WAV header: RIFF descriptor, 16-byte fmt chunk, data chunk header
+_WAV_HEADER = struct.Struct('<4sI4s4sIHHIIHH4sI')
+
+# Largest data chunk a canonical 44-byte WAV header can describe (RIFF size is 36 + data size)
+MAX_WAV_DATA_SIZE = 0xFFFFFFFF - 36
+
+# Above this many files, only a sample of headers is checked before merging
+FAST_VALIDATE_THRESHOLD = 500
+FAST_VALIDATE_SAMPLES = 8
+
+# Log merge progress for every Nth file only
+PROGRESS_LOG_INTERVAL = 25
+
+# Header reads are latency bound, so overlap many of them
+VALIDATION_WORKERS = 32
+
+# Concurrent positional copies keep several reads in flight on the storage queue
+COPY_WORKERS = 8
+
+# Largest single write from a mapped source (some platforms reject writes over 2 GiB)
+MMAP_WRITE_SIZE = 8 * 1024 * 1024
+
+# Chunks buffered between the reader and writer threads of the pipelined copy
+PIPELINE_DEPTH = 4
+PIPELINE_CHUNK_SIZE = 1024 * 1024
+
+# Unlinks on network filesystems are round-trip bound
+CLEANUP_WORKERS = 16
+
+
+@lru_cache(maxsize=None)
+def toolPath(toolName: str) -> Optional[str]:
+    """
+    Resolve an executable on PATH, scanning PATH only once per tool and process.
+    
+    Args:
+        toolName: Name of the executable, e.g. "sox" or "ffmpeg"
+        
+    Returns:
+        Absolute path of the executable, or None if it was not found
+    """
+    return shutil.which(toolName)
+
+
+def isToolAvailable(toolName: str) -> bool:
+    """
+    Check whether an executable is on PATH.
+    
+    Args:
+        toolName: Name of the executable, e.g. "sox" or "ffmpeg"
+        
+    Returns:
+        True if the executable was found, False otherwise
+    """
+    return toolPath(toolName) is not None
+
+
 class AudioMerger:
     """Class for merging multiple WAV audio files into a single file."""
     
@@ -29,14 +94,134 @@ class AudioMerger:
         Returns:
             Naturally sorted list of filenames
         """
-        def extractNumbers(filename: str) -> List[int]:
-            return [int(text) if text.isdigit() else text.lower() 
-                    for text in re.split(r'(\d+)', filename)]
+        def extractNumbers(filename: str) -> Tuple:
+            return tuple(int(text) if text.isdigit() else text.lower()
+                         for text in _NUM_RE.split(filename))
             
         return sorted(fileList, key=extractNumbers)
     
+    def __init__(self):
+        # Parsed headers keyed by absolute path: (channels, sampleWidth, frameRate, dataOffset, dataSize)
+        self._headerCache: Dict[str, Tuple[int, int, int, int, int]] = {}
+        # Naturally sorted WAV paths keyed by absolute folder path
+        self._wavCache: Dict[str, List[str]] = {}
+    
+    def _listWavs(self, inputFolder: str) -> List[str]:
+        """
+        List the WAV files in a folder in natural order, scanning the folder only once.
+        
+        Args:
+            inputFolder: Path to the folder containing WAV files
+            
+        Returns:
+            Naturally sorted list of WAV file paths
+        """
+        key = os.path.abspath(inputFolder)
+        wavFiles = self._wavCache.get(key)
+        if wavFiles is None:
+            with os.scandir(inputFolder) as entries:
+                wavFiles = [entry.path for entry in entries
+                            if entry.name.endswith('.wav') and entry.is_file()]
+            wavFiles = self.naturalSort(wavFiles)
+            self._wavCache[key] = wavFiles
+        return wavFiles
+    
     @staticmethod
-    def getAudioInfo(filePath: str) -> Tuple[int, int, int]:
+    def _parseWavHeader(filePath: str) -> Tuple[int, int, int, int, int]:
+        """
+        Parse the format and data chunk location of a PCM WAV file.
+        
+        Canonical 44-byte headers are decoded with a single pread; other layouts
+        (extra chunks, extensible fmt) fall back to walking the RIFF chunk headers.
+        
+        Args:
+            filePath: Path to the WAV file
+            
+        Returns:
+            Tuple of (channels, sample_width, frame_rate, data_offset, data_size)
+        """
+        fd = os.open(filePath, os.O_RDONLY)
+        try:
+            fileSize = os.fstat(fd).st_size
+            header = os.pread(fd, _WAV_HEADER.size, 0)
+            if len(header) < 12 or header[:4] != b'RIFF' or header[8:12] != b'WAVE':
+                raise ValueError(f"Not a RIFF/WAVE file: {filePath}")
+            
+            if len(header) == _WAV_HEADER.size:
+                (_, _, _, fmtId, fmtSize, formatTag, channels, frameRate, _, _,
+                 bitsPerSample, dataId, dataSize) = _WAV_HEADER.unpack(header)
+                if fmtId == b'fmt ' and fmtSize == 16 and dataId == b'data':
+                    if formatTag != 1:
+                        raise ValueError(f"Unsupported WAV format {formatTag}: {filePath}")
+                    # Streaming writers may leave the size unset, so never read past the end of the file
+                    return channels, (bitsPerSample + 7) // 8, frameRate, 44, min(dataSize, fileSize - 44)
+            
+            formatInfo = None
+            offset = 12
+            while True:
+                chunkHeader = os.pread(fd, 8, offset)
+                if len(chunkHeader) < 8:
+                    raise ValueError(f"No data chunk found in {filePath}")
+                chunkId, chunkSize = struct.unpack('<4sI', chunkHeader)
+                offset += 8
+                
+                if chunkId == b'fmt ':
+                    formatTag, channels, frameRate, _, _, bitsPerSample = struct.unpack('<HHIIHH', os.pread(fd, 16, offset))
+                    # 0xFFFE is WAVE_FORMAT_EXTENSIBLE, which wraps PCM for >2 channels or >16 bits
+                    if formatTag not in (1, 0xFFFE):
+                        raise ValueError(f"Unsupported WAV format {formatTag}: {filePath}")
+                    formatInfo = (channels, (bitsPerSample + 7) // 8, frameRate)
+                elif chunkId == b'data':
+                    if formatInfo is None:
+                        raise ValueError(f"No fmt chunk before data in {filePath}")
+                    return (*formatInfo, offset, min(chunkSize, fileSize - offset))
+                
+                # Chunks are padded to an even number of bytes
+                offset += chunkSize + (chunkSize & 1)
+        finally:
+            os.close(fd)
+    
+    def _getWavHeader(self, filePath: str) -> Tuple[int, int, int, int, int]:
+        """
+        Return the parsed header of a WAV file, reading it only the first time it is requested.
+        
+        Args:
+            filePath: Path to the WAV file
+            
+        Returns:
+            Tuple of (channels, sample_width, frame_rate, data_offset, data_size)
+        """
+        key = os.path.abspath(filePath)
+        header = self._headerCache.get(key)
+        if header is None:
+            header = self._parseWavHeader(filePath)
+            self._headerCache[key] = header
+        return header
+    
+    def _prefetchHeaders(self, wavFiles: List[str]) -> None:
+        """
+        Parse the headers of all files not yet in the cache, overlapping their open/read latency.
+        
+        Files that fail to parse are left out of the cache, so the caller sees the
+        error when it asks for that file.
+        
+        Args:
+            wavFiles: List of WAV file paths
+        """
+        missing = [f for f in wavFiles if os.path.abspath(f) not in self._headerCache]
+        if len(missing) < 2:
+            return
+        
+        def parseQuietly(filePath: str) -> None:
+            try:
+                self._getWavHeader(filePath)
+            except Exception:
+                pass
+        
+        with ThreadPoolExecutor(max_workers=min(VALIDATION_WORKERS, len(missing))) as executor:
+            list(executor.map(parseQuietly, missing))
+    
+    def getAudioInfo(self, filePath: str) -> Tuple[int, int, int]:
         """
         Get audio file information (channels, sample width, frame rate).
         
@@ -46,15 +231,10 @@ class AudioMerger:
         Returns:
             Tuple of (channels, sample_width, frame_rate)
         """
-        with wave.open(filePath, 'rb') as wf:
-            channels = wf.getnchannels()
-            sampleWidth = wf.getsampwidth()
-            frameRate = wf.getframerate()
-            
+        channels, sampleWidth, frameRate, _, _ = self._getWavHeader(filePath)
         return channels, sampleWidth, frameRate
     
-    @staticmethod
-    def validateAudioFiles(filePaths: List[str]) -> bool:
+    def validateAudioFiles(self, filePaths: List[str]) -> bool:
         """
         Validate that all audio files have compatible parameters.
         
@@ -71,15 +251,25 @@ class AudioMerger:
         # Get parameters from first file
         firstFile = filePaths[0]
         try:
-            refChannels, refSampleWidth, refFrameRate = AudioMerger.getAudioInfo(firstFile)
+            refChannels, refSampleWidth, refFrameRate = self.getAudioInfo(firstFile)
         except Exception as e:
             logger.error(f"Error reading reference file {firstFile}: {e}")
             return False
             
-        # Check all files for compatibility
-        for filePath in filePaths[1:]:
-            try:
-                channels, sampleWidth, frameRate = AudioMerger.getAudioInfo(filePath)
+        # Read the remaining headers concurrently, then check them in order
+        with ThreadPoolExecutor(max_workers=min(VALIDATION_WORKERS, max(1, len(filePaths) - 1))) as executor:
+            futures = [executor.submit(self.getAudioInfo, filePath) for filePath in filePaths[1:]]
+            
+            # Check all files for compatibility
+            for filePath, future in zip(filePaths[1:], futures):
+                error = future.exception()
+                if error is not None:
+                    logger.error(f"Error reading file {filePath}: {error}")
+                    for pending in futures:
+                        pending.cancel()
+                    return False
+                
+                channels, sampleWidth, frameRate = future.result()
                 
                 if (channels != refChannels or 
                     sampleWidth != refSampleWidth or 
@@ -91,14 +281,323 @@ class AudioMerger:
                     logger.error(f"Got: channels={channels}, "
                                 f"sample_width={sampleWidth}, "
                                 f"frame_rate={frameRate}")
+                    for pending in futures:
+                        pending.cancel()
                     return False
-                    
-            except Exception as e:
-                logger.error(f"Error reading file {filePath}: {e}")
-                return False
                 
         return True
     
+    def validateAudioFilesFast(self, filePaths: List[str], samples: int = FAST_VALIDATE_SAMPLES) -> bool:
+        """
+        Validate the first, last and a random sample of the remaining audio files.
+        
+        Optimistic: files outside the sample are assumed to match.
+        
+        Args:
+            filePaths: List of audio file paths
+            samples: Number of files to sample between the first and last
+            
+        Returns:
+            True if all sampled files are compatible, False otherwise
+        """
+        if len(filePaths) <= samples + 2:
+            return self.validateAudioFiles(filePaths)
+        
+        middle = random.sample(filePaths[1:-1], samples)
+        return self.validateAudioFiles([filePaths[0], *middle, filePaths[-1]])
+    
+    @staticmethod
+    def _buildWavHeader(channels: int, sampleWidth: int, frameRate: int, dataSize: int) -> bytes:
+        """
+        Build a canonical 44-byte PCM WAV header.
+        
+        Args:
+            channels: Number of channels
+            sampleWidth: Bytes per sample
+            frameRate: Frames per second
+            dataSize: Size of the PCM data in bytes
+            
+        Returns:
+            Header bytes
+        """
+        blockAlign = channels * sampleWidth
+        return _WAV_HEADER.pack(
+            b'RIFF', 36 + dataSize, b'WAVE',
+            b'fmt ', 16, 1, channels, frameRate, frameRate * blockAlign, blockAlign, sampleWidth * 8,
+            b'data', dataSize
+        )
+    
+    @staticmethod
+    def _preallocate(fd: int, size: int) -> None:
+        """
+        Reserve disk space for a file up front so it is laid out in few, large extents.
+        
+        A no-op where posix_fallocate is unavailable or unsupported by the filesystem.
+        
+        Args:
+            fd: File descriptor of the output file
+            size: Final file size in bytes
+        """
+        if not hasattr(os, 'posix_fallocate'):
+            return
+        try:
+            os.posix_fallocate(fd, 0, size)
+        except OSError:
+            pass  # Not supported by every filesystem; the copy still works without it
+    
+    @staticmethod
+    def _logProgress(index: int, total: int, wavFile: str) -> None:
+        """
+        Log merge progress for the first, last and every PROGRESS_LOG_INTERVAL-th file.
+        
+        Args:
+            index: Zero-based index of the file being processed
+            total: Number of files being processed
+            wavFile: Path of the file being processed
+        """
+        if (index % PROGRESS_LOG_INTERVAL == 0 or index == total - 1) and logger.isEnabledFor(logging.INFO):
+            logger.info("Processing file %d/%d: %s", index + 1, total, os.path.basename(wavFile))
+    
+    @staticmethod
+    def _adviseSequential(fd: int, offset: int, count: int) -> None:
+        """
+        Tell the kernel a byte range will be read once, front to back, and soon.
+        
+        Widens readahead and starts populating the page cache; a no-op where
+        posix_fadvise is unavailable (macOS, Windows).
+        
+        Args:
+            fd: File descriptor to advise
+            offset: Start of the range
+            count: Length of the range
+        """
+        if not hasattr(os, 'posix_fadvise'):
+            return
+        try:
+            os.posix_fadvise(fd, offset, count, os.POSIX_FADV_SEQUENTIAL)
+            os.posix_fadvise(fd, offset, count, os.POSIX_FADV_WILLNEED)
+        except OSError:
+            pass  # Advice only; some filesystems reject it
+    
+    @staticmethod
+    def _copyRange(inFd: int, outFd: int, offset: int, count: int) -> None:
+        """
+        Append count bytes starting at offset of inFd to outFd.
+        
+        Uses os.sendfile so the data never passes through userspace, and falls back to
+        writing straight from a read-only mapping of the source where sendfile cannot
+        target regular files (macOS).
+        
+        Args:
+            inFd: Source file descriptor
+            outFd: Destination file descriptor, written at its current position
+            offset: Byte offset in the source
+            count: Number of bytes to copy
+        """
+        AudioMerger._adviseSequential(inFd, offset, count)
+        
+        remaining = count
+        if hasattr(os, 'sendfile'):
+            try:
+                while remaining:
+                    sent = os.sendfile(outFd, inFd, offset, remaining)
+                    if sent == 0:
+                        break
+                    offset += sent
+                    remaining -= sent
+            except OSError:
+                pass  # Copy whatever is left below
+        
+        if remaining:
+            if os.fstat(inFd).st_size < offset + remaining:
+                raise IOError(f"Unexpected end of file after {count - remaining} of {count} bytes")
+            
+            # Write from the page cache mapping instead of allocating a bytes object per read
+            with mmap.mmap(inFd, 0, access=mmap.ACCESS_READ) as mapped:
+                with memoryview(mapped) as view:
+                    end = offset + remaining
+                    while offset < end:
+                        offset += os.write(outFd, view[offset:min(end, offset + MMAP_WRITE_SIZE)])
+    
+    @staticmethod
+    def _copyRangeAt(inFd: int, outFd: int, srcOffset: int, dstOffset: int, count: int) -> None:
+        """
+        Copy count bytes from srcOffset of inFd to dstOffset of outFd without touching either file position.
+        
+        Uses os.copy_file_range, which copies inside the kernel (and may share extents on
+        filesystems that support it), falling back to a pread/pwrite loop.
+        
+        Args:
+            inFd: Source file descriptor
+            outFd: Destination file descriptor
+            srcOffset: Byte offset in the source
+            dstOffset: Byte offset in the destination
+            count: Number of bytes to copy
+        """
+        AudioMerger._adviseSequential(inFd, srcOffset, count)
+        
+        remaining = count
+        try:
+            while remaining:
+                copied = os.copy_file_range(inFd, outFd, remaining, srcOffset, dstOffset)
+                if copied == 0:
+                    break
+                srcOffset += copied
+                dstOffset += copied
+                remaining -= copied
+        except OSError:
+            pass  # e.g. cross-device copies on older kernels; copy whatever is left below
+        
+        while remaining:
+            buffer = os.pread(inFd, min(remaining, 1024 * 1024), srcOffset)
+            if not buffer:
+                raise IOError(f"Unexpected end of file after {count - remaining} of {count} bytes")
+            os.pwrite(outFd, buffer, dstOffset)
+            srcOffset += len(buffer)
+            dstOffset += len(buffer)
+            remaining -= len(buffer)
+    
+    def _mergeFastConcat(self, wavFiles: List[str], outputPath: str) -> Optional[str]:
+        """
+        Merge compatible WAV files by copying their PCM data chunks byte for byte.
+        
+        The data ranges are located up front, so the output can be preallocated and
+        written with its final header before each range is sent into place. Where
+        os.copy_file_range exists, ranges are copied concurrently to their final offsets.
+        
+        Args:
+            wavFiles: List of WAV file paths to merge (already validated as compatible)
+            outputPath: Path to save the merged audio file
+            
+        Returns:
+            Path to the merged audio file if successful, None otherwise
+        """
+        try:
+            channels, sampleWidth, frameRate = self.getAudioInfo(wavFiles[0])
+            
+            # Plan the copy: (source, data offset, data size) per input
+            self._prefetchHeaders(wavFiles)
+            headers = [self._getWavHeader(wavFile) for wavFile in wavFiles]
+            
+            # The headers are parsed anyway, so catch mismatches a sampled validation missed
+            for wavFile, header in zip(wavFiles, headers):
+                if header[:3] != (channels, sampleWidth, frameRate):
+                    logger.error(f"File {wavFile} has incompatible audio parameters")
+                    return None
+            
+            plan = [(wavFile, dataOffset, chunkSize) for wavFile, (_, _, _, dataOffset, chunkSize) in zip(wavFiles, headers)]
+            dataSize = sum(size for _, _, size in plan)
+            if dataSize > MAX_WAV_DATA_SIZE:
+                logger.warning("Merged audio exceeds the 4 GiB WAV size limit")
+                return None
+            
+            outFd = os.open(outputPath, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                self._preallocate(outFd, _WAV_HEADER.size + dataSize)
+                
+                os.write(outFd, self._buildWavHeader(channels, sampleWidth, frameRate, dataSize))
+                
+                if hasattr(os, 'copy_file_range'):
+                    self._copyPlanConcurrently(plan, outFd)
+                else:
+                    # No in-kernel file-to-file copy here (macOS), so overlap reads and writes instead
+                    self._copyPlanPipelined(plan, outFd)
+            finally:
+                os.close(outFd)
+            
+            logger.info(f"Successfully merged {len(wavFiles)} audio files to: {outputPath}")
+            return outputPath
+            
+        except Exception as e:
+            logger.error(f"Error in fast concatenation: {e}")
+            return None
+    
+    def _copyPlanConcurrently(self, plan: List[Tuple[str, int, int]], outFd: int) -> None:
+        """
+        Copy each planned data range to its final offset in the output, several at a time.
+        
+        Args:
+            plan: List of (source path, data offset, data size) in output order
+            outFd: Output file descriptor; the 44-byte header is already written
+        """
+        dstOffsets = []
+        dstOffset = 44
+        for _, _, chunkSize in plan:
+            dstOffsets.append(dstOffset)
+            dstOffset += chunkSize
+        
+        def copyOne(index: int) -> None:
+            wavFile, dataOffset, chunkSize = plan[index]
+            self._logProgress(index, len(plan), wavFile)
+            inFd = os.open(wavFile, os.O_RDONLY)
+            try:
+                self._copyRangeAt(inFd, outFd, dataOffset, dstOffsets[index], chunkSize)
+            finally:
+                os.close(inFd)
+        
+        with ThreadPoolExecutor(max_workers=min(COPY_WORKERS, len(plan))) as executor:
+            # list() re-raises the first failed copy
+            list(executor.map(copyOne, range(len(plan))))
+    
+    def _copyPlanPipelined(self, plan: List[Tuple[str, int, int]], outFd: int) -> None:
+        """
+        Copy each planned data range to the output, reading the next chunk while the current one is written.
+        
+        A reader thread fills a bounded queue with chunks of all inputs in order;
+        the calling thread drains it into the output.
+        
+        Args:
+            plan: List of (source path, data offset, data size) in output order
+            outFd: Output file descriptor, positioned after the header
+        """
+        chunks: queue.Queue = queue.Queue(maxsize=PIPELINE_DEPTH)
+        stop = threading.Event()
+        
+        def put(item) -> None:
+            # Give up once the writer has stopped, so a failed write cannot leave the reader blocked
+            while not stop.is_set():
+                try:
+                    chunks.put(item, timeout=0.1)
+                    return
+                except queue.Full:
+                    continue
+        
+        def produce() -> None:
+            try:
+                for i, (wavFile, dataOffset, chunkSize) in enumerate(plan):
+                    self._logProgress(i, len(plan), wavFile)
+                    inFd = os.open(wavFile, os.O_RDONLY)
+                    try:
+                        self._adviseSequential(inFd, dataOffset, chunkSize)
+                        offset, remaining = dataOffset, chunkSize
+                        while remaining and not stop.is_set():
+                            buffer = os.pread(inFd, min(remaining, PIPELINE_CHUNK_SIZE), offset)
+                            if not buffer:
+                                raise IOError(f"Unexpected end of file in {wavFile}")
+                            put(buffer)
+                            offset += len(buffer)
+                            remaining -= len(buffer)
+                    finally:
+                        os.close(inFd)
+                put(None)
+            except Exception as e:
+                put(e)
+        
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            executor.submit(produce)
+            try:
+                while True:
+                    item = chunks.get()
+                    if item is None:
+                        break
+                    if isinstance(item, Exception):
+                        raise item
+                    view = memoryview(item)
+                    while view:
+                        view = view[os.write(outFd, view):]
+            finally:
+                stop.set()
+    
     def checkFfmpegAvailability(self) -> bool:
         """
         Check if FFmpeg is available on the system.
@@ -106,16 +605,7 @@ class AudioMerger:
         Returns:
             True if FFmpeg is available, False otherwise
         """
-        try:
-            subprocess.run(
-                ["ffmpeg", "-version"], 
-                stdout=subprocess.PIPE, 
-                stderr=subprocess.PIPE,
-                check=False
-            )
-            return True
-        except (subprocess.SubprocessError, FileNotFoundError):
-            return False
+        return isToolAvailable("ffmpeg")
     
     def checkSoxAvailability(self) -> bool:
         """
@@ -124,44 +614,39 @@ class AudioMerger:
         Returns:
             True if SoX is available, False otherwise
         """
-        try:
-            subprocess.run(
-                ["sox", "--version"], 
-                stdout=subprocess.PIPE, 
-                stderr=subprocess.PIPE,
-                check=False
-            )
-            return True
-        except (subprocess.SubprocessError, FileNotFoundError):
-            return False
+        return isToolAvailable("sox")
     
-    def mergeAudioFiles(self, inputFolder: str, outputPath: str) -> Optional[str]:
+    def mergeAudioFiles(self, inputFolder: str, outputPath: str, fastValidate: bool = False) -> Optional[str]:
         """
         Merge multiple WAV audio files into a single file.
         
         Args:
             inputFolder: Path to the folder containing WAV files
             outputPath: Path to save the merged audio file
+            fastValidate: Only validate a sample of the files (always used above FAST_VALIDATE_THRESHOLD files)
             
         Returns:
             Path to the merged audio file if successful, None otherwise
         """
         logger.info(f"Merging audio files from folder: {inputFolder}")
         
-        # Get all WAV files in the input folder
-        inputPath = Path(inputFolder)
-        wavFiles = [str(f) for f in inputPath.glob("*.wav")]
+        # Get all WAV files in the input folder, in natural order
+        wavFiles = self._listWavs(inputFolder)
         
         if not wavFiles:
             logger.error(f"No WAV files found in {inputFolder}")
             return None
             
-        # Sort files in natural order
-        wavFiles = self.naturalSort(wavFiles)
         logger.info(f"Found {len(wavFiles)} WAV files to merge")
         
         # Validate audio files
-        if not self.validateAudioFiles(wavFiles):
+        if fastValidate or len(wavFiles) > FAST_VALIDATE_THRESHOLD:
+            logger.warning(f"Using fast validation: checking only {FAST_VALIDATE_SAMPLES + 2} of {len(wavFiles)} files")
+            isValid = self.validateAudioFilesFast(wavFiles)
+        else:
+            isValid = self.validateAudioFiles(wavFiles)
+        
+        if not isValid:
             logger.error("Audio file validation failed. Aborting merge.")
             return None
             
@@ -170,58 +655,23 @@ class AudioMerger:
         if outputDir and not os.path.exists(outputDir):
             os.makedirs(outputDir)
         
-        # Check for available tools to handle large files
+        # Compatible PCM files concatenate bit-identically without decoding or external tools
+        mergedPath = self._mergeFastConcat(wavFiles, outputPath)
+        if mergedPath:
+            return mergedPath
+        
+        logger.info("Attempting alternative merge method...")
         hasSox = self.checkSoxAvailability()
         hasFfmpeg = self.checkFfmpegAvailability()
         
-        # For very large collections, use SoX or FFmpeg
-        if len(wavFiles) > 100:
-            if hasSox:
-                return self._mergeWithSox(wavFiles, outputPath)
-            elif hasFfmpeg:
-                return self._mergeWithFfmpeg(wavFiles, outputPath)
-            else:
-                logger.warning("Neither SoX nor FFmpeg available. Using fallback method.")
-                return self._mergeLargeWithoutExternalTools(wavFiles, outputPath)
-        
-        # For small collections, use standard approach
-        try:
-            # Get audio parameters from first file
-            channels, sampleWidth, frameRate = self.getAudioInfo(wavFiles[0])
-            
-            # Open output file
-            with wave.open(outputPath, 'wb') as outWave:
-                outWave.setnchannels(channels)
-                outWave.setsampwidth(sampleWidth)
-                outWave.setframerate(frameRate)
-                
-                # Process each input file
-                for i, wavFile in enumerate(wavFiles):
-                    logger.info(f"Processing file {i+1}/{len(wavFiles)}: {os.path.basename(wavFile)}")
-                    
-                    with wave.open(wavFile, 'rb') as inWave:
-                        # Read and write audio data in chunks to save memory
-                        chunkSize = 1024 * 1024  # 1MB chunks
-                        audioData = inWave.readframes(chunkSize)
-                        
-                        while audioData:
-                            outWave.writeframes(audioData)
-                            audioData = inWave.readframes(chunkSize)
-            
-            logger.info(f"Successfully merged {len(wavFiles)} audio files to: {outputPath}")
-            return outputPath
-            
-        except Exception as e:
-            logger.error(f"Error in standard merging method: {e}")
-            logger.info("Attempting alternative merge method...")
-            
-            # Try advanced methods if standard fails
-            if hasSox:
-                return self._mergeWithSox(wavFiles, outputPath)
-            elif hasFfmpeg:
-                return self._mergeWithFfmpeg(wavFiles, outputPath)
-            else:
-                return self._mergeLargeWithoutExternalTools(wavFiles, outputPath)
+        # Try external tools if the direct copy fails
+        if hasSox:
+            return self._mergeWithSox(wavFiles, outputPath)
+        elif hasFfmpeg:
+            return self._mergeWithFfmpeg(wavFiles, outputPath)
+        else:
+            logger.warning("Neither SoX nor FFmpeg available. Using fallback method.")
+            return self._mergeLargeWithoutExternalTools(wavFiles, outputPath)
     
     def _mergeWithSox(self, wavFiles: List[str], outputPath: str) -> Optional[str]:
         """
@@ -237,8 +687,8 @@ class AudioMerger:
         logger.info("Using SoX for merging audio files")
         
         try:
-            # Build the SoX command
-            soxCmd = ["sox"]
+            # Build the SoX command; the resolved path spares exec another PATH search
+            soxCmd = [toolPath("sox") or "sox"]
             
             # Add input files (SoX can handle lots of input files directly)
             for wavFile in wavFiles:
@@ -250,9 +700,11 @@ class AudioMerger:
             # Execute SoX command
             logger.info("Starting SoX concatenation process")
             
+            # Only stderr is read, and only on failure
             result = subprocess.run(
                 soxCmd,
-                stdout=subprocess.PIPE,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
                 stderr=subprocess.PIPE,
                 check=False
             )
@@ -302,14 +754,14 @@ class AudioMerger:
             
             result = subprocess.run(
                 [
-                    "ffmpeg",
+                    toolPath("ffmpeg") or "ffmpeg",
                     "-f", "concat",
                     "-safe", "0",
                     "-i", fileListPath,
                     "-c", "copy",
                     outputPath
                 ],
-                stdout=subprocess.PIPE,
+                stdout=subprocess.DEVNULL,
                 stderr=subprocess.PIPE,
                 check=False
             )
@@ -336,8 +788,10 @@ class AudioMerger:
     
     def _mergeLargeWithoutExternalTools(self, wavFiles: List[str], outputPath: str) -> Optional[str]:
         """
-        Merge large audio files without external tools by splitting into smaller chunks
-        and using a raw file format for the final merge.
+        Merge large audio files without external tools by streaming each data chunk
+        straight into the output and patching the header sizes at the end.
+        
+        Files that cannot be read are skipped.
         
         Args:
             wavFiles: List of WAV file paths to merge
@@ -352,100 +806,52 @@ class AudioMerger:
             # Get parameters from first file
             firstFile = wavFiles[0]
             channels, sampleWidth, frameRate = self.getAudioInfo(firstFile)
+            self._prefetchHeaders(wavFiles)
             
-            # Create a temp directory
-            tempDir = os.path.join(os.path.dirname(outputPath), "temp_merge")
-            os.makedirs(tempDir, exist_ok=True)
-            
-            # Create a raw PCM file to contain all audio data
-            rawOutputPath = os.path.join(tempDir, "merged.raw")
-            
-            # Create a manifest file for saving audio file information
-            manifestPath = os.path.join(tempDir, "manifest.txt")
-            with open(manifestPath, 'w') as manifest:
-                manifest.write(f"channels={channels}\n")
-                manifest.write(f"sample_width={sampleWidth}\n")
-                manifest.write(f"frame_rate={frameRate}\n")
-            
-            # Process all files directly to the raw output
-            with open(rawOutputPath, 'wb') as outRaw:
+            outFd = os.open(outputPath, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                # Reserve the expected size; files that fail below are trimmed off at the end
+                expectedSize = sum(self._headerCache[key][4] for key in map(os.path.abspath, wavFiles)
+                                   if key in self._headerCache)
+                self._preallocate(outFd, _WAV_HEADER.size + min(expectedSize, MAX_WAV_DATA_SIZE))
+                
+                # Placeholder header; the sizes are patched once all data is written
+                os.write(outFd, self._buildWavHeader(channels, sampleWidth, frameRate, 0))
+                
+                bytesWritten = 0
                 for i, wavFile in enumerate(wavFiles):
-                    logger.info(f"Processing file {i+1}/{len(wavFiles)}: {os.path.basename(wavFile)}")
+                    self._logProgress(i, len(wavFiles), wavFile)
                     
                     try:
-                        with wave.open(wavFile, 'rb') as inWave:
-                            # Skip the WAV header and write raw PCM data
-                            chunkSize = 1024 * 1024  # 1MB chunks
-                            audioData = inWave.readframes(chunkSize)
-                            
-                            while audioData:
-                                outRaw.write(audioData)
-                                audioData = inWave.readframes(chunkSize)
+                        _, _, _, dataOffset, chunkSize = self._getWavHeader(wavFile)
                     except Exception as e:
                         logger.error(f"Error processing file {wavFile}: {e}")
                         # Continue with next file
-            
-            logger.info("All audio data merged to raw file, now creating final WAV file")
-            
-            # Create WAV header for output file (without using wave module's size limitations)
-            # Convert raw PCM to WAV using direct file manipulation
-            with open(manifestPath, 'r') as manifest:
-                manifestLines = manifest.readlines()
-                channels = int(manifestLines[0].split('=')[1])
-                sampleWidth = int(manifestLines[1].split('=')[1])
-                frameRate = int(manifestLines[2].split('=')[1])
-            
-            # Get size of raw data
-            rawSize = os.path.getsize(rawOutputPath)
-            
-            # Create WAV header manually
-            with open(outputPath, 'wb') as outFile:
-                # RIFF header
-                outFile.write(b'RIFF')
-                # Size of entire file minus 8 bytes for "RIFF" + size field
-                fileSize = rawSize + 36  # 36 = size of WAV header minus 8
-                outFile.write(fileSize.to_bytes(4, byteorder='little'))
-                outFile.write(b'WAVE')
-                
-                # Format chunk
-                outFile.write(b'fmt ')
-                outFile.write((16).to_bytes(4, byteorder='little'))  # Size of format chunk
-                outFile.write((1).to_bytes(2, byteorder='little'))   # PCM format
-                outFile.write(channels.to_bytes(2, byteorder='little'))  # Number of channels
-                outFile.write(frameRate.to_bytes(4, byteorder='little'))  # Sample rate
-                
-                # Bytes per second
-                byteRate = frameRate * channels * sampleWidth
-                outFile.write(byteRate.to_bytes(4, byteorder='little'))
-                
-                # Block align
-                blockAlign = channels * sampleWidth
-                outFile.write(blockAlign.to_bytes(2, byteorder='little'))
-                
-                # Bits per sample
-                bitsPerSample = sampleWidth * 8
-                outFile.write(bitsPerSample.to_bytes(2, byteorder='little'))
+                        continue
+                    
+                    if bytesWritten + chunkSize > MAX_WAV_DATA_SIZE:
+                        raise ValueError("Merged audio exceeds the 4 GiB WAV size limit")
+                    
+                    try:
+                        inFd = os.open(wavFile, os.O_RDONLY)
+                        try:
+                            self._copyRange(inFd, outFd, dataOffset, chunkSize)
+                        finally:
+                            os.close(inFd)
+                        bytesWritten += chunkSize
+                    except Exception as e:
+                        logger.error(f"Error processing file {wavFile}: {e}")
+                        # Rewind over any partial copy and continue with next file
+                        os.lseek(outFd, 44 + bytesWritten, os.SEEK_SET)
                 
-                # Data chunk
-                outFile.write(b'data')
-                outFile.write(rawSize.to_bytes(4, byteorder='little'))  # Size of data
+                # Drop partial copies and any unused preallocation
+                os.ftruncate(outFd, 44 + bytesWritten)
                 
-                # Now copy the raw PCM data
-                with open(rawOutputPath, 'rb') as inRaw:
-                    chunkSize = 1024 * 1024  # 1MB chunks
-                    while True:
-                        chunk = inRaw.read(chunkSize)
-                        if not chunk:
-                            break
-                        outFile.write(chunk)
-            
-            # Clean up temp files
-            try:
-                os.remove(rawOutputPath)
-                os.remove(manifestPath)
-                os.rmdir(tempDir)
-            except:
-                pass
+                # Patch the RIFF size (offset 4) and data size (offset 40)
+                os.pwrite(outFd, struct.pack('<I', 36 + bytesWritten), 4)
+                os.pwrite(outFd, struct.pack('<I', bytesWritten), 40)
+            finally:
+                os.close(outFd)
                 
             logger.info(f"Successfully merged {len(wavFiles)} audio files using specialized processing")
             return outputPath
@@ -479,24 +885,39 @@ class AudioMerger:
         # Get audio parameters from first file
         channels, sampleWidth, frameRate = self.getAudioInfo(wavFiles[0])
         
-        # Open output file
-        with wave.open(outputPath, 'wb') as outWave:
-            outWave.setnchannels(channels)
-            outWave.setsampwidth(sampleWidth)
-            outWave.setframerate(frameRate)
+        with open(outputPath, 'wb') as outFile:
+            # Placeholder header; the sizes are patched once all data is written
+            outFile.write(self._buildWavHeader(channels, sampleWidth, frameRate, 0))
             
             # Process each input file up to the safe limit
+            bytesWritten = 0
             for i, wavFile in enumerate(wavFiles[:safeCount]):
-                logger.info(f"Processing file {i+1}/{safeCount}: {os.path.basename(wavFile)}")
+                self._logProgress(i, safeCount, wavFile)
                 
-                with wave.open(wavFile, 'rb') as inWave:
-                    # Read and write audio data in chunks to save memory
-                    chunkSize = 1024 * 1024  # 1MB chunks
-                    audioData = inWave.readframes(chunkSize)
-                    
-                    while audioData:
-                        outWave.writeframes(audioData)
-                        audioData = inWave.readframes(chunkSize)
+                _, _, _, dataOffset, chunkSize = self._getWavHeader(wavFile)
+                if bytesWritten + chunkSize > MAX_WAV_DATA_SIZE:
+                    logger.warning(f"Stopping at file {i+1} to stay within the WAV size limit")
+                    safeCount = i
+                    break
+                
+                with open(wavFile, 'rb') as inFile:
+                    self._adviseSequential(inFile.fileno(), dataOffset, chunkSize)
+                    inFile.seek(dataOffset)
+                    # Copy exactly the data chunk; 8 MiB matches typical readahead windows
+                    remaining = chunkSize
+                    while remaining:
+                        buffer = inFile.read(min(remaining, 8 * 1024 * 1024))
+                        if not buffer:
+                            break
+                        outFile.write(buffer)
+                        remaining -= len(buffer)
+                bytesWritten += chunkSize - remaining
+            
+            # Patch the RIFF size (offset 4) and data size (offset 40)
+            outFile.seek(4)
+            outFile.write(struct.pack('<I', 36 + bytesWritten))
+            outFile.seek(40)
+            outFile.write(struct.pack('<I', bytesWritten))
         
         logger.warning(f"Created limited output file with {safeCount} of {len(wavFiles)} files")
         return outputPath
@@ -519,24 +940,54 @@ class AudioMerger:
         logger.info(f"Cleaning up source files in: {inputFolder}")
         logger.info(f"Preserving output file: {outputPath}")
         
-        # Get all WAV files in the input folder
-        inputPath = Path(inputFolder)
-        wavFiles = [f for f in inputPath.glob("*.wav")]
+        # Get all WAV files in the input folder; the listing is stale once they are deleted
+        wavFiles = self._listWavs(inputFolder)
+        self._wavCache.pop(inputPathAbs, None)
+        
+        # Every listed file sits directly in the input folder, so names alone identify the output
+        outputName = os.path.basename(outputPathAbs) if isSameFolder else None
         
-        deletedCount = 0
+        targetNames = []
         for wavFile in wavFiles:
-            wavFileAbs = os.path.abspath(str(wavFile))
+            name = os.path.basename(wavFile)
             
             # Skip the output file if in the same folder
-            if isSameFolder and wavFileAbs == outputPathAbs:
+            if name == outputName:
                 logger.info(f"Skipping output file: {wavFile}")
                 continue
-                
+            
+            targetNames.append(name)
+        
+        if not targetNames:
+            logger.info("Deleted 0 source WAV files")
+            return
+        
+        # Resolve the folder once and unlink relative to it where the platform allows
+        dirFd = None
+        if os.unlink in os.supports_dir_fd:
+            try:
+                dirFd = os.open(inputPathAbs, os.O_RDONLY | getattr(os, 'O_DIRECTORY', 0))
+            except OSError:
+                dirFd = None
+        
+        def deleteOne(name: str) -> bool:
             try:
-                os.remove(wavFileAbs)
-                deletedCount += 1
+                if dirFd is not None:
+                    os.unlink(name, dir_fd=dirFd)
+                else:
+                    os.remove(os.path.join(inputPathAbs, name))
+                return True
             except Exception as e:
-                logger.error(f"Error deleting file {wavFile}: {e}")
+                logger.error(f"Error deleting file {os.path.join(inputFolder, name)}: {e}")
+                return False
+        
+        try:
+            # Each unlink is a metadata round trip, so overlap them
+            with ThreadPoolExecutor(max_workers=min(CLEANUP_WORKERS, len(targetNames))) as executor:
+                deletedCount = sum(1 for deleted in executor.map(deleteOne, targetNames) if deleted)
+        finally:
+            if dirFd is not None:
+                os.close(dirFd)
         
         logger.info(f"Deleted {deletedCount} source WAV files")
 
@@ -550,7 +1001,8 @@ def merge_audio(
     outputPath: str = typer.Option("audioResult/merged.wav", "--output", "-o", help="Path to save the merged audio file"),
     noCleanup: bool = typer.Option(False, "--no-cleanup", help="Do not delete source files after merging"),
     useSox: bool = typer.Option(False, "--use-sox", help="Force using SoX for merging if available"),
-    useFFmpeg: bool = typer.Option(False, "--use-ffmpeg", help="Force using FFmpeg for merging if available")
+    useFFmpeg: bool = typer.Option(False, "--use-ffmpeg", help="Force using FFmpeg for merging if available"),
+    fastValidate: bool = typer.Option(False, "--fast-validate", help="Only check a sample of the files before merging")
 ) -> None:
     """
     Merge multiple WAV audio files into a single file.
@@ -567,12 +1019,10 @@ def merge_audio(
     
     # Check for tool availability based on arguments
     if useSox and merger.checkSoxAvailability():
-        wavFiles = [str(f) for f in Path(inputFolder).glob("*.wav")]
-        wavFiles = merger.naturalSort(wavFiles)
+        wavFiles = merger._listWavs(inputFolder)
         mergedPath = merger._mergeWithSox(wavFiles, outputPath)
     elif useFFmpeg and merger.checkFfmpegAvailability():
-        wavFiles = [str(f) for f in Path(inputFolder).glob("*.wav")]
-        wavFiles = merger.naturalSort(wavFiles)
+        wavFiles = merger._listWavs(inputFolder)
         mergedPath = merger._mergeWithFfmpeg(wavFiles, outputPath)
     else:
         # Use standard approach that will select the best method
@@ -581,7 +1031,7 @@ def merge_audio(
         if useFFmpeg and not merger.checkFfmpegAvailability():
             logger.warning("FFmpeg not found. Falling back to automatic method selection.")
             
-        mergedPath = merger.mergeAudioFiles(inputFolder, outputPath)
+        mergedPath = merger.mergeAudioFiles(inputFolder, outputPath, fastValidate)
     
     if mergedPath:
         # Clean up source files unless --no-cleanup is specified
@@ -1,14 +1,23 @@
+import asyncio
+import hashlib
+import io
+import itertools
 import logging
 import os
 import sys
+import threading
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
-from bs4 import BeautifulSoup, NavigableString
+from typing import Dict, Iterator, List, Literal, Optional, Tuple, Type
+from bs4 import BeautifulSoup, NavigableString, SoupStrainer
 import re
 import typer
 import json
 import time
 from google import genai
+from pydantic import BaseModel
 
 try:
     from dotenv import load_dotenv
@@ -24,10 +33,214 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# lxml's C parser is several times faster than the pure-Python html.parser on multi-MB books
+try:
+    import lxml  # noqa: F401
+    DEFAULT_HTML_PARSER = 'lxml'
+except ImportError:
+    DEFAULT_HTML_PARSER = 'html.parser'
+
+# Table of contents detection: a heading naming the TOC, or a table/list full of links
+_TOC_HEADING_RE = re.compile(r'contents?|table\s+of\s+contents?|toc', re.IGNORECASE)
+_TOC_HEADING_TAGS = frozenset(['h1', 'h2', 'h3'])
+_TOC_CANDIDATE_TAGS = frozenset(['h1', 'h2', 'h3', 'table', 'ul', 'ol'])
+
+# Ancestors _findChapterContainer considers as chapter containers
+_CONTAINER_TAGS = frozenset(['div', 'section', 'article', 'chapter'])
+
+# Ancestors _findChapterElement considers as chapter containers
+_CHAPTER_PARENT_TAGS = frozenset(['div', 'section', 'article'])
+
+# Tag groups for the sibling walks that collect chapter text
+_HEADING_TAGS = frozenset(['h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
+_CHAPTER_HEADING_TAGS = frozenset(['h1', 'h2', 'h3'])
+_PARAGRAPH_TAGS = frozenset(['p', 'div', 'blockquote', 'pre'])
+_CONTENT_TAGS = _PARAGRAPH_TAGS | _HEADING_TAGS
+
+# Chapter heading detection and text cleanup, compiled once instead of per chapter
+_CHAPTER_KEYWORDS_RE = re.compile(r'chapter|book|part|section', re.IGNORECASE)
+_CHAPTER_TITLE_WORDS_RE = re.compile(r'chapter|book|part', re.IGNORECASE)
+_CHAPTER_HEADING_RE = re.compile(r'\b(chapter|ch\.?)\s*[ivxlcdm0-9]+', re.IGNORECASE)
+_CHAPTER_CLASS_RE = re.compile(r'chapter|book', re.IGNORECASE)
+_CHAPTER_SECTION_CLASS_RE = re.compile(r'chapter|section', re.IGNORECASE)
+_MULTI_NEWLINE_RE = re.compile(r'\n\s*\n\s*\n')
+_MULTI_SPACE_RE = re.compile(r'[ \t]+')
+_WHITESPACE_RE = re.compile(r'\s+')
+_ILLUSTRATION_RE = re.compile(r'\[Illustration[^\]]*\]', re.IGNORECASE)
+_PAGE_MARK_RE = re.compile(r'\[Page \d+\]', re.IGNORECASE)
+_NAVIGATION_ARTIFACT_RE = re.compile(r'table of contents|next chapter|previous chapter|back to top', re.IGNORECASE)
+_MARKER_ONLY_RE = re.compile(r'^\[?(page|illustration|figure)\s*\d*\]?$', re.IGNORECASE)
+_GUTENBERG_BOILERPLATE_RE = re.compile(r'Project Gutenberg.*?END OF.*?PROJECT GUTENBERG', re.DOTALL | re.IGNORECASE)
+_SENTENCE_END_RE = re.compile(r'(?<=[.!?])\s+')
+_SENTENCE_PUNCT_RE = re.compile(r'([.!?])\s+')
+
+# Large reads keep the syscall count low on multi-MB books; chapters go out in one write
+READ_BUFFER_SIZE = 1 << 20
+WRITE_BUFFER_SIZE = 1 << 20
+# Chapter files are independent, and file writes release the GIL
+SAVE_WORKERS = 8
+
+# Per-book results that only depend on the file's content, keyed by (path, mtime, size), so
+# processing the same unchanged book again skips the TOC walk and the chapter link query
+BOOK_MEMO_SIZE = 32
+_bookMemos: "OrderedDict[Tuple[str, int, int], Dict]" = OrderedDict()
+_bookMemosLock = threading.Lock()
+
+# Books converted at the same time when several inputs are given
+MAX_CONCURRENT_BOOKS = 8
+
+
+def _iterSentences(text: str) -> Iterator[str]:
+    """
+    Yield the pieces _SENTENCE_END_RE.split(text) would return, one at a time.
+    
+    The boundary scan stays in the regex engine, but no list holding every sentence
+    of a long chapter is built up front.
+    """
+    start = 0
+    for boundary in _SENTENCE_END_RE.finditer(text):
+        yield text[start:boundary.start()]
+        start = boundary.end()
+    yield text[start:]
+
+
+@dataclass(slots=True)
+class Chapter:
+    """A chapter's plain text and the extraction pattern that produced it."""
+    title: str
+    content: str
+    pattern: str = 'unknown'
+    href: str = ''
+    containerInfo: Optional[Dict] = None
+
+
+class ChapterLink(BaseModel):
+    """A chapter entry found in the table of contents."""
+    title: str
+    href: str
+
+
+class ChapterList(BaseModel):
+    """Answer schema for chapter link extraction."""
+    found_chapters: bool
+    chapters: List[ChapterLink]
+    confidence: float
+
+
+class ChapterContainer(BaseModel):
+    """How to extract one chapter's content from the document."""
+    href: str
+    title: str
+    extraction_method: Literal["container_only", "container_plus_following", "following_only"]
+    container_selector: str
+    content_start: Literal["within_container", "after_container", "next_sibling"]
+    content_end_marker: str
+    stop_at_elements: List[str]
+    confidence: float
+
+
+class ContainerList(BaseModel):
+    """Answer schema for chapter container detection."""
+    found_containers: bool
+    pattern_analysis: str
+    containers: List[ChapterContainer]
+
+
 class HtmlBookProcessor:
     """Class for processing HTML books into plain text format for audiobook creation."""
     
-    def __init__(self, inputFile: str, outputDir: str, useLlm: bool = True, splitLongChapters: bool = True):
+    MODEL_NAME = "gemini-2.5-flash"
+    TEMPERATURE = 0.1
+    # Answers are short schema-bound JSON; truncated answers are retried with double the budget
+    MAX_OUTPUT_TOKENS = 2000
+    # Thinking tokens count against max_output_tokens and add decode latency; extraction does not need them
+    THINKING_BUDGET = 0
+    # Cached LLM answers older than this are ignored and refreshed
+    CACHE_TTL_SECONDS = 30 * 24 * 3600
+    # Share of chapters that must resolve through their TOC anchors to skip container detection
+    ANCHOR_RESOLUTION_THRESHOLD = 0.8
+    # Batch jobs finish within 24 hours; poll sparingly while waiting
+    BATCH_POLL_INTERVAL_SECONDS = 30
+    BATCH_DONE_STATES = {'JOB_STATE_SUCCEEDED', 'JOB_STATE_FAILED', 'JOB_STATE_CANCELLED', 'JOB_STATE_EXPIRED'}
+    
+    # Static instructions lead the container prompt so retries share a byte-identical prefix
+    # with the chapter context that follows, which Gemini's implicit caching can reuse
+    CONTAINER_DETECTION_INSTRUCTIONS = """
+Analyze the HTML structure for each chapter and determine the BEST METHOD to extract the complete chapter content.
+
+I need you to understand different chapter organization patterns:
+
+These are some examples:
+PATTERN 1 - Container wraps everything:
+<div class="chapter">
+  <h2>Chapter Title</h2>
+  <p>Chapter content here...</p>
+  <p>More content...</p>
+</div>
+
+PATTERN 2 - Header div + following content:
+<div class="chapter">
+  <h2>Chapter Title</h2>
+</div>
+<p>Chapter content starts here...</p>
+<p>More content...</p>
+
+PATTERN 3 - Header div + separator + content:
+<hr class="chap">
+<div class="chapter">
+  <h2>Chapter Title</h2>
+</div>
+<p>Content follows...</p>
+
+PATTERN 4 - ID-based sections:
+<div id="chapter-4">
+  <h2>IV</h2>
+  <p>Content here...</p>
+</div>
+
+Your task is to identify which pattern each chapter follows and provide extraction instructions.
+
+For each chapter, analyse:
+1. Does the chapter container include ALL content, or just the heading?
+2. If just the heading, where does the actual content start?
+3. What marks the END of this chapter's content?
+4. Look at the HTML context to see where the bulk of the chapter text is located
+
+
+Please respond with a JSON object:
+{
+    "found_containers": true/false,
+    "pattern_analysis": "Brief description of the pattern found",
+    "containers": [
+        {
+            "href": "BOOK_I",
+            "title": "Women, Cars, and Men",
+            "extraction_method": "container_only|container_plus_following|following_only",
+            "container_selector": "div.chapter",
+            "content_start": "after_container|within_container|next_sibling",
+            "content_end_marker": "next_chapter|hr.chap|div.chapter|end_of_document",
+            "stop_at_elements": ["hr.chap", "div.chapter"],
+            "confidence": 0.9
+        }
+    ]
+}
+
+EXTRACTION_METHOD options:
+- "container_only": All content is within the container
+- "container_plus_following": Container has title, content follows after
+- "following_only": Container is just structure, real content starts after
+
+CONTENT_START options:
+- "within_container": Content is inside the identified container
+- "after_container": Content starts after the container element
+- "next_sibling": Content is in the next sibling element
+
+Choose the method that will capture the complete chapter content from title to the start of the next chapter.
+Analyze the HTML structure carefully and pick a DIFFERENT approach if previous attempts failed.
+"""
+    
+    def __init__(self, inputFile: str, outputDir: str, useLlm: bool = True, splitLongChapters: bool = True,
+                 htmlParser: Optional[str] = None, cacheDir: Optional[Path] = None):
         """
         Initialize the HTML book processor.
         
@@ -36,11 +249,19 @@ class HtmlBookProcessor:
             outputDir: Directory to save the formatted chapter files
             useLlm: Whether to use LLM for chapter detection (now required)
             splitLongChapters: Whether to split very long chapters into parts
+            htmlParser: BeautifulSoup parser backend (defaults to lxml when installed, else html.parser)
+            cacheDir: Directory for cached Gemini responses (falls back to
+                CHUNKER_CACHE_DIR, then ~/.gutenberg/chunker_cache)
         """
         self.inputFile = inputFile
         self.outputDir = outputDir
         self.useLlm = useLlm
         self.splitLongChapters = splitLongChapters
+        self.htmlParser = htmlParser or DEFAULT_HTML_PARSER
+        self.cacheDir = Path(cacheDir or os.getenv('CHUNKER_CACHE_DIR') or Path.home() / ".gutenberg" / "chunker_cache")
+        self._soup: Optional[BeautifulSoup] = None
+        self._anchorIndex: Optional[Dict[str, object]] = None
+        self._extractionPlan: Optional[Tuple] = None
         
         # Initialize Google GenAI client - it automatically gets the API key from GEMINI_API_KEY environment variable
         try:
@@ -64,19 +285,14 @@ class HtmlBookProcessor:
         if not os.path.exists(self.outputDir):
             os.makedirs(self.outputDir)
         
-        # Read the HTML file
-        try:
-            with open(self.inputFile, 'r', encoding='utf-8') as f:
-                htmlContent = f.read()
-        except Exception as e:
-            logger.error(f"Error reading HTML file: {e}")
-            raise
-            
-        # Parse the HTML
-        soup = BeautifulSoup(htmlContent, 'html.parser')
+        soup = self._loadSoup()
         
         # Use LLM to detect table of contents and extract chapter links
-        chapters = self._detectChaptersWithLlm(soup)
+        try:
+            chapters = self._detectChaptersWithLlm(soup)
+        finally:
+            # Chapters hold plain strings from here on; free the tree before splitting and saving
+            self._releaseSoup()
         
         if not chapters:
             logger.error("No chapters found with LLM-based table of contents detection")
@@ -97,17 +313,80 @@ class HtmlBookProcessor:
             chapters = self._splitLongChapters(chapters)
             logger.info(f"After splitting long chapters: {len(chapters)} total chapters")
         
-        # Process each chapter
-        chapterPaths = []
-        
-        for i, chapter in enumerate(chapters, 1):
-            chapterPath = self._saveChapterToFile(chapter, i)
-            if chapterPath:
-                chapterPaths.append(chapterPath)
+        # Save the chapters concurrently; map keeps them in chapter order
+        with ThreadPoolExecutor(max_workers=min(SAVE_WORKERS, len(chapters))) as executor:
+            savedPaths = executor.map(self._saveChapterToFile, chapters, range(1, len(chapters) + 1))
+            chapterPaths = [chapterPath for chapterPath in savedPaths if chapterPath]
                 
         return chapterPaths
     
-    def _detectChaptersWithLlm(self, soup: BeautifulSoup, maxRetries: int = 2) -> List[Dict]:
+    async def processBookAsync(self) -> List[str]:
+        """
+        Async variant of processBook for running several books concurrently.
+        
+        The chapter link and, for chapters their anchors do not resolve, the first container
+        detection queries are awaited through the aio client and land in the on-disk cache; the remaining, CPU-bound pipeline then
+        runs in a worker thread and answers those steps from the cache.
+        
+        Returns:
+            List of paths to the generated chapter files
+        """
+        soup = await asyncio.to_thread(self._loadSoup)
+        
+        chapterLinks = self._bookMemo().get('chapterLinks')
+        if chapterLinks is None:
+            # DOM walks run in a worker thread so other books' coroutines keep running
+            prompt, contextPrefix = await asyncio.to_thread(self._buildChapterLinksPrompt, soup)
+            result = await self._queryGeminiWithPromptAsync(prompt, contextPrefix=contextPrefix, responseSchema=ChapterList)
+            chapterLinks = self._rememberChapterLinks(self._parseChapterLinks(result))
+        llmLinks = (await asyncio.to_thread(self._planChapterExtraction, soup, chapterLinks))[1] if chapterLinks else []
+        if llmLinks:
+            containerAnswers = self._bookMemo().setdefault('containerAnswers', {})
+            contextData = await asyncio.to_thread(self._gatherChapterContexts, soup, llmLinks)
+            prompt = self._createContainerDetectionPrompt(contextData) if contextData else None
+            if prompt and prompt not in containerAnswers:
+                result = await self._queryGeminiWithPromptAsync(prompt, responseSchema=ContainerList)
+                if result is not None:
+                    containerAnswers[prompt] = result
+        
+        return await asyncio.to_thread(self.processBook)
+    
+    def _loadSoup(self) -> BeautifulSoup:
+        """
+        Read and parse the input HTML once; batch cache warm-up and processBook share the result.
+        
+        Returns:
+            BeautifulSoup object of the HTML content
+        """
+        if self._soup is not None:
+            return self._soup
+        
+        # Hand the raw file to the parser instead of decoding it into an intermediate string first;
+        # everything used later lives in <body>, so skip the head's styles and metadata
+        try:
+            with open(self.inputFile, 'rb', buffering=READ_BUFFER_SIZE) as f:
+                self._soup = BeautifulSoup(f, self.htmlParser, parse_only=SoupStrainer('body'), from_encoding='utf-8')
+                if not self._soup.find('body'):
+                    # Fragments without a body element would otherwise parse to nothing
+                    f.seek(0)
+                    self._soup = BeautifulSoup(f, self.htmlParser, from_encoding='utf-8')
+        except OSError as e:
+            logger.error(f"Error reading HTML file: {e}")
+            raise
+        return self._soup
+    
+    def _releaseSoup(self) -> None:
+        """
+        Free the parsed document. Tag objects reference their parents, so without
+        decompose() the tree waits for the cyclic garbage collector.
+        """
+        self._anchorIndex = None
+        self._extractionPlan = None
+        if self._soup is not None:
+            self._soup.decompose()
+            self._soup = None
+    
+    def _detectChaptersWithLlm(self, soup: BeautifulSoup, maxRetries: int = 2) -> List[Chapter]:
         """
         Use Google Gemini to detect table of contents and extract chapter links directly.
         Includes retry logic if the detected pattern fails.
@@ -117,7 +396,7 @@ class HtmlBookProcessor:
             maxRetries: Maximum number of retries if pattern detection fails
             
         Returns:
-            List of chapter dictionaries with title, content, and pattern info
+            List of chapters with title, content, and pattern info
         """
         try:
             logger.info("Starting LLM-based table of contents detection...")
@@ -130,78 +409,227 @@ class HtmlBookProcessor:
             
             logger.info(f"Found {len(chapterLinks)} chapter links in table of contents")
             
-            # Step 2: Use LLM to find parent containers for all chapters with retry logic
-            failedPatterns = []  # Track patterns that didn't work
-            
-            for attempt in range(maxRetries + 1):
-                logger.info(f"Container detection attempt {attempt + 1}/{maxRetries + 1}")
-                
-                # Get chapter containers using LLM
-                chapterContainers = self._findAllChapterContainersWithLlm(soup, chapterLinks, failedPatterns)
-                if not chapterContainers:
-                    logger.error(f"No chapter containers found on attempt {attempt + 1}")
-                    if attempt == maxRetries:
-                        return []
-                    continue
-                
-                # Step 3: Extract content from each container and validate success
-                chapters = []
-                successfulExtractions = 0
-                extractionFailures = []
-                
-                for containerInfo in chapterContainers:
-                    chapter = self._extractContentFromChapterContainer(soup, containerInfo)
-                    if chapter:
-                        chapters.append(chapter)
-                        successfulExtractions += 1
-                    else:
-                        extractionFailures.append({
-                            'title': containerInfo.get('title', 'unknown'),
-                            'href': containerInfo.get('href', 'unknown'),
-                            'extraction_method': containerInfo.get('extraction_method', 'unknown'),
-                            'container_selector': containerInfo.get('container_selector', 'unknown'),
-                            'reason': 'extraction_failed'  # Could be expanded to include more specific reasons
-                        })
-                
-                # Calculate success rate
-                successRate = successfulExtractions / len(chapterContainers) if chapterContainers else 0
-                logger.info(f"Attempt {attempt + 1}: {successfulExtractions}/{len(chapterContainers)} chapters extracted successfully ({successRate:.1%} success rate)")
-                
-                # If we have good success rate (>= 70%), use this result
-                if successRate >= 0.7:
-                    logger.info(f"✅ Pattern detection successful! Using results from attempt {attempt + 1}")
-                    return chapters
-                
-                # If this is the last attempt, return what we have
-                if attempt == maxRetries:
-                    if chapters:
-                        logger.warning(f"⚠️ Final attempt had low success rate ({successRate:.1%}), but returning {len(chapters)} chapters")
-                        return chapters
-                    else:
-                        logger.error("❌ All attempts failed - no chapters extracted")
-                        return []
-                
-                # Prepare feedback for next attempt
-                logger.warning(f"❌ Attempt {attempt + 1} failed ({successRate:.1%} success rate). Preparing feedback for retry...")
-                
-                # Analyze the most common extraction method from this attempt
-                currentPattern = {
-                    'extraction_method': chapterContainers[0].get('extraction_method', 'unknown') if chapterContainers else 'unknown',
-                    'container_selector': chapterContainers[0].get('container_selector', 'unknown') if chapterContainers else 'unknown',
-                    'success_rate': successRate,
-                    'failure_examples': extractionFailures[:3],  # Limit to first 3 failures
-                    'attempt': attempt + 1
-                }
-                failedPatterns.append(currentPattern)
-                
-                logger.info(f"🔄 Will retry with feedback about failed pattern: {currentPattern['extraction_method']} + {currentPattern['container_selector']}")
-            
-            return []
+            # Step 2: Most books link straight to anchors inside a container of their own;
+            # those chapters are extracted without asking the LLM for a pattern
+            anchorChapters, llmLinks = self._planChapterExtraction(soup, chapterLinks)
+            if not llmLinks:
+                return anchorChapters
+            
+            # Step 3: Use LLM to find parent containers for the remaining chapters with retry logic
+            llmChapters = self._extractChaptersWithContainerLlm(soup, llmLinks, maxRetries)
+            if len(llmLinks) == len(chapterLinks):
+                return llmChapters
+            # Merge back in TOC order
+            llmChaptersByHref = {chapter.href: chapter for chapter in llmChapters}
+            mergedChapters = [chapter or llmChaptersByHref.get(link['href'])
+                              for link, chapter in zip(chapterLinks, anchorChapters)]
+            return [chapter for chapter in mergedChapters if chapter]
             
         except Exception as e:
             logger.error(f"LLM-based chapter detection failed: {e}")
             return []
     
+    def _extractChaptersWithContainerLlm(self, soup: BeautifulSoup, chapterLinks: List[Dict], maxRetries: int = 2) -> List[Chapter]:
+        """
+        Extract chapters with a container pattern detected by the LLM, retrying with
+        feedback about patterns that extracted too few chapters.
+        
+        Args:
+            soup: BeautifulSoup object of the HTML content
+            chapterLinks: List of chapter link information
+            maxRetries: Maximum number of retries if pattern detection fails
+            
+        Returns:
+            List of chapters with title, content, and pattern info
+        """
+        failedPatterns = []  # Track patterns that didn't work
+        
+        for attempt in range(maxRetries + 1):
+            logger.info(f"Container detection attempt {attempt + 1}/{maxRetries + 1}")
+            
+            # Get chapter containers using LLM
+            chapterContainers = self._findAllChapterContainersWithLlm(soup, chapterLinks, failedPatterns)
+            if not chapterContainers:
+                logger.error(f"No chapter containers found on attempt {attempt + 1}")
+                if attempt == maxRetries:
+                    return []
+                continue
+            
+            # Extract content from each container and validate success
+            chapters = []
+            successfulExtractions = 0
+            extractionFailures = []
+            
+            for containerInfo in chapterContainers:
+                chapter = self._extractContentFromChapterContainer(soup, containerInfo)
+                if chapter:
+                    chapters.append(chapter)
+                    successfulExtractions += 1
+                else:
+                    extractionFailures.append({
+                        'title': containerInfo.get('title', 'unknown'),
+                        'href': containerInfo.get('href', 'unknown'),
+                        'extraction_method': containerInfo.get('extraction_method', 'unknown'),
+                        'container_selector': containerInfo.get('container_selector', 'unknown'),
+                        'reason': 'extraction_failed'  # Could be expanded to include more specific reasons
+                    })
+            
+            # Calculate success rate
+            successRate = successfulExtractions / len(chapterContainers) if chapterContainers else 0
+            logger.info(f"Attempt {attempt + 1}: {successfulExtractions}/{len(chapterContainers)} chapters extracted successfully ({successRate:.1%} success rate)")
+            
+            # If we have good success rate (>= 70%), use this result
+            if successRate >= 0.7:
+                logger.info(f"✅ Pattern detection successful! Using results from attempt {attempt + 1}")
+                return chapters
+            
+            # If this is the last attempt, return what we have
+            if attempt == maxRetries:
+                if chapters:
+                    logger.warning(f"⚠️ Final attempt had low success rate ({successRate:.1%}), but returning {len(chapters)} chapters")
+                    return chapters
+                else:
+                    logger.error("❌ All attempts failed - no chapters extracted")
+                    return []
+            
+            # Prepare feedback for next attempt
+            logger.warning(f"❌ Attempt {attempt + 1} failed ({successRate:.1%} success rate). Preparing feedback for retry...")
+            
+            # Analyze the most common extraction method from this attempt
+            currentPattern = {
+                'extraction_method': chapterContainers[0].get('extraction_method', 'unknown') if chapterContainers else 'unknown',
+                'container_selector': chapterContainers[0].get('container_selector', 'unknown') if chapterContainers else 'unknown',
+                'success_rate': successRate,
+                'failure_examples': extractionFailures[:3],  # Limit to first 3 failures
+                'attempt': attempt + 1
+            }
+            failedPatterns.append(currentPattern)
+            
+            logger.info(f"🔄 Will retry with feedback about failed pattern: {currentPattern['extraction_method']} + {currentPattern['container_selector']}")
+        
+        return []
+    
+    def _planChapterExtraction(self, soup: BeautifulSoup, chapterLinks: List[Dict]) -> Tuple[List[Optional[Chapter]], List[Dict]]:
+        """
+        Decide which chapters come straight from their TOC anchors and which need LLM
+        container detection. Remembered per parse, so prefetching and processBook agree.
+        
+        Args:
+            soup: BeautifulSoup object of the HTML content
+            chapterLinks: List of chapter link information
+            
+        Returns:
+            Tuple of (chapter per link or None, links that need LLM container detection)
+        """
+        planKey = tuple(link['href'] for link in chapterLinks)
+        if self._extractionPlan is not None and self._extractionPlan[0] == planKey:
+            return self._extractionPlan[1]
+        
+        anchorChapters = self._extractChaptersByAnchor(soup, chapterLinks)
+        resolvedCount = sum(1 for chapter in anchorChapters if chapter)
+        if resolvedCount >= self.ANCHOR_RESOLUTION_THRESHOLD * len(chapterLinks):
+            logger.info(f"{resolvedCount}/{len(chapterLinks)} chapters resolved through their TOC anchors, skipping container detection for them")
+            llmLinks = [link for link, chapter in zip(chapterLinks, anchorChapters) if not chapter]
+            plan = (anchorChapters, llmLinks)
+        else:
+            logger.info(f"Only {resolvedCount}/{len(chapterLinks)} chapters resolved through their TOC anchors, using LLM container detection")
+            plan = ([None] * len(chapterLinks), chapterLinks)
+        
+        self._extractionPlan = (planKey, plan)
+        return plan
+    
+    def _extractChaptersByAnchor(self, soup: BeautifulSoup, chapterLinks: List[Dict]) -> List[Optional[Chapter]]:
+        """
+        Extract chapters whose TOC anchor resolves by id to a container holding only that chapter.
+        
+        Args:
+            soup: BeautifulSoup object of the HTML content
+            chapterLinks: List of chapter link information
+            
+        Returns:
+            One entry per chapter link; None where the anchor did not lead to such a container
+        """
+        anchorIndex = self._getAnchorIndex(soup)
+        targets = [anchorIndex.get(link['href']) for link in chapterLinks]
+        containers = [self._findChapterElement(soup, '', link['href']) if target is not None else None
+                      for link, target in zip(chapterLinks, targets)]
+        
+        # A container shared with or wrapping another chapter's anchor (<body>, a book-level div)
+        # does not bound its chapter
+        owners = {}
+        for i, container in enumerate(containers):
+            if container is not None:
+                owners.setdefault(id(container), []).append(i)
+        bounded = [container is not None and len(owners[id(container)]) == 1 for container in containers]
+        for i, target in enumerate(targets):
+            if target is None:
+                continue
+            for node in itertools.chain([target], target.parents):
+                for owner in owners.get(id(node), ()):
+                    if owner != i:
+                        bounded[owner] = False
+        
+        # A heading-only container whose text continues in the following elements (the
+        # container_plus_following pattern) would lose the chapter body
+        targetIds = {id(target) for target in targets if target is not None}
+        targetAncestorIds = {id(parent) for target in targets if target is not None for parent in target.parents}
+        for i, container in enumerate(containers):
+            if bounded[i] and self._hasContentBeforeNextAnchor(container, targetIds, targetAncestorIds):
+                bounded[i] = False
+        
+        chapters = []
+        for link, container, isBounded in zip(chapterLinks, containers, bounded):
+            content = self._extractTextFromContainer(container).strip() if isBounded else ""
+            # Anything shorter would be dropped by validation; let the LLM path try instead
+            if len(content) < 100:
+                chapters.append(None)
+                continue
+            chapters.append(Chapter(link['title'], content, 'anchor_container_only', link['href']))
+        return chapters
+    
+    def _hasContentBeforeNextAnchor(self, container, targetIds: set, targetAncestorIds: set) -> bool:
+        """
+        Whether a content element with text follows the container, in document order,
+        before the next chapter's anchor (or the end of the document).
+        
+        Args:
+            container: Chapter container found for an anchor
+            targetIds: ids of every chapter anchor element
+            targetAncestorIds: ids of every ancestor of a chapter anchor, which wrap the
+                next chapter rather than trailing this one
+        """
+        for node in itertools.chain([container], container.parents):
+            for sibling in node.next_siblings:
+                for element in itertools.chain([sibling], getattr(sibling, 'descendants', ())):
+                    if id(element) in targetIds:
+                        return False
+                    if (element.name in _CONTENT_TAGS and id(element) not in targetAncestorIds
+                            and self._textLongerThan(element, 0)):
+                        return True
+        return False
+    
+    def _isInside(self, element, container) -> bool:
+        """Whether element is a descendant of container, compared by identity rather than Tag equality."""
+        return any(parent is container for parent in element.parents)
+    
+    def _getAnchorIndex(self, soup: BeautifulSoup) -> Dict[str, object]:
+        """
+        Map every anchor target in the document to its first element, built in one walk
+        per parse so lookups do not each scan the tree like soup.find(id=...). Ids take
+        priority over legacy <a name="..."> anchors, matching the old lookup order.
+        """
+        if self._anchorIndex is None:
+            ids: Dict[str, object] = {}
+            names: Dict[str, object] = {}
+            for element in soup.find_all(True):
+                elementId = element.get('id')
+                if elementId:
+                    ids.setdefault(elementId, element)
+                if element.name == 'a' and element.get('name'):
+                    names.setdefault(element['name'], element)
+            self._anchorIndex = {**names, **ids}
+        return self._anchorIndex
+    
     def _extractAllChapterLinksWithLlm(self, soup: BeautifulSoup) -> List[Dict]:
         """
         Use LLM to directly extract all chapter names and their links from the HTML.
@@ -212,14 +640,63 @@ class HtmlBookProcessor:
         Returns:
             List of dictionaries with chapter link information
         """
+        memo = self._bookMemo()
+        if 'chapterLinks' in memo:
+            logger.info("Using chapter links remembered for this file")
+            return [dict(link) for link in memo['chapterLinks']]
+        
+        prompt, contextPrefix = self._buildChapterLinksPrompt(soup)
+        result = self._queryGeminiWithPrompt(prompt, contextPrefix=contextPrefix, responseSchema=ChapterList)
+        return self._rememberChapterLinks(self._parseChapterLinks(result))
+    
+    def _bookMemo(self) -> Dict:
+        """
+        Results remembered for the current contents of the input file.
+        
+        Returns:
+            Mutable dictionary shared by every processor of the same unchanged file
+        """
+        try:
+            stat = os.stat(self.inputFile)
+        except OSError:
+            return {}
+        key = (os.path.abspath(self.inputFile), stat.st_mtime_ns, stat.st_size)
+        with _bookMemosLock:
+            memo = _bookMemos.get(key)
+            if memo is None:
+                memo = _bookMemos[key] = {}
+                if len(_bookMemos) > BOOK_MEMO_SIZE:
+                    _bookMemos.popitem(last=False)
+            else:
+                _bookMemos.move_to_end(key)
+            return memo
+    
+    def _rememberChapterLinks(self, chapterLinks: List[Dict]) -> List[Dict]:
+        """Remember non-empty chapter links for this file and pass them through."""
+        if chapterLinks:
+            self._bookMemo()['chapterLinks'] = [dict(link) for link in chapterLinks]
+        return chapterLinks
+    
+    def _buildChapterLinksPrompt(self, soup: BeautifulSoup) -> Tuple[str, str]:
+        """
+        Build the chapter link extraction query.
+        
+        Args:
+            soup: BeautifulSoup object of the HTML content
+            
+        Returns:
+            Tuple of (instructions prompt, HTML sample context that precedes it)
+        """
         # Get a sample of the HTML that likely contains the table of contents
-        htmlSample = self._getTocHtmlSample(soup)
+        memo = self._bookMemo()
+        htmlSample = memo.get('tocSample')
+        if htmlSample is None:
+            htmlSample = memo['tocSample'] = self._getTocHtmlSample(soup)
         
-        prompt = f"""
-        Analyze this HTML sample from a book and find ALL chapter links in the table of contents.
+        contextPrefix = f"HTML Sample:\n{htmlSample}"
         
-        HTML Sample:
-        {htmlSample}
+        prompt = """
+        Analyze the HTML sample above from a book and find ALL chapter links in the table of contents.
 
         Look for HTML structures that contain chapter links with href attributes pointing to chapter anchors.
         Examples of patterns to look for:
@@ -233,35 +710,41 @@ class HtmlBookProcessor:
         2. "chapters": array of chapter objects, each with:
            - "title": the full chapter title text
            - "href": the href value (without the # symbol)
-           - "full_link": the complete <a> tag as a string
         3. "confidence": Your confidence level (0-1) in this detection
 
         For example:
-        {{
+        {
             "found_chapters": true,
             "chapters": [
-                {{
+                {
                     "title": "CHAPTER I. Out to Sea",
-                    "href": "chap01",
-                    "full_link": "<a href=\\"#chap01\\" class=\\"pginternal\\">CHAPTER I. Out to Sea</a>"
-                }},
-                {{
+                    "href": "chap01"
+                },
+                {
                     "title": "CHAPTER II. The Savage Home", 
-                    "href": "chap02",
-                    "full_link": "<a href=\\"#chap02\\" class=\\"pginternal\\">CHAPTER II. The Savage Home</a>"
-                }}
+                    "href": "chap02"
+                }
             ],
             "confidence": 0.9
-        }}
+        }
 
-        If no chapters are found, return {{"found_chapters": false, "confidence": 0}}.
+        If no chapters are found, return {"found_chapters": false, "confidence": 0}.
         
         Extract ALL chapters you can find in the table of contents.
         Only return the JSON object, no other text.
         """
+        return prompt, contextPrefix
+    
+    def _parseChapterLinks(self, result: Optional[Dict]) -> List[Dict]:
+        """
+        Turn the LLM's chapter link answer into deduplicated chapter links.
         
-        result = self._queryGeminiWithPrompt(prompt)
-        
+        Args:
+            result: Parsed ChapterList answer, or None if the query failed
+            
+        Returns:
+            List of dictionaries with chapter link information
+        """
         if not result or not result.get('found_chapters'):
             logger.error("LLM could not find any chapters in the table of contents")
             return []
@@ -271,24 +754,15 @@ class HtmlBookProcessor:
             logger.error("LLM found chapters but returned empty chapter list")
             return []
         
-        # Convert to our expected format
-        chapterLinks = []
-        seenHrefs = set()  # Track hrefs to avoid duplicates
-        
+        # Convert to our expected format; the dict keeps the first entry per href, in TOC order
+        linksByHref = {}
         for chapter in chapters:
-            if 'title' in chapter and 'href' in chapter:
-                href = chapter['href']
-                # Skip if we've already seen this href (avoid duplicates)
-                if href in seenHrefs:
-                    logger.debug(f"Skipping duplicate chapter with href: {href}")
-                    continue
-                    
-                seenHrefs.add(href)
-                chapterLinks.append({
+            if 'title' in chapter and 'href' in chapter and chapter['href'] not in linksByHref:
+                linksByHref[chapter['href']] = {
                     'title': chapter['title'],
-                    'href': href,
-                    'full_link': chapter.get('full_link', ''),
-                })
+                    'href': chapter['href'],
+                }
+        chapterLinks = list(linksByHref.values())
         
         logger.info(f"LLM extracted {len(chapterLinks)} chapter links (after deduplication)")
         return chapterLinks
@@ -304,31 +778,30 @@ class HtmlBookProcessor:
         Returns:
             HTML sample string focused on potential TOC areas
         """
-        # Look for common TOC indicators in order of preference
-        tocCandidates = []
-        
-        # Look for headings that might indicate TOC
-        tocHeadings = soup.find_all(['h1', 'h2', 'h3'], 
-                                   string=re.compile(r'contents?|table\s+of\s+contents?|toc', re.IGNORECASE))
-        
-        for heading in tocHeadings:
-            # Get content after the heading
-            parent = heading.find_parent(['div', 'section', 'body'])
-            if parent:
-                tocCandidates.append(parent)
-        
-        # Look for tables or lists with multiple links
-        tables = soup.find_all('table')
-        for table in tables:
-            links = table.find_all('a', href=True)
-            if len(links) > 3:  # Likely a TOC if it has many links
-                tocCandidates.append(table)
+        # Look for common TOC indicators in order of preference: headings that might
+        # indicate a TOC, then tables and lists with multiple links. One walk over the
+        # DOM collects all three instead of a find_all per kind.
+        headingCandidates = []
+        tableCandidates = []
+        listCandidates = []
+        
+        for element in soup.descendants:
+            name = element.name
+            if name not in _TOC_CANDIDATE_TAGS:
+                continue
+            if name in _TOC_HEADING_TAGS:
+                if element.string and _TOC_HEADING_RE.search(element.string):
+                    # Get content after the heading
+                    parent = element.find_parent(['div', 'section', 'body'])
+                    if parent:
+                        headingCandidates.append(parent)
+                        if len(headingCandidates) >= 3:
+                            # Only the first 3 candidates are sampled and headings rank first
+                            break
+            elif self._hasManyLinks(element):  # Likely a TOC if it has many links
+                (tableCandidates if name == 'table' else listCandidates).append(element)
         
-        lists = soup.find_all(['ul', 'ol'])
-        for lst in lists:
-            links = lst.find_all('a', href=True)
-            if len(links) > 3:
-                tocCandidates.append(lst)
+        tocCandidates = headingCandidates + tableCandidates + listCandidates
         
         # If no specific candidates found, use the beginning of the document
         if not tocCandidates:
@@ -350,6 +823,16 @@ class HtmlBookProcessor:
         
         return combinedHtml or str(soup)[:maxLength]
     
+    def _hasManyLinks(self, element, minimum: int = 4) -> bool:
+        """Whether element contains at least `minimum` links, stopping as soon as it does."""
+        count = 0
+        for descendant in element.descendants:
+            if getattr(descendant, 'name', None) == 'a' and descendant.has_attr('href'):
+                count += 1
+                if count >= minimum:
+                    return True
+        return False
+    
     def _extractContentUntilNextChapter(self, soup: BeautifulSoup, startElement) -> str:
         """
         Extract all content from the start element until the next chapter heading.
@@ -361,13 +844,13 @@ class HtmlBookProcessor:
         Returns:
             Extracted text content
         """
-        content = []
+        content = io.StringIO()
         
         # Start from the element after our target (or the target itself if it's a heading)
-        if startElement.name in ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']:
+        if startElement.name in _HEADING_TAGS:
             # Include the chapter title
             chapterTitle = startElement.get_text(strip=True)
-            content.append(chapterTitle)
+            self._appendParagraph(content, chapterTitle)
             current = startElement.next_sibling
         else:
             current = startElement
@@ -375,34 +858,36 @@ class HtmlBookProcessor:
         # Collect all content until we hit the next chapter heading or end of document
         while current:
             if hasattr(current, 'name') and current.name:
-                # If it's a heading that looks like a chapter, stop
-                if current.name in ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']:
+                if current.name in _HEADING_TAGS:
                     text = current.get_text(strip=True)
-                    # Check if this looks like a chapter heading
-                    if any(keyword in text.lower() for keyword in ['chapter', 'book', 'part', 'section']) or \
-                       re.search(r'\b(chapter|ch\.?)\s*[ivxlcdm0-9]+', text, re.IGNORECASE):
+                    # If it's a heading that looks like a chapter, stop
+                    if _CHAPTER_KEYWORDS_RE.search(text) or _CHAPTER_HEADING_RE.search(text):
                         # This is likely the next chapter, stop here
                         break
+                    # Include section headings within the chapter
+                    if text and not _CHAPTER_TITLE_WORDS_RE.search(text):
+                        self._appendParagraph(content, text)
                 
                 # Extract text from paragraphs and other content elements
-                if current.name in ['p', 'div', 'blockquote', 'pre']:
+                elif current.name in _PARAGRAPH_TAGS:
                     text = current.get_text(strip=True)
                     if text and len(text) > 10:  # Ignore very short text
-                        content.append(text)
-                elif current.name in ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']:
-                    # Include section headings within the chapter
-                    text = current.get_text(strip=True)
-                    if text and not any(keyword in text.lower() for keyword in ['chapter', 'book', 'part']):
-                        content.append(text)
+                        self._appendParagraph(content, text)
             elif isinstance(current, NavigableString):
                 # Include direct text content
                 text = str(current).strip()
                 if text and len(text) > 10:
-                    content.append(text)
+                    self._appendParagraph(content, text)
             
             current = current.next_sibling
         
-        return '\n\n'.join(content)
+        return content.getvalue()
+    
+    def _appendParagraph(self, content: io.StringIO, text: str) -> None:
+        """Append a paragraph to extracted content, separated from the previous one by a blank line."""
+        if content.tell():
+            content.write('\n\n')
+        content.write(text)
     
     def _findChapterContainer(self, targetElement) -> Optional[object]:
         """
@@ -414,29 +899,49 @@ class HtmlBookProcessor:
         Returns:
             The container element that holds the chapter content
         """
+        # Walk up once, remembering the nearest ancestor of each container type and the
+        # candidates for the content-size check
+        nearestByType = {}
+        contentCandidates = []
+        for parent in targetElement.parents:
+            name = parent.name
+            if name in _CONTAINER_TAGS:
+                nearestByType.setdefault(name, parent)
+                if name != 'chapter':
+                    contentCandidates.append(parent)
+        
         # Try to find a semantic container
         for containerType in ['div', 'section', 'article', 'chapter']:
-            container = targetElement.find_parent(containerType)
+            container = nearestByType.get(containerType)
             if container:
                 # Check if this container has class attributes that suggest it's a chapter
                 classNames = container.get('class', [])
-                if any('chapter' in str(cls).lower() or 'section' in str(cls).lower() 
-                       for cls in classNames):
+                if any(_CHAPTER_SECTION_CLASS_RE.search(str(cls)) for cls in classNames):
                     return container
         
         # If no semantic container found, look for a div that contains substantial content
-        parent = targetElement
-        while parent:
-            parent = parent.find_parent()
-            if parent and parent.name in ['div', 'section', 'article']:
-                # Check if this parent contains enough text to be a chapter
-                text = parent.get_text(strip=True)
-                if len(text) > 500:  # Minimum chapter length
-                    return parent
+        for parent in contentCandidates:
+            # Check if this parent contains enough text to be a chapter
+            if self._textLongerThan(parent, 500):  # Minimum chapter length
+                return parent
         
         # Fallback: return the immediate parent or the target element itself
         return targetElement.find_parent() or targetElement
     
+    def _textLongerThan(self, element, length: int) -> bool:
+        """
+        Whether len(element.get_text(strip=True)) > length, without building the text.
+        
+        Stops at the first strings that cross the threshold instead of concatenating a
+        whole, possibly book-sized, subtree.
+        """
+        total = 0
+        for text in element.stripped_strings:
+            total += len(text)
+            if total > length:
+                return True
+        return False
+    
     def _extractContentFromContainer(self, container, targetElement) -> str:
         """
         Extract text content from a chapter container.
@@ -448,7 +953,8 @@ class HtmlBookProcessor:
         Returns:
             Extracted text content
         """
-        content = []
+        content = io.StringIO()
+        paragraphCount = 0
         
         # Start collecting content from the target element or after it
         startCollecting = False
@@ -458,7 +964,8 @@ class HtmlBookProcessor:
             if not startCollecting:
                 if element == targetElement or targetElement in element.parents:
                     startCollecting = True
-                elif element.find(id=targetElement.get('id')) if targetElement.get('id') else False:
+                elif targetElement.get('id') and self._isInside(targetElement, element):
+                    # Element wraps the target; ids are unique, so no need to search its subtree for the id
                     startCollecting = True
                 else:
                     continue
@@ -466,26 +973,88 @@ class HtmlBookProcessor:
             # Extract text from the element
             text = element.get_text(strip=True)
             if text and len(text) > 10:  # Ignore very short text
-                content.append(text)
+                self._appendParagraph(content, text)
+                paragraphCount += 1
             
             # Stop if we hit the next chapter (heuristic)
-            if startCollecting and len(content) > 5:  # After collecting some content
-                if element.name in ['h1', 'h2', 'h3'] and any(
-                    keyword in text.lower() for keyword in ['chapter', 'book', 'part', 'section']
-                ):
+            if startCollecting and paragraphCount > 5:  # After collecting some content
+                if element.name in _CHAPTER_HEADING_TAGS and _CHAPTER_KEYWORDS_RE.search(text):
                     # This might be the next chapter, stop here
                     break
         
-        return '\n\n'.join(content)
+        return content.getvalue()
+    
+    def _cachePath(self, prompt: str, maxOutputTokens: int) -> Path:
+        """Content-addressed cache location for the parsed answer to a prompt."""
+        key = hashlib.blake2b(json.dumps({
+            "m": self.MODEL_NAME,
+            "t": self.TEMPERATURE,
+            "n": maxOutputTokens,
+            "p": prompt
+        }).encode('utf-8'), digest_size=16).hexdigest()
+        return self.cacheDir / key[:2] / f"{key}.json"
+    
+    def _readCache(self, prompt: str, maxOutputTokens: int) -> Optional[Dict]:
+        """Return the cached parsed answer for a prompt, or None on a miss or an expired entry."""
+        cachePath = self._cachePath(prompt, maxOutputTokens)
+        try:
+            if time.time() - cachePath.stat().st_mtime > self.CACHE_TTL_SECONDS:
+                return None
+            return json.loads(cachePath.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return None
+    
+    def _writeCache(self, prompt: str, maxOutputTokens: int, result: Dict) -> None:
+        """Store a parsed answer atomically so interrupted runs never leave partial entries."""
+        cachePath = self._cachePath(prompt, maxOutputTokens)
+        try:
+            cachePath.parent.mkdir(parents=True, exist_ok=True)
+            tmpPath = cachePath.with_suffix(f".{os.getpid()}.tmp")
+            tmpPath.write_text(json.dumps(result), encoding='utf-8')
+            os.replace(tmpPath, cachePath)
+        except OSError as e:
+            logger.warning(f"Could not write chunker cache entry {cachePath}: {e}")
+    
+    def _queryGeminiWithPrompt(self, prompt: str, maxOutputTokens: int = MAX_OUTPUT_TOKENS,
+                               contextPrefix: Optional[str] = None,
+                               responseSchema: Optional[Type[BaseModel]] = None) -> Optional[Dict]:
+        """
+        Query Gemini with a prompt, answering from the on-disk cache when the same
+        prompt was already answered.
+        
+        Args:
+            prompt: The prompt to send to Gemini
+            maxOutputTokens: Maximum output tokens for the response
+            contextPrefix: Large static context sent before the prompt, so queries sharing
+                it start with the same bytes and Gemini's implicit caching can reuse it
+            responseSchema: Pydantic model the JSON answer must follow
+            
+        Returns:
+            Parsed JSON response or None if failed
+        """
+        fullPrompt = f"{contextPrefix}\n\n{prompt}" if contextPrefix else prompt
+        cached = self._readCache(fullPrompt, maxOutputTokens)
+        if cached is not None:
+            logger.info("Using cached Gemini response")
+            return cached
+        
+        result = self._queryGemini(fullPrompt, maxOutputTokens, responseSchema=responseSchema)
+        
+        if result is not None:
+            self._writeCache(fullPrompt, maxOutputTokens, result)
+        return result
     
-    def _queryGeminiWithPrompt(self, prompt: str, maxOutputTokens: int = 8000) -> Optional[Dict]:
+    def _queryGemini(self, prompt: str, maxOutputTokens: int = MAX_OUTPUT_TOKENS,
+                     responseSchema: Optional[Type[BaseModel]] = None) -> Optional[Dict]:
         """
         Generic method to query Gemini with a custom prompt using the Google GenAI client.
-        Includes retry logic for empty or truncated responses.
+        The response is constrained to JSON matching responseSchema, so it is parsed by the
+        client; retries cover API errors and answers cut off by the token limit.
         
         Args:
             prompt: The prompt to send to Gemini
             maxOutputTokens: Maximum output tokens for the response
+            responseSchema: Pydantic model the JSON answer must follow
             
         Returns:
             Parsed JSON response or None if failed
@@ -499,76 +1068,105 @@ class HtmlBookProcessor:
                 
                 # Use the Google Generative AI client
                 response = self.genaiModel.models.generate_content(
-                    model="gemini-2.5-flash",
+                    model=self.MODEL_NAME,
                     contents=prompt,
-                    config=genai.types.GenerateContentConfig(
-                        temperature=0.1,
-                        max_output_tokens=currentTokens
-                    )
+                    config=self._generationConfig(currentTokens, responseSchema)
                 )
                 
-                # Extract text from response
-                if response and response.text:
-                    content = response.text.strip()
-                    logger.debug(f"Gemini response (length: {len(content)} characters): {content[:1000]}...")
-                    
-                    # Check if response appears empty or too short
-                    if len(content) < 50:
-                        logger.warning(f"Response too short on attempt {attempt + 1}: {len(content)} characters")
-                        if attempt < maxRetries - 1:
-                            currentTokens *= 2  # Double tokens for next attempt
-                            logger.info(f"Retrying with increased tokens: {currentTokens}")
-                            continue
-                        else:
-                            logger.error("All retry attempts failed - response too short")
-                            return None
-                    
-                    # Try to extract JSON from the response
-                    try:
-                        # Remove any markdown formatting
-                        if content.startswith('```json'):
-                            content = content[7:]
-                        if content.endswith('```'):
-                            content = content[:-3]
-                        content = content.strip()
-                        
-                        # Try to parse JSON
-                        result = json.loads(content)
-                        logger.debug(f"Successfully parsed JSON response on attempt {attempt + 1}")
-                        return result
-                        
-                    except json.JSONDecodeError as e:
-                        logger.warning(f"Failed to parse JSON on attempt {attempt + 1}: {e}")
-                        logger.debug(f"Raw response: {content}")
-                        
-                        # Check if response was truncated (common issue)
-                        if len(content) > 500 and not content.rstrip().endswith('}'):
-                            logger.warning("Response appears to be truncated - likely due to token limit")
-                            if attempt < maxRetries - 1:
-                                currentTokens *= 2  # Double tokens for next attempt
-                                logger.info(f"Retrying with increased tokens: {currentTokens}")
-                                continue
-                            else:
-                                logger.error("All retry attempts failed - response still truncated")
-                                return None
-                        
-                        # If it's the last attempt, return None
-                        if attempt == maxRetries - 1:
-                            logger.error("All retry attempts failed - JSON parsing failed")
-                            return None
-                        
-                        # Otherwise, retry with same settings
-                        logger.info(f"Retrying JSON parsing (attempt {attempt + 2}/{maxRetries})")
-                        continue
-                        
+                parsed = self._parsedAnswer(response)
+                if parsed is not None:
+                    logger.debug(f"Parsed structured Gemini response on attempt {attempt + 1}")
+                    return parsed
+                
+                # Schema-constrained output only fails to parse when it was cut off
+                logger.warning(f"Gemini response could not be parsed on attempt {attempt + 1} - likely truncated by the token limit")
+                if attempt < maxRetries - 1:
+                    currentTokens *= 2  # Double tokens for next attempt
+                    logger.info(f"Retrying with increased tokens: {currentTokens}")
+                    continue
+                logger.error("All retry attempts failed - response still incomplete")
+                return None
+                
+            except Exception as e:
+                logger.warning(f"Error querying Gemini API on attempt {attempt + 1}: {e}")
+                if attempt < maxRetries - 1:
+                    logger.info(f"Retrying due to API error (attempt {attempt + 2}/{maxRetries})")
+                    continue
                 else:
-                    logger.warning(f"No text content in Gemini response on attempt {attempt + 1}")
-                    if attempt < maxRetries - 1:
-                        logger.info(f"Retrying due to empty response (attempt {attempt + 2}/{maxRetries})")
-                        continue
-                    else:
-                        logger.error("All retry attempts failed - no response content")
-                        return None
+                    logger.error("All retry attempts failed - API error")
+                    return None
+        
+        return None
+    
+    async def _queryGeminiWithPromptAsync(self, prompt: str, maxOutputTokens: int = MAX_OUTPUT_TOKENS,
+                                           contextPrefix: Optional[str] = None,
+                                           responseSchema: Optional[Type[BaseModel]] = None) -> Optional[Dict]:
+        """
+        Async variant of _queryGeminiWithPrompt using the client's aio interface, so
+        several books can wait on Gemini at the same time.
+        
+        Args:
+            prompt: The prompt to send to Gemini
+            maxOutputTokens: Maximum output tokens for the response
+            contextPrefix: Large static context sent before the prompt, so queries sharing
+                it start with the same bytes and Gemini's implicit caching can reuse it
+            responseSchema: Pydantic model the JSON answer must follow
+            
+        Returns:
+            Parsed JSON response or None if failed
+        """
+        fullPrompt = f"{contextPrefix}\n\n{prompt}" if contextPrefix else prompt
+        cached = self._readCache(fullPrompt, maxOutputTokens)
+        if cached is not None:
+            logger.info("Using cached Gemini response")
+            return cached
+        
+        result = await self._queryGeminiAsync(fullPrompt, maxOutputTokens, responseSchema=responseSchema)
+        
+        if result is not None:
+            self._writeCache(fullPrompt, maxOutputTokens, result)
+        return result
+    
+    async def _queryGeminiAsync(self, prompt: str, maxOutputTokens: int = MAX_OUTPUT_TOKENS,
+                                responseSchema: Optional[Type[BaseModel]] = None) -> Optional[Dict]:
+        """
+        Async variant of _queryGemini with the same retry behaviour.
+        
+        Args:
+            prompt: The prompt to send to Gemini
+            maxOutputTokens: Maximum output tokens for the response
+            responseSchema: Pydantic model the JSON answer must follow
+            
+        Returns:
+            Parsed JSON response or None if failed
+        """
+        maxRetries = 3
+        currentTokens = maxOutputTokens
+        
+        for attempt in range(maxRetries):
+            try:
+                logger.debug(f"Sending prompt to Gemini (attempt {attempt + 1}/{maxRetries}, length: {len(prompt)} characters, max_tokens: {currentTokens})")
+                
+                # Use the Google Generative AI client
+                response = await self.genaiModel.aio.models.generate_content(
+                    model=self.MODEL_NAME,
+                    contents=prompt,
+                    config=self._generationConfig(currentTokens, responseSchema)
+                )
+                
+                parsed = self._parsedAnswer(response)
+                if parsed is not None:
+                    logger.debug(f"Parsed structured Gemini response on attempt {attempt + 1}")
+                    return parsed
+                
+                # Schema-constrained output only fails to parse when it was cut off
+                logger.warning(f"Gemini response could not be parsed on attempt {attempt + 1} - likely truncated by the token limit")
+                if attempt < maxRetries - 1:
+                    currentTokens *= 2  # Double tokens for next attempt
+                    logger.info(f"Retrying with increased tokens: {currentTokens}")
+                    continue
+                logger.error("All retry attempts failed - response still incomplete")
+                return None
                 
             except Exception as e:
                 logger.warning(f"Error querying Gemini API on attempt {attempt + 1}: {e}")
@@ -581,20 +1179,97 @@ class HtmlBookProcessor:
         
         return None
     
-    def _saveChapterToFile(self, chapter: Dict, index: int) -> Optional[str]:
+    def _generationConfig(self, maxOutputTokens: int, responseSchema: Optional[Type[BaseModel]] = None):
+        """Generation settings for a JSON answer, shared by the sync and async queries."""
+        return genai.types.GenerateContentConfig(
+            temperature=self.TEMPERATURE,
+            max_output_tokens=maxOutputTokens,
+            response_mime_type="application/json",
+            response_schema=responseSchema,
+            thinking_config=genai.types.ThinkingConfig(thinking_budget=self.THINKING_BUDGET)
+        )
+    
+    def _parsedAnswer(self, response) -> Optional[Dict]:
+        """Structured answer from a Gemini response, or None when it was cut off."""
+        parsed = response.parsed if response else None
+        if isinstance(parsed, BaseModel):
+            return parsed.model_dump()
+        if isinstance(parsed, dict):
+            return parsed
+        return None
+    
+    def _batchQuery(self, prompt: str, responseSchema: Type[BaseModel],
+                    maxOutputTokens: int = MAX_OUTPUT_TOKENS) -> Optional[Tuple[str, Dict]]:
+        """
+        Build an inline batch request for a prompt whose answer is not cached yet.
+        
+        Args:
+            prompt: Full prompt, including any context prefix, exactly as the live query sends it
+            responseSchema: Pydantic model the JSON answer must follow
+            maxOutputTokens: Maximum output tokens for the response
+            
+        Returns:
+            Tuple of (prompt, inline request), or None if the answer is already cached
+        """
+        if self._readCache(prompt, maxOutputTokens) is not None:
+            return None
+        return prompt, {
+            'contents': [{'role': 'user', 'parts': [{'text': prompt}]}],
+            'config': {
+                'temperature': self.TEMPERATURE,
+                'max_output_tokens': maxOutputTokens,
+                'response_mime_type': 'application/json',
+                'response_schema': responseSchema,
+                'thinking_config': {'thinking_budget': self.THINKING_BUDGET}
+            }
+        }
+    
+    def _linkBatchQuery(self) -> Optional[Tuple[str, Dict]]:
+        """Batch request for the chapter link step, or None if it is already cached."""
+        # Only the prompt is kept; the tree is parsed again when the book is processed, so a
+        # whole batch of books is not held in memory while the job runs
+        try:
+            prompt, contextPrefix = self._buildChapterLinksPrompt(self._loadSoup())
+        finally:
+            self._releaseSoup()
+        return self._batchQuery(f"{contextPrefix}\n\n{prompt}", ChapterList)
+    
+    def _containerBatchQuery(self) -> Optional[Tuple[str, Dict]]:
+        """
+        Batch request for the first container detection attempt, built from the cached
+        chapter link answer. Retries with failure feedback depend on extraction results
+        and always run live.
+        """
+        try:
+            soup = self._loadSoup()
+            prompt, contextPrefix = self._buildChapterLinksPrompt(soup)
+            chapterLinks = self._parseChapterLinks(self._readCache(f"{contextPrefix}\n\n{prompt}", self.MAX_OUTPUT_TOKENS))
+            if not chapterLinks:
+                return None
+            llmLinks = self._planChapterExtraction(soup, chapterLinks)[1]
+            if not llmLinks:
+                return None
+            contextData = self._gatherChapterContexts(soup, llmLinks)
+        finally:
+            self._releaseSoup()
+        if not contextData:
+            return None
+        return self._batchQuery(self._createContainerDetectionPrompt(contextData), ContainerList)
+    
+    def _saveChapterToFile(self, chapter: Chapter, index: int) -> Optional[str]:
         """
         Save a chapter to a plain text file.
         
         Args:
-            chapter: Dictionary containing chapter data
+            chapter: Chapter to save
             index: Chapter index for filename
             
         Returns:
             Path to the saved chapter file, or None if saving failed
         """
         try:
-            title = chapter['title']
-            content = chapter['content']
+            title = chapter.title
+            content = chapter.content
             
             # If no explicit title, use numbered format
             if not title or title == "Chapter":
@@ -610,7 +1285,7 @@ class HtmlBookProcessor:
             outFileName = f"{baseFileName}_chapter_{index:02d}.txt"
             outPath = os.path.join(self.outputDir, outFileName)
             
-            with open(outPath, 'w', encoding='utf-8') as f:
+            with open(outPath, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
                 f.write(formattedText)
                 
             logger.info(f"Saved chapter {index} to {outPath}")
@@ -635,21 +1310,21 @@ class HtmlBookProcessor:
         else:
             return f"Chapter {index}"
     
-    def _validateAndCleanChapters(self, chapters: List[Dict]) -> List[Dict]:
+    def _validateAndCleanChapters(self, chapters: List[Chapter]) -> List[Chapter]:
         """
         Validate and clean chapter content to ensure quality.
         
         Args:
-            chapters: List of raw chapter dictionaries
+            chapters: List of raw chapters
             
         Returns:
-            List of validated and cleaned chapter dictionaries
+            List of validated and cleaned chapters
         """
         validChapters = []
         
         for i, chapter in enumerate(chapters):
-            title = chapter.get('title', '').strip()
-            content = chapter.get('content', '').strip()
+            title = chapter.title.strip()
+            content = chapter.content.strip()
             
             # Skip chapters with insufficient content
             if len(content) < 100:  # Minimum 100 characters
@@ -661,76 +1336,70 @@ class HtmlBookProcessor:
                 title = self._generateChapterTitle(i + 1)
             
             # Clean up content - remove excessive whitespace
-            content = re.sub(r'\n\s*\n\s*\n', '\n\n', content)  # Collapse multiple newlines
-            content = re.sub(r'[ \t]+', ' ', content)  # Collapse multiple spaces
+            content = _MULTI_NEWLINE_RE.sub('\n\n', content)  # Collapse multiple newlines
+            content = _MULTI_SPACE_RE.sub(' ', content)  # Collapse multiple spaces
             
             # Remove common artifacts
-            content = re.sub(r'\[Illustration[^\]]*\]', '', content, flags=re.IGNORECASE)
-            content = re.sub(r'\[Page \d+\]', '', content, flags=re.IGNORECASE)
-            content = re.sub(r'Project Gutenberg.*?END OF.*?PROJECT GUTENBERG', '', content, flags=re.DOTALL | re.IGNORECASE)
+            content = _ILLUSTRATION_RE.sub('', content)
+            content = _PAGE_MARK_RE.sub('', content)
+            content = _GUTENBERG_BOILERPLATE_RE.sub('', content)
             
             # Ensure content still has substance after cleaning
             if len(content.strip()) < 100:
                 logger.debug(f"Skipping chapter {i+1} - insufficient content after cleaning")
                 continue
             
-            validChapters.append({
-                'title': title,
-                'content': content.strip(),
-                'pattern': chapter.get('pattern', 'unknown')
-            })
+            validChapters.append(Chapter(title, content.strip(), chapter.pattern))
         
         return validChapters
     
-    def _splitLongChapters(self, chapters: List[Dict], maxLength: int = 5000) -> List[Dict]:
+    def _splitLongChapters(self, chapters: List[Chapter], maxLength: int = 5000) -> List[Chapter]:
         """
         Split very long chapters into smaller chunks for better TTS processing.
         
         Args:
-            chapters: List of chapter dictionaries
+            chapters: List of chapters
             maxLength: Maximum length in characters for a single chunk
             
         Returns:
-            List of chapter dictionaries with long chapters split
+            List of chapters with long chapters split
         """
         processedChapters = []
         
         for chapter in chapters:
-            content = chapter['content']
-            title = chapter['title']
+            content = chapter.content
+            title = chapter.title
             
             if len(content) <= maxLength:
                 processedChapters.append(chapter)
                 continue
             
-            # Split long chapter into parts
-            sentences = re.split(r'(?<=[.!?])\s+', content)
-            currentChunk = ""
+            # Split long chapter into parts; sentences are collected in a list and joined once per
+            # chunk, since growing one string per sentence copies it over and over
+            sentences = _iterSentences(content)
+            currentParts = []
+            currentLength = 0  # Length of the chunk so far, including the space after each sentence
             chunkNumber = 1
             
             for sentence in sentences:
-                if len(currentChunk + sentence) <= maxLength:
-                    currentChunk += sentence + " "
+                if currentLength + len(sentence) <= maxLength:
+                    currentParts.append(sentence)
+                    currentLength += len(sentence) + 1
                 else:
                     # Save current chunk
-                    if currentChunk.strip():
-                        processedChapters.append({
-                            'title': f"{title} - Part {chunkNumber}",
-                            'content': currentChunk.strip(),
-                            'pattern': chapter['pattern']
-                        })
+                    chunkText = " ".join(currentParts).strip()
+                    if chunkText:
+                        processedChapters.append(Chapter(f"{title} - Part {chunkNumber}", chunkText, chapter.pattern))
                         chunkNumber += 1
                     
                     # Start new chunk
-                    currentChunk = sentence + " "
+                    currentParts = [sentence]
+                    currentLength = len(sentence) + 1
             
             # Add remaining content
-            if currentChunk.strip():
-                processedChapters.append({
-                    'title': f"{title} - Part {chunkNumber}",
-                    'content': currentChunk.strip(),
-                    'pattern': chapter['pattern']
-                })
+            chunkText = " ".join(currentParts).strip()
+            if chunkText:
+                processedChapters.append(Chapter(f"{title} - Part {chunkNumber}", chunkText, chapter.pattern))
         
         return processedChapters
 
@@ -753,34 +1422,7 @@ class HtmlBookProcessor:
             else:
                 logger.info("Finding parent containers for all chapters using LLM...")
             
-            # Select chapters 2-10 for context analysis (skip first chapter, limit to max 9 chapters for analysis)
-            analysisChapters = chapterLinks[1:10] if len(chapterLinks) > 1 else chapterLinks
-            logger.info(f"Using chapters 2-{min(10, len(chapterLinks))} for pattern analysis ({len(analysisChapters)} chapters)")
-            
-            # Gather HTML context around each selected chapter anchor
-            contextData = []
-            for linkInfo in analysisChapters:
-                href = linkInfo['href']
-                title = linkInfo['title']
-                
-                # Find the target element
-                targetElement = soup.find(id=href)
-                if not targetElement:
-                    targetElement = soup.find('a', name=href)
-                    if targetElement:
-                        targetElement = targetElement.find_parent(['h1', 'h2', 'h3', 'h4', 'h5', 'h6']) or targetElement.find_parent()
-                
-                if targetElement:
-                    # Get HTML context (before and after the target element)
-                    contextHtml = self._getChapterContextHtml(targetElement, maxLength=5000)  # Reduced from 8000 to save tokens for output
-                    contextData.append({
-                        'href': href,
-                        'title': title,
-                        'context_html': contextHtml,
-                        'target_tag': f'<{targetElement.name} id="{href}">' if targetElement.get('id') == href else f'<{targetElement.name}>'
-                    })
-                else:
-                    logger.warning(f"Could not find target element for chapter: {title} (href: {href})")
+            contextData = self._gatherChapterContexts(soup, chapterLinks)
             
             if not contextData:
                 logger.error("No context data found for chapters")
@@ -795,8 +1437,13 @@ class HtmlBookProcessor:
             for i, data in enumerate(contextData):
                 logger.debug(f"Analysis chapter {i+1}: {data['title']} - context length: {len(data['context_html'])}")
             
-            # Query LLM to find containers
-            result = self._queryGeminiWithPrompt(prompt)
+            # Query LLM to find containers, unless this file was already answered for the same prompt
+            containerAnswers = self._bookMemo().setdefault('containerAnswers', {})
+            result = containerAnswers.get(prompt)
+            if result is None:
+                result = self._queryGeminiWithPrompt(prompt, responseSchema=ContainerList)
+                if result is not None:
+                    containerAnswers[prompt] = result
             
             if not result or not result.get('found_containers'):
                 logger.error("LLM could not find chapter containers")
@@ -809,36 +1456,30 @@ class HtmlBookProcessor:
             # Create container info for all chapters using the most common values for each attribute
             allContainers = []
             if containers:
-                # Analyze each attribute separately to find the most common value
-                extractionMethods = [container.get('extraction_method', 'container_only') for container in containers]
-                containerSelectors = [container.get('container_selector', 'div.chapter') for container in containers]
-                contentStarts = [container.get('content_start', 'within_container') for container in containers]
-                contentEndMarkers = [container.get('content_end_marker', 'div.chapter') for container in containers]
-                stopAtElementsLists = [container.get('stop_at_elements', ['div.chapter']) for container in containers]
-                
-                # Function to find most common value
-                def getMostCommon(values, default):
-                    if not values:
-                        return default
-                    counts = {}
-                    for value in values:
-                        # Handle lists by converting to string for comparison
-                        key = str(value) if isinstance(value, list) else value
-                        counts[key] = counts.get(key, 0) + 1
-                    mostCommonKey = max(counts, key=counts.get)
-                    # For stop_at_elements, find the original list value
-                    if isinstance(values[0], list):
-                        for value in values:
-                            if str(value) == mostCommonKey:
-                                return value
-                    return mostCommonKey
+                # Tally every attribute in one pass over the containers
+                extractionMethods = Counter()
+                containerSelectors = Counter()
+                contentStarts = Counter()
+                contentEndMarkers = Counter()
+                stopAtElementsVotes = Counter()
+                stopAtElementsByKey = {}
+                for container in containers:
+                    extractionMethods[container.get('extraction_method', 'container_only')] += 1
+                    containerSelectors[container.get('container_selector', 'div.chapter')] += 1
+                    contentStarts[container.get('content_start', 'within_container')] += 1
+                    contentEndMarkers[container.get('content_end_marker', 'div.chapter')] += 1
+                    # Lists are unhashable: vote on their string form, remember the first original
+                    stopAtElements = container.get('stop_at_elements', ['div.chapter'])
+                    stopKey = str(stopAtElements)
+                    stopAtElementsVotes[stopKey] += 1
+                    stopAtElementsByKey.setdefault(stopKey, stopAtElements)
                 
-                # Find most common value for each attribute
-                mostCommonMethod = getMostCommon(extractionMethods, 'container_plus_following')
-                mostCommonSelector = getMostCommon(containerSelectors, 'div.chapter')
-                mostCommonContentStart = getMostCommon(contentStarts, 'within_container')
-                mostCommonEndMarker = getMostCommon(contentEndMarkers, 'div.chapter')
-                mostCommonStopElements = getMostCommon(stopAtElementsLists, ['div.chapter'])
+                # Find most common value for each attribute (ties go to the first seen)
+                mostCommonMethod = extractionMethods.most_common(1)[0][0]
+                mostCommonSelector = containerSelectors.most_common(1)[0][0]
+                mostCommonContentStart = contentStarts.most_common(1)[0][0]
+                mostCommonEndMarker = contentEndMarkers.most_common(1)[0][0]
+                mostCommonStopElements = stopAtElementsByKey[stopAtElementsVotes.most_common(1)[0][0]]
                 
                 # Calculate average confidence from analyzed chapters
                 confidenceValues = [container.get('confidence', 0.5) for container in containers]
@@ -846,11 +1487,11 @@ class HtmlBookProcessor:
                 
                 # Log analysis results
                 logger.info(f"📊 ATTRIBUTE ANALYSIS from {len(containers)} chapters:")
-                logger.info(f"   extraction_method: {mostCommonMethod} (from {extractionMethods})")
+                logger.info(f"   extraction_method: {mostCommonMethod} (from {dict(extractionMethods)})")
                 logger.info(f"   container_selector: {mostCommonSelector} (from {set(containerSelectors)})")
                 logger.info(f"   content_start: {mostCommonContentStart} (from {set(contentStarts)})")
                 logger.info(f"   content_end_marker: {mostCommonEndMarker} (from {set(contentEndMarkers)})")
-                logger.info(f"   stop_at_elements: {mostCommonStopElements} (from {set(str(x) for x in stopAtElementsLists)})")
+                logger.info(f"   stop_at_elements: {mostCommonStopElements} (from {set(stopAtElementsVotes)})")
                 logger.info(f"   average_confidence: {averageConfidence:.3f} (from {confidenceValues})")
                 
                 logger.info(f"Applying most common pattern to all {len(chapterLinks)} chapters")
@@ -875,6 +1516,54 @@ class HtmlBookProcessor:
             logger.error(f"Error finding chapter containers with LLM: {e}")
             return []
     
+    def _gatherChapterContexts(self, soup: BeautifulSoup, chapterLinks: List[Dict]) -> List[Dict]:
+        """
+        Collect the HTML surrounding a sample of chapter anchors for container detection.
+        
+        Args:
+            soup: BeautifulSoup object
+            chapterLinks: List of chapter link information
+            
+        Returns:
+            List of dictionaries with href, title, context_html and target_tag
+        """
+        # Select chapters 2-10 for context analysis (skip first chapter, limit to max 9 chapters for analysis)
+        analysisChapters = chapterLinks[1:10] if len(chapterLinks) > 1 else chapterLinks
+        
+        # Container prompts are rebuilt on every retry and run; the context behind them only depends on the file
+        memo = self._bookMemo()
+        analysisKey = tuple((linkInfo['href'], linkInfo['title']) for linkInfo in analysisChapters)
+        if memo.get('chapterContexts', (None,))[0] == analysisKey:
+            return memo['chapterContexts'][1]
+        logger.info(f"Using chapters 2-{min(10, len(chapterLinks))} for pattern analysis ({len(analysisChapters)} chapters)")
+        
+        # Gather HTML context around each selected chapter anchor
+        contextData = []
+        for linkInfo in analysisChapters:
+            href = linkInfo['href']
+            title = linkInfo['title']
+            
+            # Find the target element
+            targetElement = self._getAnchorIndex(soup).get(href)
+            if targetElement and targetElement.get('id') != href:
+                # Reached through <a name="...">: use its heading (or parent) for context
+                targetElement = targetElement.find_parent(['h1', 'h2', 'h3', 'h4', 'h5', 'h6']) or targetElement.find_parent()
+            
+            if targetElement:
+                # Get HTML context (before and after the target element)
+                contextHtml = self._getChapterContextHtml(targetElement, maxLength=5000)  # Reduced from 8000 to save tokens for output
+                contextData.append({
+                    'href': href,
+                    'title': title,
+                    'context_html': contextHtml,
+                    'target_tag': f'<{targetElement.name} id="{href}">' if targetElement.get('id') == href else f'<{targetElement.name}>'
+                })
+            else:
+                logger.warning(f"Could not find target element for chapter: {title} (href: {href})")
+        
+        memo['chapterContexts'] = (analysisKey, contextData)
+        return contextData
+    
     def _getChapterContextHtml(self, targetElement, maxLength: int = 5000) -> str:
         """
         Get HTML context around a target element (before and after).
@@ -896,9 +1585,14 @@ class HtmlBookProcessor:
         parent = targetElement.parent
         ancestorDepth = 0
         while parent and ancestorDepth < 3:  # Reduced from 5 to 3 to save tokens
+            # Every ancestor's markup contains this one's, so once one is too large the rest are too.
+            # Its text is a lower bound on its markup, which rules out book-sized ancestors unserialized.
+            if self._textLongerThan(parent, maxLength * 3):
+                break
             parentHtml = str(parent)
-            if len(parentHtml) < maxLength * 3:  # Include parent if not too large
-                contextParts.insert(0, f"<!-- PARENT LEVEL {ancestorDepth + 1} -->\n{parentHtml[:1000]}...")  # Reduced from 1500 to 1000
+            if len(parentHtml) >= maxLength * 3:  # Too large to include
+                break
+            contextParts.insert(0, f"<!-- PARENT LEVEL {ancestorDepth + 1} -->\n{parentHtml[:1000]}...")  # Reduced from 1500 to 1000
             parent = parent.parent
             ancestorDepth += 1
         
@@ -912,10 +1606,11 @@ class HtmlBookProcessor:
             if hasattr(current, 'name') and current.name:
                 siblingHtml = str(current)
                 # Stop if we hit another chapter heading
-                if current.name in ['h1', 'h2', 'h3'] and any(word in current.get_text().lower() 
-                                                            for word in ['book', 'chapter', 'part']):
-                    nextSiblings.append(f"<!-- NEXT CHAPTER DETECTED: {current.get_text()[:50]} -->")
-                    break
+                if current.name in _CHAPTER_HEADING_TAGS:
+                    headingText = current.get_text()
+                    if _CHAPTER_TITLE_WORDS_RE.search(headingText):
+                        nextSiblings.append(f"<!-- NEXT CHAPTER DETECTED: {headingText[:50]} -->")
+                        break
                 
                 if nextLength + len(siblingHtml) < maxLength:
                     nextSiblings.append(siblingHtml)
@@ -963,9 +1658,9 @@ HTML Context:
         # Create feedback section about failed patterns
         failedPatternsSection = ""
         if failedPatterns:
-            failedPatternsSection = "\n\n⚠️ IMPORTANT - AVOID THESE FAILED PATTERNS:\n"
+            failedPatternParts = ["\n\n⚠️ IMPORTANT - AVOID THESE FAILED PATTERNS:\n"]
             for i, pattern in enumerate(failedPatterns, 1):
-                failedPatternsSection += f"""
+                failedPatternParts.append(f"""
 FAILED PATTERN {i} (Attempt {pattern.get('attempt', 'unknown')}):
 - extraction_method: {pattern.get('extraction_method', 'unknown')}
 - container_selector: {pattern.get('container_selector', 'unknown')}
@@ -973,90 +1668,22 @@ FAILED PATTERN {i} (Attempt {pattern.get('attempt', 'unknown')}):
 - Failed Examples: {pattern.get('failure_examples', [])}
 
 This pattern DID NOT WORK - please try a different approach!
-"""
-            failedPatternsSection += "\nPlease analyze why these patterns failed and choose a DIFFERENT approach.\n"
+""")
+            failedPatternParts.append("\nPlease analyze why these patterns failed and choose a DIFFERENT approach.\n")
+            failedPatternsSection = ''.join(failedPatternParts)
         
-        prompt = f"""
-Analyze the HTML structure for each chapter and determine the BEST METHOD to extract the complete chapter content.
-{failedPatternsSection}
+        # Static instructions first, then the chapter context (identical across retries), then retry feedback
+        prompt = f"""{self.CONTAINER_DETECTION_INSTRUCTIONS}
+CHAPTER CONTEXTS:
 {combinedContext}
-
-I need you to understand different chapter organization patterns:
-
-These are some examples:
-PATTERN 1 - Container wraps everything:
-<div class="chapter">
-  <h2>Chapter Title</h2>
-  <p>Chapter content here...</p>
-  <p>More content...</p>
-</div>
-
-PATTERN 2 - Header div + following content:
-<div class="chapter">
-  <h2>Chapter Title</h2>
-</div>
-<p>Chapter content starts here...</p>
-<p>More content...</p>
-
-PATTERN 3 - Header div + separator + content:
-<hr class="chap">
-<div class="chapter">
-  <h2>Chapter Title</h2>
-</div>
-<p>Content follows...</p>
-
-PATTERN 4 - ID-based sections:
-<div id="chapter-4">
-  <h2>IV</h2>
-  <p>Content here...</p>
-</div>
-
-Your task is to identify which pattern each chapter follows and provide extraction instructions.
-
-For each chapter, analyse:
-1. Does the chapter container include ALL content, or just the heading?
-2. If just the heading, where does the actual content start?
-3. What marks the END of this chapter's content?
-4. Look at the HTML context to see where the bulk of the chapter text is located
-
-
-Please respond with a JSON object:
-{{
-    "found_containers": true/false,
-    "pattern_analysis": "Brief description of the pattern found",
-    "containers": [
-        {{
-            "href": "BOOK_I",
-            "title": "Women, Cars, and Men",
-            "extraction_method": "container_only|container_plus_following|following_only",
-            "container_selector": "div.chapter",
-            "content_start": "after_container|within_container|next_sibling",
-            "content_end_marker": "next_chapter|hr.chap|div.chapter|end_of_document",
-            "stop_at_elements": ["hr.chap", "div.chapter"],
-            "confidence": 0.9
-        }}
-    ]
-}}
-
-EXTRACTION_METHOD options:
-- "container_only": All content is within the container
-- "container_plus_following": Container has title, content follows after
-- "following_only": Container is just structure, real content starts after
-
-CONTENT_START options:
-- "within_container": Content is inside the identified container
-- "after_container": Content starts after the container element
-- "next_sibling": Content is in the next sibling element
-
+{failedPatternsSection}
 {"DO NOT use the failed patterns mentioned above!" if failedPatterns else ""}
-Choose the method that will capture the complete chapter content from title to the start of the next chapter.
-Analyze the HTML structure carefully and pick a DIFFERENT approach if previous attempts failed.
 Only return the JSON object, no other text.
 """
         
         return prompt
     
-    def _extractContentFromChapterContainer(self, soup: BeautifulSoup, containerInfo: Dict) -> Optional[Dict]:
+    def _extractContentFromChapterContainer(self, soup: BeautifulSoup, containerInfo: Dict) -> Optional[Chapter]:
         """
         Extract chapter content using flexible methods determined by LLM.
         
@@ -1065,7 +1692,7 @@ Only return the JSON object, no other text.
             containerInfo: Container information from LLM with extraction method
             
         Returns:
-            Dictionary with chapter title and content, or None if extraction fails
+            Chapter with title and content, or None if extraction fails
         """
         try:
             href = containerInfo['href']
@@ -1090,7 +1717,8 @@ Only return the JSON object, no other text.
             # Verify we have the right container by checking if it contains the target element or is the target element
             targetCheck = None
             try:
-                targetCheck = container.find(id=href) or container.find('a', attrs={'name': href})
+                targetElement = self._getAnchorIndex(soup).get(href)
+                targetCheck = targetElement is not None and self._isInside(targetElement, container)
             except Exception as e:
                 logger.debug(f"Error in target verification: {e}")
             
@@ -1129,13 +1757,7 @@ Only return the JSON object, no other text.
             
             if content and len(content.strip()) > 50:  # Minimum content threshold
                 logger.debug(f"Extracted {len(content)} characters for chapter: {title}")
-                return {
-                    'title': title,
-                    'content': content.strip(),
-                    'pattern': f'llm_flexible_{extractionMethod}',
-                    'href': href,
-                    'container_info': containerInfo
-                }
+                return Chapter(title, content.strip(), f'llm_flexible_{extractionMethod}', href, containerInfo)
             else:
                 logger.warning(f"Insufficient content for chapter: {title} (length: {len(content) if content else 0})")
                 return None
@@ -1157,7 +1779,7 @@ Only return the JSON object, no other text.
             Found element or None
         """
         # PRIORITY 1: Find the specific chapter element first by its href
-        targetElement = soup.find(id=href) or soup.find('a', name=href)
+        targetElement = self._getAnchorIndex(soup).get(href)
         
         if not targetElement:
             logger.warning(f"Could not find target element for href: {href}")
@@ -1169,35 +1791,41 @@ Only return the JSON object, no other text.
         # This handles cases like <div id="chapter-1"> where the div IS the chapter container
         if (targetElement.name == 'div' and 
             targetElement.get('id') == href and 
-            len(targetElement.get_text(strip=True)) > 500):
+            self._textLongerThan(targetElement, 500)):
             logger.debug(f"Target element {href} is itself a chapter container div")
             return targetElement
         
+        # Walk the ancestors once; the priorities below scan this short list instead of the DOM
+        containerParents = [parent for parent in targetElement.parents if parent.name in _CHAPTER_PARENT_TAGS]
+        # Whether each container parent has over 500 chars of text, measured at most once
+        substantial: Dict[int, bool] = {}
+        
+        def isSubstantial(index: int) -> bool:
+            if index not in substantial:
+                substantial[index] = self._textLongerThan(containerParents[index], 500)
+            return substantial[index]
+        
         # PRIORITY 2: Look through parents of the target element to find chapter containers FIRST
         # This ensures we always try to find a proper container before falling back
-        for parent in targetElement.parents:
+        for index, parent in enumerate(containerParents):
             # Look for semantic containers with meaningful classes (highest priority)
-            if parent.name in ['div', 'section', 'article']:
-                classes = parent.get('class', [])
-                if any(cls for cls in classes if 'chapter' in cls.lower() or 'book' in cls.lower()):
-                    logger.debug(f"Found container via parent with chapter/book class for {href}: {parent.get('class')}")
-                    return parent
-                
-                # Also check if parent has an ID that suggests it's a chapter container
-                parent_id = parent.get('id', '')
-                if ('chapter' in parent_id.lower() and 
-                    len(parent.get_text(strip=True)) > 500):
-                    logger.debug(f"Found container via parent with chapter ID for {href}: {parent_id}")
-                    return parent
+            classes = parent.get('class', [])
+            if any(_CHAPTER_CLASS_RE.search(cls) for cls in classes):
+                logger.debug(f"Found container via parent with chapter/book class for {href}: {parent.get('class')}")
+                return parent
+            
+            # Also check if parent has an ID that suggests it's a chapter container
+            parent_id = parent.get('id', '')
+            if 'chapter' in parent_id.lower() and isSubstantial(index):
+                logger.debug(f"Found container via parent with chapter ID for {href}: {parent_id}")
+                return parent
         
         # PRIORITY 3: Look for containers with significant content
-        for parent in targetElement.parents:
-            if parent.name in ['div', 'section', 'article']:
-                # Check if this parent has substantial content (likely a chapter container)
-                text_content = parent.get_text(strip=True)
-                if len(text_content) > 500:  # Has substantial content
-                    logger.debug(f"Found substantial container for {href}: {parent.name} with {len(text_content)} chars")
-                    return parent
+        for index, parent in enumerate(containerParents):
+            # Check if this parent has substantial content (likely a chapter container)
+            if isSubstantial(index):  # Has substantial content
+                logger.debug(f"Found substantial container for {href}: {parent.name} with over 500 chars")
+                return parent
         
         # PRIORITY 4: Try CSS selector as backup (moved lower in priority)
         if containerSelector:
@@ -1206,20 +1834,18 @@ Only return the JSON object, no other text.
                 containers = soup.select(containerSelector)
                 for container in containers:
                     # Check if this container contains our specific target element
-                    if container.find(id=href) or container.find('a', name=href):
+                    if self._isInside(targetElement, container):
                         logger.debug(f"Found specific container for {href} using selector: {containerSelector}")
                         return container
             except Exception as e:
                 logger.debug(f"CSS selector failed: {e}")
         
         # PRIORITY 5: Look for any reasonable parent container as last resort
-        for parent in targetElement.parents:
-            if parent.name in ['div', 'section', 'article']:
-                # Even if it doesn't have chapter class, if it has some content, use it
-                text_content = parent.get_text(strip=True)
-                if len(text_content) > 100:  # Lower threshold for last resort
-                    logger.debug(f"Found fallback container for {href}: {parent.name} with {len(text_content)} chars")
-                    return parent
+        for parent in containerParents:
+            # Even if it doesn't have chapter class, if it has some content, use it
+            if self._textLongerThan(parent, 100):  # Lower threshold for last resort
+                logger.debug(f"Found fallback container for {href}: {parent.name} with over 100 chars")
+                return parent
         
         # PRIORITY 6: Return the target element itself only if absolutely no container found
         logger.warning(f"No suitable container found for {href}, using target element itself")
@@ -1237,54 +1863,50 @@ Only return the JSON object, no other text.
             Extracted text content
         """
         content = []
-        current = startElement.next_sibling
         
         logger.debug(f"Extracting following content, stopping at: {stopAtElements}")
         
-        while current:
-            if hasattr(current, 'name') and current.name:
-                # Check if this element matches any stop condition
-                shouldStop = False
-                
-                for stopSelector in stopAtElements:
-                    try:
-                        # Parse simple selectors like "hr.chap", "div.chapter"
-                        if '.' in stopSelector:
-                            tag, className = stopSelector.split('.', 1)
-                            if (current.name == tag and 
-                                current.get('class') and 
-                                className in current.get('class')):
-                                shouldStop = True
-                                logger.debug(f"Stopped at element: {stopSelector}")
-                                break
-                        elif current.name == stopSelector:
-                            shouldStop = True
-                            logger.debug(f"Stopped at element: {stopSelector}")
-                            break
-                    except:
-                        continue
-                
-                if shouldStop:
+        # Parse simple selectors like "hr.chap", "div.chapter" once, not per sibling
+        parsedStops = []
+        for stopSelector in stopAtElements:
+            if not isinstance(stopSelector, str):
+                continue
+            tag, _, className = stopSelector.partition('.')
+            parsedStops.append((stopSelector, tag, className if '.' in stopSelector else None))
+        
+        # A lazy sibling walk, so stopping early does not first collect every later sibling
+        for current in startElement.next_siblings:
+            if isinstance(current, NavigableString):
+                continue
+            
+            # Check if this element matches any stop condition
+            shouldStop = False
+            classes = current.get('class')
+            
+            for stopSelector, tag, className in parsedStops:
+                if current.name == tag and (className is None or (classes and className in classes)):
+                    shouldStop = True
+                    logger.debug(f"Stopped at element: {stopSelector}")
                     break
-                
-                # Extract text from content elements
-                if current.name in ['p', 'div', 'blockquote', 'pre', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6']:
-                    text = current.get_text(strip=True)
-                    if text and len(text) > 10:
-                        # Skip common artifacts
-                        if not any(skip_word in text.lower() for skip_word in 
-                                 ['table of contents', 'next chapter', 'previous chapter', 'back to top']):
-                            if not re.match(r'^\[?(page|illustration|figure)\s*\d*\]?$', text, re.IGNORECASE):
-                                content.append(text)
             
-            current = current.next_sibling
+            if shouldStop:
+                break
+            
+            # Extract text from content elements
+            if current.name in _CONTENT_TAGS:
+                text = current.get_text(strip=True)
+                if text and len(text) > 10:
+                    # Skip common artifacts
+                    if not _NAVIGATION_ARTIFACT_RE.search(text):
+                        if not _MARKER_ONLY_RE.match(text):
+                            content.append(text)
         
         # Join content with appropriate spacing
         result = '\n\n'.join(content)
         
         # Clean up excessive whitespace
-        result = re.sub(r'\n\s*\n\s*\n', '\n\n', result)  # Collapse multiple newlines
-        result = re.sub(r'[ \t]+', ' ', result)  # Collapse multiple spaces
+        result = _MULTI_NEWLINE_RE.sub('\n\n', result)  # Collapse multiple newlines
+        result = _MULTI_SPACE_RE.sub(' ', result)  # Collapse multiple spaces
         
         logger.debug(f"Following content extracted: {len(result)} characters")
         return result.strip()
@@ -1323,7 +1945,7 @@ Only return the JSON object, no other text.
         if len(allText) > 200:  # If we get good content directly
             # Split into paragraphs by looking for sentence endings followed by multiple spaces or new content
             paragraphs = []
-            sentences = re.split(r'([.!?])\s+', allText)
+            sentences = _SENTENCE_PUNCT_RE.split(allText)
             
             current_paragraph = ""
             for i in range(0, len(sentences), 2):
@@ -1343,10 +1965,9 @@ Only return the JSON object, no other text.
                     cleaned_para = current_paragraph.strip()
                     if len(cleaned_para) > 20:  # Skip very short paragraphs
                         # Skip navigation elements and common artifacts
-                        if not any(skip_word in cleaned_para.lower() for skip_word in 
-                                 ['table of contents', 'next chapter', 'previous chapter', 'back to top']):
+                        if not _NAVIGATION_ARTIFACT_RE.search(cleaned_para):
                             # Skip page numbers and illustrations
-                            if not re.match(r'^\[?(page|illustration|figure)\s*\d*\]?$', cleaned_para, re.IGNORECASE):
+                            if not _MARKER_ONLY_RE.match(cleaned_para):
                                 paragraphs.append(cleaned_para)
                     current_paragraph = ""
             
@@ -1354,16 +1975,15 @@ Only return the JSON object, no other text.
             if current_paragraph.strip():
                 cleaned_para = current_paragraph.strip()
                 if len(cleaned_para) > 20:
-                    if not any(skip_word in cleaned_para.lower() for skip_word in 
-                             ['table of contents', 'next chapter', 'previous chapter', 'back to top']):
-                        if not re.match(r'^\[?(page|illustration|figure)\s*\d*\]?$', cleaned_para, re.IGNORECASE):
+                    if not _NAVIGATION_ARTIFACT_RE.search(cleaned_para):
+                        if not _MARKER_ONLY_RE.match(cleaned_para):
                             paragraphs.append(cleaned_para)
             
             result = '\n\n'.join(paragraphs)
             
             # Clean up excessive whitespace
-            result = re.sub(r'\s+', ' ', result)  # Normalize all whitespace
-            result = re.sub(r'\n\s*\n\s*\n', '\n\n', result)  # Collapse multiple newlines
+            result = _WHITESPACE_RE.sub(' ', result)  # Normalize all whitespace
+            result = _MULTI_NEWLINE_RE.sub('\n\n', result)  # Collapse multiple newlines
             
             logger.debug(f"Extracted content using direct text extraction: {len(result)} characters")
             return result.strip()
@@ -1385,12 +2005,12 @@ Only return the JSON object, no other text.
                 continue
             
             # Skip navigation elements and common artifacts
-            if any(skip_word in text.lower() for skip_word in ['table of contents', 'next chapter', 'previous chapter', 'back to top']):
+            if _NAVIGATION_ARTIFACT_RE.search(text):
                 logger.debug(f"  Skipping: navigation artifact")
                 continue
                 
             # Skip page numbers and illustrations
-            if re.match(r'^\[?(page|illustration|figure)\s*\d*\]?$', text, re.IGNORECASE):
+            if _MARKER_ONLY_RE.match(text):
                 logger.debug(f"  Skipping: page/illustration reference")
                 continue
             
@@ -1401,24 +2021,120 @@ Only return the JSON object, no other text.
         result = '\n\n'.join(content)
         
         # Clean up excessive whitespace
-        result = re.sub(r'\n\s*\n\s*\n', '\n\n', result)  # Collapse multiple newlines
-        result = re.sub(r'[ \t]+', ' ', result)  # Collapse multiple spaces
+        result = _MULTI_NEWLINE_RE.sub('\n\n', result)  # Collapse multiple newlines
+        result = _MULTI_SPACE_RE.sub(' ', result)  # Collapse multiple spaces
         
         logger.debug(f"Final extracted content using element-by-element extraction: {len(result)} characters")
         logger.debug(f"Final content preview: '{result[:200]}...'")
         return result.strip()
         
 
+def runGeminiBatch(processors: List[HtmlBookProcessor], queries: List[Tuple[str, Dict]],
+                   responseSchema: Type[BaseModel], maxOutputTokens: int = HtmlBookProcessor.MAX_OUTPUT_TOKENS) -> int:
+    """
+    Submit queries as one Gemini batch job and store the answers in each processor's cache.
+    
+    Args:
+        processors: Processor that owns each query, used for its client and cache
+        queries: Tuples of (prompt, inline request) from HtmlBookProcessor._batchQuery
+        responseSchema: Pydantic model the JSON answers follow
+        maxOutputTokens: Token limit the queries were built with (part of the cache key)
+        
+    Returns:
+        Number of answers written to the cache
+    """
+    if not queries:
+        return 0
+    
+    client = processors[0].genaiModel
+    job = client.batches.create(
+        model=HtmlBookProcessor.MODEL_NAME,
+        src=[request for _, request in queries],
+        config={'display_name': f"chapter-chunker-{responseSchema.__name__}"}
+    )
+    logger.info(f"Submitted Gemini batch job {job.name} with {len(queries)} request(s)")
+    
+    while job.state.name not in HtmlBookProcessor.BATCH_DONE_STATES:
+        time.sleep(HtmlBookProcessor.BATCH_POLL_INTERVAL_SECONDS)
+        job = client.batches.get(name=job.name)
+    
+    if job.state.name != 'JOB_STATE_SUCCEEDED':
+        logger.warning(f"Gemini batch job {job.name} ended in {job.state.name}; queries will run live")
+        return 0
+    
+    written = 0
+    for processor, (prompt, _), inlined in zip(processors, queries, job.dest.inlined_responses):
+        if inlined.error or not inlined.response:
+            logger.warning(f"Batch request for {processor.inputFile} failed: {inlined.error}")
+            continue
+        try:
+            result = responseSchema.model_validate_json(inlined.response.text).model_dump()
+        except (TypeError, ValueError) as e:
+            # Truncated answers are retried live with a larger token limit
+            logger.warning(f"Could not parse batch answer for {processor.inputFile}: {e}")
+            continue
+        processor._writeCache(prompt, maxOutputTokens, result)
+        written += 1
+    
+    logger.info(f"Gemini batch job {job.name} cached {written}/{len(queries)} answer(s)")
+    return written
+
+
+async def processBooksConcurrently(processors: List[HtmlBookProcessor],
+                                   maxConcurrency: int = MAX_CONCURRENT_BOOKS) -> List:
+    """
+    Process several books at once, overlapping their Gemini round-trips.
+    
+    Args:
+        processors: Processors for the books to convert
+        maxConcurrency: Maximum number of books in flight at the same time
+        
+    Returns:
+        Chapter paths per book, or the exception a book failed with
+    """
+    semaphore = asyncio.Semaphore(maxConcurrency)
+    
+    async def processBounded(processor: HtmlBookProcessor) -> List[str]:
+        async with semaphore:
+            return await processor.processBookAsync()
+    
+    return await asyncio.gather(*(processBounded(processor) for processor in processors), return_exceptions=True)
+
+
+def warmCachesWithBatch(processors: List[HtmlBookProcessor]) -> None:
+    """
+    Answer the chapter link and first container detection queries through Gemini batch
+    mode, which is billed at half the interactive price. The container prompt is built
+    from the link answer, so the two steps run as consecutive batch jobs. processBook
+    then finds the answers in the on-disk cache; anything missing runs live.
+    
+    Args:
+        processors: Processors for the books to prepare
+    """
+    for buildQuery, responseSchema in ((HtmlBookProcessor._linkBatchQuery, ChapterList),
+                                       (HtmlBookProcessor._containerBatchQuery, ContainerList)):
+        pending = [(processor, buildQuery(processor)) for processor in processors]
+        pending = [(processor, query) for processor, query in pending if query is not None]
+        if not pending:
+            continue
+        try:
+            runGeminiBatch([processor for processor, _ in pending], [query for _, query in pending], responseSchema)
+        except Exception as e:
+            logger.warning(f"Gemini batch mode failed, falling back to live queries: {e}")
+            return
+
+
 app = typer.Typer(help="Convert HTML books to plain text files for audiobooks")
 
 
 @app.command()
 def convert_html(
-    inputFile: str = typer.Option(..., "--input", "-i", help="Path to the HTML book file to process"),
-    outputDir: str = typer.Option("", "--output", "-o", help="Output directory for text files (defaults to bookname_chapters)"),
+    inputFiles: List[str] = typer.Option(..., "--input", "-i", help="Path to an HTML book file to process (repeat to convert several books concurrently)"),
+    outputDir: str = typer.Option("", "--output", "-o", help="Output directory for text files (defaults to bookname_chapters; with several inputs, the parent of each bookname_chapters)"),
     useLlm: bool = typer.Option(True, "--use-llm/--no-llm", help="Use LLM for chapter detection (required - this option is kept for compatibility)"),
     splitLongChapters: bool = typer.Option(True, "--split-long/--no-split", help="Split very long chapters into smaller parts"),
-    geminiApiKey: str = typer.Option("", "--gemini-key", help="Google Gemini API key (or set GEMINI_API_KEY in environment/.env file)")
+    geminiApiKey: str = typer.Option("", "--gemini-key", help="Google Gemini API key (or set GEMINI_API_KEY in environment/.env file)"),
+    useBatch: bool = typer.Option(False, "--batch", help="Answer LLM queries through Gemini batch mode (half price, may take hours)")
 ) -> None:
     """
     Convert HTML books to plain text files for audiobooks using LLM-based table of contents detection.
@@ -1444,34 +2160,51 @@ def convert_html(
     if geminiApiKey:
         os.environ["GEMINI_API_KEY"] = geminiApiKey
     
-    # Check if input file exists
-    if not os.path.isfile(inputFile):
-        logger.error(f"Input file not found: {inputFile}")
-        raise typer.Exit(1)
+    # Check that all input files exist
+    for inputFile in inputFiles:
+        if not os.path.isfile(inputFile):
+            logger.error(f"Input file not found: {inputFile}")
+            raise typer.Exit(1)
     
-    # Determine output directory
-    if not outputDir:
-        inputBaseName = Path(inputFile).stem
-        outputDir = f"{inputBaseName}_chapters"
+    # Determine output directories
+    outputDirs = []
+    for inputFile in inputFiles:
+        bookDir = f"{Path(inputFile).stem}_chapters"
+        if len(inputFiles) == 1:
+            outputDirs.append(outputDir or bookDir)
+        else:
+            outputDirs.append(os.path.join(outputDir, bookDir) if outputDir else bookDir)
     
     try:
-        # Process the book
-        processor = HtmlBookProcessor(inputFile, outputDir, useLlm, splitLongChapters)
-        chapterPaths = processor.processBook()
+        processors = [HtmlBookProcessor(inputFile, bookOutputDir, useLlm, splitLongChapters)
+                      for inputFile, bookOutputDir in zip(inputFiles, outputDirs)]
+        if useBatch:
+            warmCachesWithBatch(processors)
         
+        # Process the books; their LLM round-trips overlap
+        results = asyncio.run(processBooksConcurrently(processors))
+    except Exception as e:
+        logger.error(f"Error processing HTML book: {e}")
+        raise typer.Exit(1)
+    
+    failed = False
+    for inputFile, bookOutputDir, chapterPaths in zip(inputFiles, outputDirs, results):
+        if isinstance(chapterPaths, BaseException):
+            logger.error(f"Error processing HTML book {inputFile}: {chapterPaths}")
+            failed = True
+            continue
         if not chapterPaths:
-            logger.error("No chapters were successfully processed")
-            raise typer.Exit(1)
-            
-        logger.info(f"Successfully created {len(chapterPaths)} text files in {outputDir}")
+            logger.error(f"No chapters were successfully processed for {inputFile}")
+            failed = True
+            continue
         
-        # Print the output directory path for other scripts to use
-        typer.echo(f"Output directory: {os.path.abspath(outputDir)}")
+        logger.info(f"Successfully created {len(chapterPaths)} text files in {bookOutputDir}")
         
-    except Exception as e:
-        logger.error(f"Error processing HTML book: {e}")
+        # Print the output directory path for other scripts to use
+        typer.echo(f"Output directory: {os.path.abspath(bookOutputDir)}")
+    
+    if failed:
         raise typer.Exit(1)
 
-
 if __name__ == "__main__":
     app()
\ No newline at end of file
@@ -0,0 +1,56 @@
+"""
+Tests for the TOC anchor fast path of the HTML chapter chunker.
+"""
+
+import pytest
+
+from scripts import chapterChunker
+from scripts.chapterChunker import HtmlBookProcessor
+
+SYNOPSIS = "A short synopsis of what happens in this chapter, long enough to pass for content on its own."
+BODY_PARAGRAPH = "The chapter text itself goes on for a while, sentence after sentence of narrative. " * 5
+
+
+def makeProcessor(tmp_path, body: str, chapterCount: int) -> HtmlBookProcessor:
+    toc = "".join(f'<a href="#c{i}">Chapter {i}</a>' for i in range(1, chapterCount + 1))
+    inputFile = tmp_path / "book.html"
+    inputFile.write_text(f'<html><body><div class="toc">{toc}</div>{body}</body></html>', encoding="utf-8")
+    return HtmlBookProcessor(str(inputFile), str(tmp_path / "out"), cacheDir=tmp_path / "cache")
+
+
+def chapterLinks(chapterCount: int):
+    return [{"title": f"Chapter {i}", "href": f"c{i}"} for i in range(1, chapterCount + 1)]
+
+
+@pytest.fixture(autouse=True)
+def offlineClient(monkeypatch):
+    # The fast path never queries Gemini; only the constructor needs a client
+    monkeypatch.setattr(chapterChunker.genai, "Client", lambda: None)
+
+
+def testSelfContainedChapterDivsResolveThroughAnchors(tmp_path):
+    body = "".join(
+        f'<div class="chapter"><h2 id="c{i}">Chapter {i}</h2><p>{BODY_PARAGRAPH}</p></div>'
+        for i in range(1, 6)
+    )
+    processor = makeProcessor(tmp_path, body, 5)
+
+    anchorChapters, llmLinks = processor._planChapterExtraction(processor._loadSoup(), chapterLinks(5))
+
+    assert llmLinks == []
+    assert all(BODY_PARAGRAPH.strip() in chapter.content for chapter in anchorChapters)
+
+
+def testHeadingDivFollowedByParagraphsGoesToContainerDetection(tmp_path):
+    # The heading and synopsis sit in the chapter div; the chapter body follows it as siblings
+    body = "".join(
+        f'<div class="chapter"><h2 id="c{i}">Chapter {i}</h2><p>{SYNOPSIS}</p></div>'
+        + f"<p>{BODY_PARAGRAPH}</p>" * 3
+        for i in range(1, 6)
+    )
+    processor = makeProcessor(tmp_path, body, 5)
+
+    anchorChapters, llmLinks = processor._planChapterExtraction(processor._loadSoup(), chapterLinks(5))
+
+    assert anchorChapters == [None] * 5
+    assert [link["href"] for link in llmLinks] == [f"c{i}" for i in range(1, 6)]